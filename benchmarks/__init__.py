@@ -0,0 +1 @@
+"""Render benchmarks for gekkota, run with `python -m benchmarks` (check `python -m benchmarks --help`)"""
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import importlib.metadata
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .cases import Case, cases, configs
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def run_case(case: Case, scale: float, repeat: int) -> List[Dict[str, Any]]:
+    size = max(1, int(case.size * scale))
+    results: List[Dict[str, Any]] = []
+
+    def result(phase: str, config: Optional[str], **values: Any) -> None:
+        results.append(
+            {
+                "case": case.name,
+                "size": size,
+                "phase": phase,
+                "config": config,
+                **values,
+            }
+        )
+
+    result("build", None, **measure(lambda: case.build(size), repeat))
+    tree = case.build(size)
+
+    for name in case.configs:
+        config = configs[name]
+        text = tree.render_str(config)
+
+        timings = measure(lambda: tree.render_str(config), repeat)
+        result(
+            "render",
+            name,
+            **timings,
+            chars=len(text),
+            chars_per_second=len(text) / timings["min"] if timings["min"] else 0.0,
+        )
+        # latency: time until the first token of a lazy render
+        result(
+            "first_token",
+            name,
+            **measure(lambda: next(iter(tree.render_tokens(config))), repeat),
+        )
+
+    return results
+
+
+def version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("gekkota")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}/{result['phase']}/{result['config']}"
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> int:
+    """Prints time ratios against the baseline, returns the number of results that are slower than `threshold`"""
+    previous = {key(result): result for result in baseline}
+    regressions = 0
+
+    for result in results:
+        old = previous.get(key(result))
+        if old is None or not old["min"]:
+            continue
+
+        ratio = result["min"] / old["min"]
+        mark = ""
+        if ratio > threshold:
+            regressions += 1
+            mark = "  <- slower"
+        print(f"{key(result):50} {ratio:6.2f}x{mark}", file=sys.stderr)
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measures gekkota tree construction and rendering",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write JSON results to a file instead of stdout"
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="run only cases with this substring in the name",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="runs per measurement (default: 5)"
+    )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier for tree sizes (default: 1.0)",
+    )
+    parser.add_argument(
+        "--compare", help="JSON results of a previous run, to print time ratios against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="ratio that counts as a regression with --compare (default: 1.2)",
+    )
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    for case in cases:
+        if args.filter in case.name:
+            print(f"running {case.name}", file=sys.stderr)
+            results.extend(run_case(case, args.scale, args.repeat))
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "gekkota": version(),
+        "repeat": args.repeat,
+        "scale": args.scale,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
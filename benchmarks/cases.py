@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence
+
+from gekkota import (
+    Assignment,
+    Block,
+    CaseStmt,
+    ClassPattern,
+    Code,
+    Config,
+    FuncDef,
+    IfStmt,
+    KeywordPattern,
+    Literal,
+    LiteralPattern,
+    MatchStmt,
+    Name,
+    PassStmt,
+    Renderable,
+    ReturnStmt,
+    SequencePattern,
+    CapturePattern,
+    to_expression,
+)
+
+
+configs: Dict[str, Config] = {
+    "default": {},
+    "compact": {"compact": True},
+    "semicolons": {"place_semicolons": True},
+    "inline": {"inline_small_stmts": True},
+    "iterative": {"iterative": True},
+}
+
+
+class Case:
+    """A benchmark: `build(size)` creates a tree, which is rendered with every config in `configs`"""
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[int], Renderable],
+        size: int,
+        configs: Sequence[str] = ("default",),
+    ):
+        self.name = name
+        self.build = build
+        self.size = size
+        self.configs = configs
+
+
+def binary_chain(size: int) -> Renderable:
+    expression = Name("x0")
+    for i in range(1, size):
+        expression = expression + Name(f"x{i}") * Literal(i)
+    return expression
+
+
+def function(i: int) -> FuncDef:
+    x = Name("x")
+    y = Name("y")
+    return FuncDef(
+        f"f{i}",
+        [x, y],
+        Block(
+            [
+                Assignment([Name("z")], x + y * Literal(i)),
+                IfStmt(Name("z"), Block([ReturnStmt(Name("z")(x))])),
+                ReturnStmt(y),
+            ]
+        ),
+        rtype=Name("int"),
+    )
+
+
+def wide_module(size: int) -> Renderable:
+    return Code([function(i) for i in range(size)])
+
+
+def nested_blocks(size: int) -> Renderable:
+    statement: Any = PassStmt()
+    for i in range(size):
+        statement = IfStmt(
+            Name(f"c{i}"),
+            Block([Assignment([Name(f"v{i}")], Literal(i)), statement]),
+        )
+    return Code([statement])
+
+
+def data_literal(size: int) -> Renderable:
+    data: Any = {
+        f"key{i}": [i, i * 0.5, f"value{i}", (i, None, True), {"nested": {i}}]
+        for i in range(size)
+    }
+    return to_expression(data)
+
+
+def match_cases(size: int) -> Renderable:
+    cases: List[CaseStmt] = []
+    for i in range(size):
+        if i % 2:
+            pattern: Any = ClassPattern(
+                Name(f"Node{i}"),
+                [CapturePattern("left")],
+                [KeywordPattern("right", LiteralPattern(i))],
+            )
+        else:
+            pattern = SequencePattern([LiteralPattern(i), CapturePattern("rest")])
+        cases.append(CaseStmt(pattern, Block([ReturnStmt(Literal(i))])))
+    return MatchStmt(Name("value"), cases)
+
+
+cases = [
+    Case("binary_chain", binary_chain, 300, ("default", "compact")),
+    Case("deep_binary_chain", binary_chain, 20_000, ("iterative",)),
+    Case(
+        "wide_module",
+        wide_module,
+        5_000,
+        ("default", "compact", "semicolons", "inline", "iterative"),
+    ),
+    Case(
+        "nested_blocks",
+        nested_blocks,
+        100,
+        ("default", "compact", "semicolons", "iterative"),
+    ),
+    Case("data_literal", data_literal, 5_000, ("default", "compact")),
+    Case("match_cases", match_cases, 2_000, ("default", "compact")),
+]
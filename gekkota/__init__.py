@@ -1,4 +1,5 @@
 from .constants import StrGen as StrGen, Config as Config
+from .config import RenderConfig as RenderConfig
 
 from .core import Renderable as Renderable, Statement as Statement
 
@@ -20,6 +21,8 @@ from .values import (
     SliceExpr as SliceExpr,
     FormatSpec as FormatSpec,
     FString as FString,
+    TrailerChain as TrailerChain,
+    ChainBuilder as ChainBuilder,
 )
 
 from .sequences import (
@@ -29,6 +32,7 @@ from .sequences import (
     DictExpr as DictExpr,
     DictComprehension as DictComprehension,
     KeyValue as KeyValue,
+    LiteralSequence as LiteralSequence,
     SetExpr as SetExpr,
     SetComprehension as SetComprehension,
     TupleExpr as TupleExpr,
@@ -41,7 +45,11 @@ from .generator_expr import (
     GeneratorIf as GeneratorIf,
 )
 
-from .operator_expr import BinaryExpr as BinaryExpr, UnaryExpr as UnaryExpr
+from .operator_expr import (
+    BinaryExpr as BinaryExpr,
+    OperatorChain as OperatorChain,
+    UnaryExpr as UnaryExpr,
+)
 
 from .assignment import (
     Assignment as Assignment,
@@ -113,6 +121,7 @@ from .block import Code as Code, Block as Block
 
 from .utils import Utils as Utils
 from .to_expression import to_expression as to_expression
+from .to_expression import register_converter as register_converter
 
 from .annotations import (
     TypeStmt as TypeStmt,
@@ -122,8 +131,43 @@ from .annotations import (
 )
 
 
+from .cache import Cached as Cached, RenderCache as RenderCache
+from .incremental import IncrementalRenderer as IncrementalRenderer
+from .sourcemap import (
+    SourceMap as SourceMap,
+    Span as Span,
+    enable_site_recording as enable_site_recording,
+    recording_sites as recording_sites,
+)
+from .compiling import (
+    CodeCache as CodeCache,
+    code_cache as code_cache,
+    compile_code as compile_code,
+    make_function as make_function,
+)
+from .templates import (
+    Template as Template,
+    template as template,
+)
+from .instrumentation import (
+    RenderProfile as RenderProfile,
+    profiling as profiling,
+)
+
+from . import hashcons as hashcons
+from . import tokens as tokens
+
+from .sinks import (
+    render_to_text as render_to_text,
+    render_to_binary as render_to_binary,
+    render_to_gzip as render_to_gzip,
+    render_to_lzma as render_to_lzma,
+)
+
+
 from .wscomp import (
     WSRenderable as WSRenderable,
     WSString as WSString,
     WStoG as WStoG,
+    typed_tokenstream as typed_tokenstream,
 )
@@ -1,16 +1,35 @@
 from __future__ import annotations
+
+import ast
 from typing import Sequence, Union
 
 
 from .core import Renderable
+from .lowering import lower_type_params, store, type_param_default
 from .expression import Expression
 from .utils import Utils
 from .constants import Config, StrGen
+from .plans import Child, Join, PlanSpec, When
 from .small_stmt import SmallStmt
 from .values import Identifier, Name
 
 
 class TypeStmt(SmallStmt):
+    __slots__ = ("name", "type_params", "value")
+
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (
+            "type",
+            " ",
+            Child("name"),
+            When("type_params", "[", Join("type_params"), "]"),
+            " ",
+            "=",
+            " ",
+            Child("value"),
+        )
+
     def __init__(
         self,
         name: Identifier,
@@ -37,12 +56,32 @@ class TypeStmt(SmallStmt):
 
         yield from self.value.render(config)
 
+    def lower(self) -> ast.stmt:
+        if not hasattr(ast, "TypeAlias"):
+            raise ValueError(
+                "`type` statements need Python 3.12 or newer to be lowered"
+            )
+
+        return ast.TypeAlias(  # type: ignore
+            name=store(self.name),
+            value=self.value.lower(),
+            **lower_type_params(self.type_params),
+        )
+
 
 class TypeParamConcrete(Renderable):
-    pass
+    __slots__ = ()
 
 
 class TypeVarParam(TypeParamConcrete):
+    __slots__ = ("name", "value", "default")
+
+    render_plan = (
+        Child("name"),
+        When("value", ":", " ", Child("value")),
+        When("default", " ", "=", " ", Child("default")),
+    )
+
     def __init__(
         self,
         name: Identifier,
@@ -64,8 +103,23 @@ class TypeVarParam(TypeParamConcrete):
             yield from (" ", "=", " ")
             yield from self.default.render(config)
 
+    def lower(self) -> ast.AST:
+        return ast.TypeVar(  # type: ignore
+            name=self.name.name,
+            bound=self.value.lower() if self.value else None,
+            **type_param_default(self.default),
+        )
+
 
 class TypeVarTupleParam(TypeParamConcrete):
+    __slots__ = ("name", "default")
+
+    render_plan = (
+        "*",
+        Child("name"),
+        When("default", " ", "=", " ", Child("default")),
+    )
+
     def __init__(
         self,
         name: Identifier,
@@ -82,8 +136,21 @@ class TypeVarTupleParam(TypeParamConcrete):
             yield from (" ", "=", " ")
             yield from self.default.render(config)
 
+    def lower(self) -> ast.AST:
+        return ast.TypeVarTuple(  # type: ignore
+            name=self.name.name, **type_param_default(self.default)
+        )
+
 
 class ParamSpecParam(TypeParamConcrete):
+    __slots__ = ("name", "default")
+
+    render_plan = (
+        "**",
+        Child("name"),
+        When("default", " ", "=", " ", Child("default")),
+    )
+
     def __init__(
         self,
         name: Identifier,
@@ -100,5 +167,10 @@ class ParamSpecParam(TypeParamConcrete):
             yield from (" ", "=", " ")
             yield from self.default.render(config)
 
+    def lower(self) -> ast.AST:
+        return ast.ParamSpec(  # type: ignore
+            name=self.name.name, **type_param_default(self.default)
+        )
+
 
 TypeParam = Union[Name, TypeParamConcrete]
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import Optional
+import ast
+from typing import Iterable, Optional
 from .constants import Config, StrGen
 from .core import Renderable
+from .plans import Child, Items, PlanItem, Text, When, needs_parens
 
 
 class CallArg(Renderable):
+    __slots__ = ("name", "value")
+
+    render_plan = (Text("name"), When("value", "=", Child("value")))
+
     def __init__(self, name: str, value: Optional[Expression] = None):
         self.name = name
         self.value = value
@@ -16,8 +22,31 @@ class CallArg(Renderable):
             yield "="
             yield from self.value.render(config)
 
+    def lower(self) -> ast.expr | ast.keyword:
+        if not self.value:
+            return ast.Name(id=self.name, ctx=ast.Load())
+        return ast.keyword(arg=self.name, value=self.value.lower())
+
 
 class FuncArg(Renderable):
+    __slots__ = ("name", "annotation", "default_value", "late_bound_default")
+
+    render_plan = (
+        Text("name"),
+        When("annotation", ":", " ", Child("annotation")),
+        When(
+            "default_value",
+            When(
+                "annotation",
+                " ",
+                Text("eq_symbol"),
+                " ",
+                otherwise=[Text("eq_symbol")],
+            ),
+            Child("default_value"),
+        ),
+    )
+
     def __init__(
         self,
         name: str,
@@ -31,10 +60,11 @@ class FuncArg(Renderable):
         self.default_value = default_value
         self.late_bound_default = late_bound_default
 
+    @property
+    def eq_symbol(self) -> str:
         if self.late_bound_default:
-            self.eq_symbol = "=>"
-        else:
-            self.eq_symbol = "="
+            return "=>"
+        return "="
 
     def render(self, config: Config) -> StrGen:
         yield self.name
@@ -51,8 +81,12 @@ class FuncArg(Renderable):
                 yield self.eq_symbol
             yield from self.default_value.render(config)
 
+    def lower(self) -> ast.AST:
+        return lower_arg(self)
+
 
-from .expression import Expression, Parens
+from .expression import Expression, render_operand
+from .lowering import lower_arg
 
 from typing import Generic
 from typing_extensions import TypeVar
@@ -61,25 +95,52 @@ T = TypeVar("T", default=Optional[Expression], bound=Optional[Expression])
 
 
 class StarArg(FuncArg, Expression, Generic[T]):
+    __slots__ = ("value",)
+
+    render_plan = ("*", Items())
+
     def __init__(self, value: T = None):
         self.value = value
 
     def render(self, config: Config) -> StrGen:
         yield "*"
         if self.value is not None:
-            value = self.value
-            if value.priority < self.priority:
-                value = Parens(value)
-            yield from value.render(config)
+            yield from render_operand(self.value, self, config)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        if self.value is None:
+            return
+        if needs_parens(self.value, self):
+            yield from ("(", self.value, ")")
+        else:
+            yield self.value
+
+    def lower(self) -> ast.expr:
+        if self.value is None:
+            raise ValueError("bare `*` can only be lowered in function arguments")
+        return ast.Starred(value=self.value.lower(), ctx=ast.Load())
 
 
 class DoubleStarArg(StarArg[Expression]):
+    __slots__ = ()
+
+    render_plan = ("*", "*", Items())
+
     def render(self, config: Config) -> StrGen:
         yield "*"
         yield from super().render(config)
 
+    def lower(self) -> ast.expr:
+        raise ValueError(
+            "`**` can only be lowered in calls, dicts and function arguments"
+        )
+
 
 class Slash(FuncArg):
+    __slots__ = ()
+
+    render_plan = ("/",)
+
     def __init__(self):
         pass
 
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Sequence, Union
+import ast
+from typing import Iterable, Sequence, Union
 
 from .utils import Utils
 from .constants import Config, StrGen
 from .core import Statement
-from .values import GetAttr, Indexing, Identifier
+from .lowering import binary_ops, store
+from .plans import Child, Items, PlanItem, Text, separated_items
+from .values import GetAttr, Indexing, Identifier, Name
 
 
 AugAssignmentTarget = Union[
@@ -24,6 +27,15 @@ AssignmentTarget = Union[
 
 
 class Assignment(Statement):
+    __slots__ = ("targets", "value")
+
+    render_plan = (Items(), " ", "=", " ", Child("value"))
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        if isinstance(self.targets, AnnotatedTarget):
+            return (self.targets,)
+        return separated_items(self.targets, " = ")
+
     def __init__(
         self,
         targets: Sequence[AssignmentTarget] | AnnotatedTarget,
@@ -42,8 +54,23 @@ class Assignment(Statement):
         yield " "
         yield from self.value.render(config)
 
+    def lower(self) -> ast.stmt:
+        if isinstance(self.targets, AnnotatedTarget):
+            node = self.targets.lower()
+            node.value = self.value.lower()
+            return node
+
+        return ast.Assign(
+            targets=[store(target) for target in self.targets],
+            value=self.value.lower(),
+        )
+
 
 class AnnotatedTarget(Statement):
+    __slots__ = ("target", "annotation")
+
+    render_plan = (Child("target"), ": ", Child("annotation"))
+
     def __init__(self, target: AssignmentTarget, annotation: Expression):
         self.target = target
         self.annotation = annotation
@@ -53,8 +80,20 @@ class AnnotatedTarget(Statement):
         yield ": "
         yield from self.annotation.render(config)
 
+    def lower(self) -> ast.AnnAssign:
+        return ast.AnnAssign(
+            target=store(self.target),
+            annotation=self.annotation.lower(),
+            value=None,
+            simple=int(isinstance(self.target, Name)),
+        )
+
 
 class AugmentedAssignment(Statement):
+    __slots__ = ("target", "op", "expression")
+
+    render_plan = (Child("target"), " ", Text("op"), " ", Child("expression"))
+
     def __init__(self, target: AugAssignmentTarget, op: str, expression: Expression):
         self.target = target
         self.op = op
@@ -67,6 +106,13 @@ class AugmentedAssignment(Statement):
         yield " "
         yield from self.expression.render(config)
 
+    def lower(self) -> ast.stmt:
+        return ast.AugAssign(
+            target=store(self.target),
+            op=binary_ops[self.op[:-1]](),
+            value=self.expression.lower(),
+        )
+
 
 from .sequences import SequenceExpr
 from .args import StarArg
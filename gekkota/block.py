@@ -1,6 +1,10 @@
-from typing import Sequence
+import ast
+from typing import List, Sequence
 from .constants import Config, StrGen
 from .core import Renderable, Statement
+from .lowering import lower_statements
+from .parallel import render_parallel
+from .plans import Child, Indented, LineBreaks, Lines, PlanSpec, When
 from .small_stmt import PassStmt
 from .utils import Utils
 
@@ -8,6 +12,10 @@ from .utils import Utils
 class Code(Renderable):
     """whole code as it is"""
 
+    __slots__ = ("statements",)
+
+    render_plan = (Lines("statements"),)
+
     def __init__(self, statements: Sequence[Statement]):
         self.statements = statements
 
@@ -18,13 +26,25 @@ class Code(Renderable):
 
         yield from self.spaced_render(config)
 
+    def render_into(self, out: List[str], config: Config) -> None:
+        workers = config.get("workers", 0)
+
+        # only top-level code is split between threads, blocks are statements themselves
+        if workers > 1 and not isinstance(self, Statement):
+            render_parallel(self.statements, out, config, workers)
+        else:
+            super().render_into(out, config)
+
+    def lower(self) -> ast.AST:
+        return ast.Module(body=lower_statements(self.statements), type_ignores=[])
+
     def spaced_render(self, config: Config) -> StrGen:
         last_one_line = True
 
         inline_small = config.get("inline_small_stmts", False)
         place_semicolons = config.get("place_semicolons", False) or inline_small
         compact = config.get("compact", False)
-        spacing = 0
+        breaks = LineBreaks(self.statements, compact, place_semicolons, inline_small)
 
         generator = self.statements[0].render(config)
 
@@ -37,42 +57,46 @@ class Code(Renderable):
             yield from generator
 
         for i in range(1, len(self.statements)):
-            if not compact:
-                spacing = Statement.get_max_spacing(self.statements[i - 1 : i + 2])
-
-            if place_semicolons and last_one_line:
+            semicolon, newlines = breaks.before(i, last_one_line)
+            if semicolon:
                 yield ";"
-
-            if inline_small and last_one_line:
+            if not newlines:
                 yield " "
-
-            else:
-                for _ in range(1 + spacing):
-                    yield "\n"
+            for _ in range(newlines):
+                yield "\n"
 
             last_one_line = True
 
-            generator = self.statements[i].render(config)
+            generator = iter(self.statements[i].render(config))
 
             if place_semicolons:
-                tokens = [*generator]
+                # only the first line is buffered, a newline means the statement has to start on a new line
+                head: List[str] = []
 
-                for token in tokens:
+                for token in generator:
                     if token == "\n":
                         last_one_line = False
+                        yield "\n"
+                        yield from head
+                        yield token
+                        break
+                    head.append(token)
+                else:
+                    yield from head
 
-                if not last_one_line:
-                    yield "\n"
-
-                yield from tokens
-
-            else:
-                yield from generator
+            yield from generator
 
 
 class Block(Statement, Code):
     """block, a type of statement that consists of other statements"""
 
+    __slots__ = ()
+
+    render_plan = (
+        "\n",
+        Indented(When("statements", Lines("statements"), otherwise=["pass"])),
+    )
+
     def render(self, config: Config) -> StrGen:
         generator = (
             PassStmt().render(config)
@@ -84,8 +108,16 @@ class Block(Statement, Code):
 
 
 class BlockStmt(Statement):
+    __slots__ = ("body",)
+
     body: Statement
 
+    head_plan: PlanSpec
+
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (*cls.head_plan, ":", " ", Child("body"))
+
     def render_head(self, config: Config) -> StrGen:
         return NotImplemented
 
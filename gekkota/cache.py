@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import ast
+import heapq
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from .constants import Config, StrGen
+from .core import Statement, render_raw
+from .expression import Expression
+
+
+Tokens = Tuple[str, ...]
+CacheKey = Tuple[Hashable, Hashable]
+
+
+def identity_key(node: Statement) -> Hashable:
+    return id(node)
+
+
+# options that don't change the rendered text
+unrendered_options = ("render_cache", "workers")
+
+
+def config_fingerprint(config: Config) -> Hashable:
+    """A hashable summary of all config options that can affect rendering"""
+    if config.__class__ is RenderConfig:
+        return config.fingerprint  # type: ignore
+
+    items: list[tuple[str, Hashable]] = []
+
+    for key in sorted(config):
+        if key in unrendered_options:
+            continue
+        value = config[key]
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        items.append((key, value))
+
+    return tuple(items)
+
+
+class CacheEntry:
+    __slots__ = ("node", "tokens", "size", "uses")
+
+    def __init__(self, node: Statement, tokens: Tokens, size: int):
+        self.node = node  # keeps the node alive, so its id can't be reused while cached
+        self.tokens = tokens
+        self.size = size
+        self.uses = 1
+
+
+class RenderCache:
+    """
+
+    Stores rendered token streams of `Cached` nodes, keyed by node identity (or `key(node)`) and config.
+
+    `max_bytes` is the memory budget for stored tokens, when exceeded,
+    least recently used (`policy="lru"`) or least frequently used (`policy="lfu"`) entries are evicted.
+
+    To enable the cache, pass it in config: `tree.render_str({"render_cache": cache})`
+
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 << 20,
+        *,
+        policy: str = "lru",
+        key: Callable[[Statement], Hashable] = identity_key,
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"unknown eviction policy: {policy!r}")
+
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.key = key
+
+        self.entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # `Cached` nodes can be rendered from several threads (check "workers" in config)
+        self._lock = threading.Lock()
+
+        self._heap: List[Tuple[int, int, CacheKey]] = []
+        self._tick = 0
+        self._last_config: Config | None = None
+        self._last_fingerprint: Hashable = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._heap.clear()
+        self.size = 0
+
+    def fingerprint(self, config: Config) -> Hashable:
+        # the same config dict is passed through the whole render, so it's enough to remember the last one
+        if config is not self._last_config:
+            self._last_config = config
+            self._last_fingerprint = config_fingerprint(config)
+        return self._last_fingerprint
+
+    def render(self, node: Statement, config: Config) -> StrGen:
+        with self._lock:
+            cache_key = (self.key(node), self.fingerprint(config))
+            entry = self.entries.get(cache_key)
+
+            if entry is not None:
+                self.hits += 1
+                self.touch(cache_key, entry)
+                return entry.tokens
+
+            self.misses += 1
+
+        tokens = tuple(render_raw(node, config))
+
+        with self._lock:
+            # another thread could have rendered the same node meanwhile
+            if cache_key not in self.entries:
+                self.store(cache_key, node, tokens)
+        return tokens
+
+    def touch(self, cache_key: CacheKey, entry: CacheEntry) -> None:
+        entry.uses += 1
+        if self.policy == "lru":
+            self.entries.move_to_end(cache_key)
+        else:
+            self.push(cache_key, entry)
+
+    def store(self, cache_key: CacheKey, node: Statement, tokens: Tokens) -> None:
+        size = sys.getsizeof(tokens) + sum(map(sys.getsizeof, tokens))
+        if size > self.max_bytes:
+            return
+
+        entry = CacheEntry(node, tokens, size)
+        self.entries[cache_key] = entry
+        self.size += size
+
+        if self.policy == "lfu":
+            self.push(cache_key, entry)
+
+        while self.size > self.max_bytes:
+            self.evict()
+
+    def push(self, cache_key: CacheKey, entry: CacheEntry) -> None:
+        self._tick += 1
+        heapq.heappush(self._heap, (entry.uses, self._tick, cache_key))
+
+        # stale heap items pile up on every hit, rebuild from live entries when there are too many
+        if len(self._heap) > 2 * len(self.entries) + 1024:
+            self._heap = [
+                (entry.uses, i, key)
+                for i, (key, entry) in enumerate(self.entries.items())
+            ]
+            heapq.heapify(self._heap)
+
+    def evict(self) -> None:
+        if self.policy == "lru":
+            _, entry = self.entries.popitem(last=False)
+        else:
+            while True:
+                uses, _, cache_key = heapq.heappop(self._heap)
+                entry = self.entries.get(cache_key)
+                if entry is not None and entry.uses == uses:
+                    del self.entries[cache_key]
+                    break
+
+        self.size -= entry.size
+        self.evictions += 1
+
+
+class Cached(Expression):
+    """
+
+    Marks a subtree as cacheable: when config has a `RenderCache` in "render_cache",
+    `node` is rendered once per config and the tokens are reused afterwards.
+
+    Otherwise renders `node` as usual.
+
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node: Statement):
+        self.node = node
+
+    @property
+    def priority(self) -> int:  # type: ignore
+        return getattr(self.node, "priority", Expression.priority)
+
+    @property
+    def associativity(self) -> str:  # type: ignore
+        return getattr(self.node, "associativity", Expression.associativity)
+
+    @property
+    def spacing(self) -> int:  # type: ignore
+        return self.node.spacing
+
+    def render(self, config: Config) -> StrGen:
+        cache: RenderCache | None = config.get("render_cache")
+
+        if cache is None:
+            return render_raw(self.node, config)
+
+        return cache.render(self.node, config)
+
+    def lower(self) -> ast.AST:
+        return self.node.lower()
+
+
+from .config import RenderConfig
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import ast
 from typing import Sequence
 from gekkota.annotations import TypeParam
 
 from gekkota.expression import Expression
 from .block import BlockStmt
 from .constants import Config, StrGen
-from .core import Statement
+from .core import Spacing, Statement
 from .args import CallArg
+from .lowering import lower_body, lower_call_args, lower_type_params
+from .plans import Join, Text, When
 from .utils import Utils
 
 
 class ClassDef(BlockStmt):
-    spacing = 1
+    __slots__ = ("name", "args", "type_params")
+
+    spacing = Spacing(1)
+
+    head_plan = (
+        "class",
+        " ",
+        Text("name"),
+        When("type_params", "[", Join("type_params"), "]"),
+        When("args", "(", Join("args"), ")"),
+    )
 
     def __init__(
         self,
@@ -41,3 +54,14 @@ class ClassDef(BlockStmt):
             yield "("
             yield from Utils.comma_separated(self.args, config)
             yield ")"
+
+    def lower(self) -> ast.ClassDef:
+        bases, keywords = lower_call_args(self.args)
+        return ast.ClassDef(
+            name=self.name,
+            bases=bases,
+            keywords=keywords,
+            body=lower_body(self.body),
+            decorator_list=[],
+            **lower_type_params(self.type_params),
+        )
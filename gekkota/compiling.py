@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import ast
+import threading
+from collections import OrderedDict
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .cache import config_fingerprint
+from .config import full_config
+from .constants import Config
+from .core import Renderable
+from .functions import Decorated, FuncDef
+from .lowering import locate, lower_statements
+
+
+CodeKey = Tuple[bytes, str, str, Hashable, int]
+
+
+class CodeCache:
+    """
+
+    LRU cache of code objects, keyed by the digest of the compiled tree and compile options.
+
+    `gekkota.compile_code` and `gekkota.make_function` use `gekkota.code_cache` unless another cache is passed.
+
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[CodeKey, CodeType] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def get(self, key: CodeKey, make: Callable[[], CodeType]) -> CodeType:
+        with self._lock:
+            code = self.entries.get(key)
+
+            if code is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return code
+
+            self.misses += 1
+
+        code = make()
+
+        with self._lock:
+            self.entries[key] = code
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return code
+
+
+code_cache = CodeCache()
+
+
+def lower_for_mode(tree: Renderable, mode: str) -> ast.AST:
+    if mode == "eval":
+        return ast.Expression(body=tree.lower())
+
+    body = lower_statements([tree])  # type: ignore
+
+    if mode == "single":
+        return ast.Interactive(body=body)
+    return ast.Module(body=body, type_ignores=[])
+
+
+def compile_code(
+    tree: Renderable,
+    mode: str = "exec",
+    *,
+    filename: str = "<gekkota>",
+    config: Optional[Config] = None,
+    optimize: int = -1,
+    cache: Optional[CodeCache] = code_cache,
+) -> CodeType:
+    """
+
+    Compiles a tree into a code object (`mode` is the same as in builtin `compile`: "exec", "eval" or "single").
+
+    By default the tree is lowered with `to_ast()`. If `config` is passed, the code is rendered with it and compiled from text instead,
+    so line numbers in tracebacks match `tree.render_str(config)`.
+
+    Code objects are cached by the structure of the tree, so equal trees are compiled once. Pass `cache=None` to always compile.
+
+    """
+    if mode not in ("exec", "eval", "single"):
+        raise ValueError(f"unknown compile mode: {mode!r}")
+
+    if config is not None:
+        config = full_config(config)
+
+    def make() -> CodeType:
+        if config is None:
+            source: Any = locate(lower_for_mode(tree, mode))
+        else:
+            source = tree.render_str(config)
+
+        # generated code shouldn't inherit `from __future__` imports of this module
+        return compile(source, filename, mode, dont_inherit=True, optimize=optimize)
+
+    if cache is None:
+        return make()
+
+    fingerprint = None if config is None else config_fingerprint(config)
+    key = (tree.digest(), mode, filename, fingerprint, optimize)
+    return cache.get(key, make)
+
+
+def make_function(
+    definition: FuncDef | Decorated,
+    globals: Optional[Dict[str, Any]] = None,
+    *,
+    filename: str = "<gekkota>",
+    cache: Optional[CodeCache] = code_cache,
+) -> FunctionType:
+    """
+
+    Compiles a function definition (possibly decorated) and returns the function, with `globals` as its global namespace.
+    Only the definition is executed, the function is not added to `globals`.
+
+    """
+    statement = definition
+    while isinstance(statement, Decorated):
+        statement = statement.statement
+
+    if not isinstance(statement, FuncDef):
+        raise TypeError(
+            f"expected a function definition, got {type(statement).__name__}"
+        )
+
+    code = compile_code(definition, "exec", filename=filename, cache=cache)
+
+    namespace: Dict[str, Any] = {}
+    exec(code, {} if globals is None else globals, namespace)
+    return namespace[statement.name]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, NoReturn, Optional, Tuple
+
+from .constants import Config, default_config
+
+# expected types of built-in options, other options are kept as is (custom nodes can read their own options)
+option_types: Dict[str, Tuple[type, ...]] = {
+    "tab_size": (int,),
+    "compact": (bool,),
+    "tab_char": (str,),
+    "place_semicolons": (bool,),
+    "inline_small_stmts": (bool,),
+    "iterative": (bool,),
+    "workers": (int,),
+    "fstrings": (bool,),
+    "typed_tokens": (bool,),
+}
+
+
+class RenderConfig(Dict[str, Any]):
+    """
+
+    A frozen config: defaults with `config` and `options` applied over them, validated once.
+
+    It is a read-only dict, so it is passed to nodes as is, and options are also available as attributes (`config.tab_size`).
+    `render_str` and other render methods use it without merging it with the defaults again.
+    It is hashable, so it can be a cache key; render caches and plan tables reuse keys computed once for it.
+
+    """
+
+    __slots__ = ("_hash", "fingerprint", "plan_key")
+
+    def __init__(self, config: Optional[Config] = None, **options: Any):
+        super().__init__({**default_config, **(config or {}), **options})
+
+        for name, value in self.items():
+            validate_option(name, value)
+
+        self.fingerprint: Hashable = config_fingerprint(dict(self))
+        self.plan_key: Tuple[Any, ...] = PlanOptions.key(self)
+        self._hash = hash(
+            (self.fingerprint, tuple(self[name] for name in unrendered_options))
+        )
+
+    def replace(self, **options: Any) -> RenderConfig:
+        """A copy with `options` changed"""
+        return RenderConfig(self, **options)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"RenderConfig has no option {name!r}") from None
+
+    def __hash__(self) -> int:  # type: ignore
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"RenderConfig({dict.__repr__(self)})"
+
+    def __reduce__(self) -> Any:
+        return (RenderConfig, (dict(self),))
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            "RenderConfig can't be changed, use `replace()` to make a new one"
+        )
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore
+    __ior__ = _immutable  # type: ignore
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # slots are set once, in __init__
+        if hasattr(self, "_hash"):
+            self._immutable()
+        super().__setattr__(name, value)
+
+
+def validate_option(name: str, value: Any) -> None:
+    types = option_types.get(name)
+
+    # bools are ints, but `tab_size=True` is certainly a mistake
+    if types is not None and (
+        not isinstance(value, types) or (bool not in types and isinstance(value, bool))
+    ):
+        expected = " or ".join(cls.__name__ for cls in types)
+        raise TypeError(f"{name!r} option has to be {expected}, got {value!r}")
+
+    if name in ("tab_size", "workers") and value < 0:
+        raise ValueError(f"{name!r} option can't be negative, got {value!r}")
+
+    if (
+        name == "render_cache"
+        and value is not None
+        and not isinstance(value, RenderCache)
+    ):
+        raise TypeError(f"'render_cache' option has to be a RenderCache, got {value!r}")
+
+
+def full_config(config: Optional[Config]) -> Config:
+    """`config` applied over the defaults, a `RenderConfig` is returned as is"""
+    if config.__class__ is RenderConfig:
+        return config  # type: ignore
+    empty_config: Config = {}
+    return {**default_config, **(config or empty_config)}
+
+
+from .cache import RenderCache, config_fingerprint, unrendered_options
+from .plans import PlanOptions
@@ -56,6 +56,16 @@ default_config: Config = {
     "tab_char": " ",  # character used for indentation
     "place_semicolons": False,  # if True, semicolons are placed after one-line statements
     "inline_small_stmts": False,  # if True, one-line statements are inlined. Overrides "place_semicolons".
+    "render_cache": None,  # a gekkota.RenderCache to reuse rendered `Cached` subtrees
+    "iterative": False,  # if True, renders with an explicit stack instead of nested generators (no recursion limit for deep trees)
+    "workers": 0,  # if more than 1, render_str renders top-level statements of Code on that many threads
+    "fstrings": False,  # if True, FString renders as an f-string literal instead of a str.format() call
 }
 
 StrGen = Iterable[str]
+
+# characters buffered by Renderable.render_to before each write
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# top-level statements rendered by one thread at a time, when "workers" is set
+PARALLEL_CHUNK_SIZE = 256
@@ -1,4 +1,6 @@
 from __future__ import annotations
+
+import ast
 from typing import Sequence
 
 from gekkota.utils import Utils
@@ -6,10 +8,26 @@ from gekkota.utils import Utils
 from .expression import Expression
 from .constants import Config, StrGen, op_priorities
 from .core import Statement
+from .plans import Child, Join, Text, When
 from .block import BlockStmt
+from .lowering import lower_body, store
 
 
 class IfExpr(Expression):
+    __slots__ = ("true_branch", "condition", "false_branch")
+
+    render_plan = (
+        Child("true_branch"),
+        " ",
+        "if",
+        " ",
+        Child("condition"),
+        " ",
+        "else",
+        " ",
+        Child("false_branch"),
+    )
+
     priority = op_priorities["ternary"]
 
     def __init__(
@@ -30,8 +48,19 @@ class IfExpr(Expression):
         yield " "
         yield from self.false_branch.render(config)
 
+    def lower(self) -> ast.expr:
+        return ast.IfExp(
+            test=self.condition.lower(),
+            body=self.true_branch.lower(),
+            orelse=self.false_branch.lower(),
+        )
+
 
 class IfStmt(BlockStmt):
+    __slots__ = ("condition",)
+
+    head_plan = ("if", " ", Child("condition"))
+
     def __init__(self, condition: Expression, body: Statement):
         self.condition = condition
         self.body = body
@@ -41,8 +70,17 @@ class IfStmt(BlockStmt):
         yield " "
         yield from self.condition.render(config)
 
+    def lower(self) -> ast.stmt:
+        return ast.If(
+            test=self.condition.lower(), body=lower_body(self.body), orelse=[]
+        )
+
 
 class ElifStmt(IfStmt):
+    __slots__ = ()
+
+    head_plan = ("elif", " ", Child("condition"))
+
     def render_head(self, config: Config) -> StrGen:
         yield "elif"
         yield " "
@@ -50,21 +88,52 @@ class ElifStmt(IfStmt):
 
 
 class ElseStmt(BlockStmt):
+    __slots__ = ()
+
+    head_plan = ("else",)
+
     def __init__(self, body: Statement):
         self.body = body
 
     def render_head(self, config: Config) -> StrGen:
         yield "else"
 
+    def lower(self) -> ast.stmt:
+        raise ValueError(
+            "`else` can only be lowered after `if`, `for`, `while` or `try`"
+        )
+
 
 class WhileStmt(IfStmt):
+    __slots__ = ()
+
+    head_plan = ("while", " ", Child("condition"))
+
     def render_head(self, config: Config):
         yield "while"
         yield " "
         yield from self.condition.render(config)
 
+    def lower(self) -> ast.stmt:
+        return ast.While(
+            test=self.condition.lower(), body=lower_body(self.body), orelse=[]
+        )
+
 
 class ForStmt(BlockStmt):
+    __slots__ = ("target", "iterator", "is_async")
+
+    head_plan = (
+        When("is_async", "async", " "),
+        "for",
+        " ",
+        Child("target"),
+        " ",
+        "in",
+        " ",
+        Child("iterator"),
+    )
+
     def __init__(
         self,
         target: Expression,
@@ -90,8 +159,21 @@ class ForStmt(BlockStmt):
         yield " "
         yield from self.iterator.render(config)
 
+    def lower(self) -> ast.stmt:
+        cls = ast.AsyncFor if self.is_async else ast.For
+        return cls(
+            target=store(self.target),
+            iter=self.iterator.lower(),
+            body=lower_body(self.body),
+            orelse=[],
+        )
+
 
 class WithTarget(Expression):
+    __slots__ = ("expression", "alias")
+
+    render_plan = (Child("expression"), When("alias", " ", "as", " ", Text("alias")))
+
     def __init__(self, expression: Expression, alias: str | None = None):
         self.expression = expression
         self.alias = alias
@@ -104,8 +186,16 @@ class WithTarget(Expression):
             yield " "
             yield self.alias
 
+    def lower(self) -> ast.withitem:
+        alias = ast.Name(id=self.alias, ctx=ast.Store()) if self.alias else None
+        return ast.withitem(context_expr=self.expression.lower(), optional_vars=alias)
+
 
 class WithStmt(BlockStmt):
+    __slots__ = ("targets", "is_async")
+
+    head_plan = (When("is_async", "async", " "), "with", " ", Join("targets"))
+
     def __init__(
         self,
         targets: Sequence[WithTarget | Expression],
@@ -124,3 +214,13 @@ class WithStmt(BlockStmt):
         yield "with"
         yield " "
         yield from Utils.comma_separated(self.targets, config)
+
+    def lower(self) -> ast.stmt:
+        items = [
+            target.lower()
+            if isinstance(target, WithTarget)
+            else ast.withitem(context_expr=target.lower())
+            for target in self.targets
+        ]
+        cls = ast.AsyncWith if self.is_async else ast.With
+        return cls(items=items, body=lower_body(self.body))
@@ -1,31 +1,134 @@
 from __future__ import annotations
 
-from typing import Callable, Sequence
-from .constants import Config, StrGen, default_config
+import ast
+from typing import Any, Callable, List, Sequence, Tuple
+from .constants import DEFAULT_CHUNK_SIZE, Config, StrGen
 
 
 class Renderable:
+    # `Statement.spacing` set on an instance (check `Spacing`). The slot is here, not in `Statement`,
+    # so that nodes can be statements and other nodes at once (e.g. `Block` is a `Code`, `Name` is a `FuncArg`)
+    __slots__ = ("_spacing",)
+
     def render(self, config: Config) -> StrGen:
         return NotImplemented
 
+    def render_into(self, out: List[str], config: Config) -> None:
+        """
+
+        Appends rendered tokens to `out`. `config` is used as is, like in `render()`.
+
+        Built-in nodes append their merged constant fragments directly, without a generator per node.
+        Nodes that only implement `render()` are rendered with it.
+
+        """
+        if config.get("iterative", False):
+            out.extend(render_iterative(self, config))
+        else:
+            write_planned(self, out, config)
+
+    def render_tokens(self, config: Config | None = None) -> StrGen:
+        """Renders into a lazy token stream, with `config` applied over the defaults"""
+        config = full_config(config)
+
+        generator = render_raw(self, config)
+        if config.get("compact", False):
+            generator = fuse(generator, config)
+        return generator
+
+    def render_typed(self, config: Config | None = None) -> TypedGen:
+        """Renders into a stream of typed tokens with node markers (check `gekkota.tokens`), `compact` is left to `tokens.fuse`"""
+        config = full_config(config)
+
+        return render_typed(self, config)
+
+    def render_mapped(self, config: Config | None = None) -> Tuple[str, SourceMap]:
+        """Renders the code (same as `render_str`) and a `SourceMap` with spans of all nodes in it"""
+        config = full_config(config)
+
+        return render_mapped(self, config)
+
     def render_str(self, config: Config | None = None) -> str:
         """The main way to render the code"""
-        empty_config: Config = {}
-        config = {**default_config, **(config or empty_config)}
+        config = full_config(config)
 
-        generator = self.render(config)
+        out: List[str] = []
+        self.render_into(out, config)
         if config.get("compact", False):
-            generator = Utils.make_compact(generator, config)
-        return "".join([*generator])
+            return "".join(fuse(out, config))
+        return "".join(out)
+
+    def render_to(
+        self,
+        sink: TextSink,
+        config: Config | None = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Renders the code into a text stream (e.g. an open file) chunk by chunk, returns the number of characters written"""
+        return render_to_text(self, sink, config, chunk_size=chunk_size)
+
+    def digest(self) -> bytes:
+        """A 16-byte structural hash of the tree, stable across processes. Use it (not `==`, which compares nodes by identity) to find equal trees"""
+        return digest(self)
+
+    def lower(self) -> Any:
+        """Builds the `ast` node of this node, without positions. Nodes without their own lowering are parsed from their rendered code"""
+        return parse_rendered(self)
+
+    def to_ast(self) -> ast.AST:
+        """
+
+        Lowers the tree into a Python `ast` node with synthetic positions (each statement is on its own line),
+        e.g. `compile(code.to_ast(), "<gekkota>", "exec")` for a `Code` node, which is lowered into `ast.Module`.
+
+        """
+        return locate(self.lower())
 
     def __str__(self) -> str:
         return self.render_str()
 
+    def __setstate__(self, state: Any) -> None:
+        # pickle and copy restore slots with setattr, spacing is set through `Spacing` so that it's read afterwards
+        instance_dict, slots = state if isinstance(state, tuple) else (state, None)
+        if instance_dict:
+            self.__dict__.update(instance_dict)
+        for name, value in (slots or {}).items():
+            setattr(self, "spacing" if name == "_spacing" else name, value)
+
+
+class Spacing:
+    """
+
+    Number of blank lines a statement asks for around itself (used as `Statement.spacing = Spacing(n)`).
+
+    The class value is the default, setting `spacing` on an instance stores it in the `_spacing` slot of the instance.
+
+    """
+
+    __slots__ = ("value", "overridden")
+
+    def __init__(self, value: int = 0):
+        self.value = value
+        # reading an unset slot raises (and catches) an AttributeError, so slots aren't read until some instance sets one
+        self.overridden = False
+
+    def __get__(self, instance: object, owner: type | None = None) -> int:
+        if instance is None or not self.overridden:
+            return self.value
+        return getattr(instance, "_spacing", self.value)
+
+    def __set__(self, instance: Statement, value: int) -> None:
+        instance._spacing = value  # type: ignore
+        self.overridden = True
+
 
 class Statement(Renderable):
     """statement, biggest separate part of code"""
 
-    spacing = 0
+    __slots__ = ()
+
+    spacing = Spacing(0)
     get_spacing: Callable[["Statement"], int] = lambda x: x.spacing
 
     @staticmethod
@@ -33,4 +136,18 @@ class Statement(Renderable):
         return max(map(Statement.get_spacing, statements))
 
 
-from .utils import Utils
+def render_raw(node: Renderable, config: Config) -> StrGen:
+    """Renders `node` with the engine chosen in `config`, without compacting"""
+    if config.get("iterative", False):
+        return render_iterative(node, config)
+    return render_planned(node, config)
+
+
+from .config import full_config
+from .sinks import TextSink, render_to_text
+from .plans import render_planned, render_typed, write_planned
+from .tokens import TypedGen, fuse
+from .iterative import render_iterative
+from .sourcemap import SourceMap, render_mapped
+from .lowering import locate, parse_rendered
+from .digests import digest
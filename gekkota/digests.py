@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Any, Dict, List, Tuple
+
+from .core import Renderable, Statement
+
+
+DIGEST_SIZE = 16
+
+MISSING: Any = object()
+
+# per class: encoded class name, names of all slots (including inherited ones), their encoded names,
+# whether instances are statements (their spacing is part of the digest) and whether they have __dict__
+Fields = Tuple[bytes, Tuple[str, ...], Tuple[bytes, ...], bool, bool]
+class_fields: Dict[type, Fields] = {}
+
+
+def fields_of(cls: type) -> Fields:
+    fields = class_fields.get(cls)
+
+    if fields is None:
+        names: List[str] = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                # `_spacing` is digested with the other statement fields below, set or not
+                if name not in names and name not in (
+                    "__dict__",
+                    "__weakref__",
+                    "_spacing",
+                ):
+                    names.append(name)
+
+        fields = class_fields[cls] = (
+            encode_text(f"{cls.__module__}.{cls.__qualname__}"),
+            tuple(names),
+            tuple(map(encode_text, names)),
+            issubclass(cls, Statement),
+            cls.__dictoffset__ != 0,
+        )
+
+    return fields
+
+
+def encode_text(text: str) -> bytes:
+    data = text.encode("utf-8", "surrogatepass")
+    return len(data).to_bytes(4, "little") + data
+
+
+class DigestWriter:
+    """Computes digests of nodes, children have to be digested before their parents"""
+
+    def __init__(self):
+        self.digests: Dict[int, bytes] = {}
+
+        # encodings by id of the value: digested children and constants, so most attributes take one lookup
+        self.encoded: Dict[int, bytes] = {
+            id(MISSING): b"-",
+            **{id(value): self.value(value) for value in (None, True, False)},
+        }
+        # names and other strings repeat a lot, so their encodings are reused
+        self.texts: Dict[str, bytes] = {}
+
+    def add(self, key: int, digest: bytes) -> None:
+        self.digests[key] = digest
+        self.encoded[key] = b"N" + digest
+
+    def node(self, node: Renderable, values: List[Any]) -> bytes:
+        cls_name, _, encoded_names, is_statement, has_dict = fields_of(type(node))
+        encoded = self.encoded.get
+        out: List[bytes] = [cls_name]
+
+        for name, value in zip(encoded_names, values):
+            out.append(name)
+            out.append(encoded(id(value)) or self.value(value))
+
+        # subclasses without __slots__ keep their attributes in __dict__
+        if has_dict:
+            for name, value in sorted(node.__dict__.items()):
+                if name == "_spacing":
+                    continue
+                out.append(encode_text(name))
+                out.append(encoded(id(value)) or self.value(value))
+
+        if is_statement:
+            out.append(b"S")
+            out.append(node.spacing.to_bytes(4, "little", signed=True))  # type: ignore
+
+        return blake2b(b"".join(out), digest_size=DIGEST_SIZE).digest()
+
+    def value(self, value: Any) -> bytes:
+        if value.__class__ is str:
+            encoded = self.texts.get(value)
+            if encoded is None:
+                encoded = self.texts[value] = b"V" + encode_text(f"str:{value!r}")
+            return encoded
+
+        if isinstance(value, (list, tuple)):
+            items: Any = value
+            encoded = self.encoded.get
+            return b"".join(
+                [
+                    b"L" if isinstance(value, list) else b"T",
+                    len(items).to_bytes(4, "little"),
+                    *[encoded(id(item)) or self.value(item) for item in items],
+                ]
+            )
+
+        if isinstance(value, Renderable):
+            return self.encoded[id(value)]
+
+        if isinstance(value, type):
+            return b"C" + fields_of(value)[0]
+
+        # repr tells apart 1, 1.0 and True, 0.0 and -0.0
+        return b"V" + encode_text(f"{type(value).__qualname__}:{value!r}")
+
+
+def push_children(value: Any, stack: List[Any], digests: Dict[int, bytes]) -> None:
+    if isinstance(value, Renderable):
+        if id(value) not in digests:
+            stack.append((value, None))
+    elif isinstance(value, (list, tuple)):
+        for item in value:  # type: ignore
+            push_children(item, stack, digests)
+
+
+def digest(root: Renderable) -> bytes:
+    """
+
+    Computes a structural digest of `root`: its class and attributes, with children included through their digests.
+    Trees that render the same way have the same digest, in any process (`PYTHONHASHSEED` doesn't affect it).
+
+    Subtrees that are shared in `root` are hashed once. Digests of interned nodes (check `gekkota.hashcons`) are kept in their table,
+    since interned nodes can't be changed. Other nodes are not cached: they can be changed without notice, so they are hashed on every call.
+
+    """
+    writer = DigestWriter()
+    digests = writer.digests
+    interned = interned_tables()
+
+    # post-order without recursion, so deep trees don't hit the recursion limit.
+    # a node is on the stack with None before its children are pushed, and with its attributes after that
+    stack: List[Tuple[Renderable, Any]] = [(root, None)]
+    push = stack.append
+
+    while stack:
+        node, values = stack.pop()
+        key = id(node)
+
+        if key in digests:
+            continue
+
+        if values is None:
+            if interned:
+                cached = interned_digest(key, interned)
+                if cached is not None:
+                    writer.add(key, cached)
+                    continue
+
+            _, names, _, _, has_dict = fields_of(type(node))
+            values = [getattr(node, name, MISSING) for name in names]
+            push((node, values))
+
+            for value in values:
+                if value.__class__ is str:
+                    continue
+                if isinstance(value, Renderable):
+                    if id(value) not in digests:
+                        push((value, None))
+                elif isinstance(value, (list, tuple)):
+                    push_children(value, stack, digests)
+
+            if has_dict:
+                push_children(list(node.__dict__.values()), stack, digests)
+            continue
+
+        writer.add(key, writer.node(node, values))
+        if interned:
+            remember_interned(key, digests[key], interned)
+
+    return digests[id(root)]
+
+
+from .hashcons import interned_digest, interned_tables, remember_interned
@@ -1,23 +1,53 @@
 from __future__ import annotations
-from typing import Sequence
+
+import ast
+from typing import Iterable, Sequence
 
 from .expression import Expression
 from .constants import Config, StrGen
 from .values import Name
 from .block import BlockStmt
 from .core import Statement
+from .lowering import lower_body, optional
+from .plans import Child, Items, PlanItem, When
 from .sequences import TupleExpr
 
 
 class TryStmt(BlockStmt):
+    __slots__ = ()
+
+    head_plan = ("try",)
+
     def __init__(self, body: Statement):
         self.body = body
 
     def render_head(self, config: Config):
         yield "try"
 
+    def lower(self) -> ast.stmt:
+        return ast.Try(body=lower_body(self.body), handlers=[], orelse=[], finalbody=[])
+
 
 class ExceptStmt(BlockStmt):
+    __slots__ = ("exceptions", "alias")
+
+    head_plan = ("except", Items())
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        if not self.exceptions:
+            return
+
+        yield " "
+
+        if len(self.exceptions) > 1:
+            yield TupleExpr(self.exceptions)
+        else:
+            yield self.exceptions[0]
+
+        if self.alias:
+            yield from (" ", "as", " ")
+            yield self.alias
+
     def __init__(
         self,
         exceptions: Sequence[Expression] | None,
@@ -44,16 +74,49 @@ class ExceptStmt(BlockStmt):
                 yield " "
                 yield from self.alias.render(config)
 
+    def lower(self) -> ast.ExceptHandler:
+        exception = None
+        if self.exceptions:
+            if len(self.exceptions) > 1:
+                exception = TupleExpr(self.exceptions).lower()
+            else:
+                exception = self.exceptions[0].lower()
+
+        return ast.ExceptHandler(
+            type=exception,
+            name=self.alias.name if exception and self.alias else None,
+            body=lower_body(self.body),
+        )
+
 
 class FinallyStmt(BlockStmt):
+    __slots__ = ()
+
+    head_plan = ("finally",)
+
     def __init__(self, body: Statement):
         self.body = body
 
     def render_head(self, config: Config) -> StrGen:
         yield "finally"
 
+    def lower(self) -> ast.stmt:
+        raise ValueError("`finally` can only be lowered after `try` or `except`")
+
 
 class RaiseStmt(Statement):
+    __slots__ = ("exception", "scope")
+
+    render_plan = (
+        "raise",
+        When(
+            "exception",
+            " ",
+            Child("exception"),
+            When("scope", " ", "from", " ", Child("scope")),
+        ),
+    )
+
     def __init__(
         self, exception: Expression | None = None, scope: Expression | None = None
     ):
@@ -70,3 +133,8 @@ class RaiseStmt(Statement):
                 yield "from"
                 yield " "
                 yield from self.scope.render(config)
+
+    def lower(self) -> ast.stmt:
+        if not self.exception:
+            return ast.Raise(exc=None, cause=None)
+        return ast.Raise(exc=self.exception.lower(), cause=optional(self.scope))
@@ -1,14 +1,19 @@
 from __future__ import annotations
-from typing import Sequence
+
+import ast
+from typing import Sequence, Tuple
 from typing_extensions import Self
 
 from .constants import StrGen, Config
 from .core import Statement
+from .plans import Child, needs_parens
 
 
 class Expression(Statement):
     """expression, a type of statement with a return value"""
 
+    __slots__ = ()
+
     priority = 100
     associativity = "both"
 
@@ -116,26 +121,14 @@ class Expression(Statement):
     def index(
         self, index: Expression | SliceExpr | Sequence[SliceExpr]
     ) -> Indexing[Self]:
-        if isinstance(index, Sequence):
-            index = SequenceExpr(
-                [
-                    x
-                    if isinstance(x, SliceExpr)
-                    else SliceExpr(
-                        x.start, x.stop, x.step
-                    )  # check explanation right below
-                    for x in index
-                ]
-            )
-
-        # Case of getting a slice instance is impossible with static typing (since `slice` is not in available types of index)
-        # Omitting slice from index typing comes from the fact that slice can't be generic: https://github.com/python/typeshed/issues/8647
-        # Nevertheless, using real slices in Indexing is incredibly convenient so I'd rather support that for folks who don't use type checking
-
-        if isinstance(index, slice):  # type: ignore
-            index = SliceExpr(index.start, index.stop, index.step)  # type: ignore
-
-        return Indexing(self, index)
+        return Indexing(self, index_expression(index))
+
+    def compare(self, *comparisons: Tuple[str, Expression]) -> OperatorChain:
+        """A comparison chain, e.g. `a.compare(("<", b), ("<=", c))` is `a < b <= c`"""
+        return OperatorChain(
+            [self, *(operand for _, operand in comparisons)],
+            [op for op, _ in comparisons],
+        )
 
     def await_(self) -> AwaitExpr:
         return AwaitExpr(self)
@@ -144,19 +137,17 @@ class Expression(Statement):
         return IfExpr(true_branch=self, condition=condition, false_branch=else_branch)
 
     def respect_priority(self, op: Expression, side: str = "none") -> Expression:
-        if self.priority < op.priority:
+        """Wraps self in `Parens` if it needs them as an operand of `op`. Operators decide that at render time, so they don't call it"""
+        if needs_parens(self, op, side):
             return Parens(self)
-
-        if self.priority == op.priority:
-            if side == "none" or self.associativity == "both":
-                return self
-            if self.associativity != side:  # e.g "left" != "right" and vice versa
-                return Parens(self)
-
         return self
 
 
 class Parens(Expression):
+    __slots__ = ("expression",)
+
+    render_plan = ("(", Child("expression"), ")")
+
     def __init__(self, expression: Expression):
         self.expression = expression
 
@@ -165,8 +156,47 @@ class Parens(Expression):
         yield from self.expression.render(config)
         yield ")"
 
+    def lower(self) -> ast.expr:
+        return self.expression.lower()
+
+
+def index_expression(
+    index: Expression | SliceExpr | Sequence[SliceExpr],
+) -> Expression | SliceExpr:
+    """Converts an index of `Expression.index` (which may be a sequence of slices) into a node"""
+    if isinstance(index, Sequence):
+        index = SequenceExpr(
+            [
+                x
+                if isinstance(x, SliceExpr)
+                else SliceExpr(x.start, x.stop, x.step)  # check explanation right below
+                for x in index
+            ]
+        )
+
+    # Case of getting a slice instance is impossible with static typing (since `slice` is not in available types of index)
+    # Omitting slice from index typing comes from the fact that slice can't be generic: https://github.com/python/typeshed/issues/8647
+    # Nevertheless, using real slices in Indexing is incredibly convenient so I'd rather support that for folks who don't use type checking
+
+    if isinstance(index, slice):  # type: ignore
+        index = SliceExpr(index.start, index.stop, index.step)  # type: ignore
+
+    return index
+
+
+def render_operand(
+    operand: Expression, parent: Expression, config: Config, side: str = "none"
+) -> StrGen:
+    """Renders `operand` of `parent`, in parentheses if needed (same as the `Operand` plan step)"""
+    if needs_parens(operand, parent, side):
+        yield "("
+        yield from operand.render(config)
+        yield ")"
+    else:
+        yield from operand.render(config)
+
 
-from .operator_expr import AwaitExpr, BinaryExpr, UnaryExpr
+from .operator_expr import AwaitExpr, BinaryExpr, OperatorChain, UnaryExpr
 from .control_flow import IfExpr
 from .values import CallExpr, GetAttr, Indexing, SliceExpr
 from .sequences import SequenceExpr
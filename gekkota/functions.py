@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+import ast
 from typing import Optional, Sequence
 
 from .annotations import TypeParam
 from .args import FuncArg
 from .block import BlockStmt
 from .constants import Config, StrGen
-from .core import Statement
+from .core import Spacing, Statement
+from .plans import Child, Join, Text, When
 from .utils import Utils
 from .expression import Expression
+from .lowering import lower_arguments, lower_body, lower_type_params
 
 
 class LambDef(Expression):
+    __slots__ = ("args", "body")
+
+    render_plan = (
+        "lambda",
+        When("args", " ", Join("args")),
+        ":",
+        " ",
+        Child("body"),
+    )
+
     def __init__(self, args: Sequence[FuncArg], body: Expression):
         self.args = args
         self.body = body
@@ -25,9 +38,26 @@ class LambDef(Expression):
         yield " "
         yield from self.body.render(config)
 
+    def lower(self) -> ast.expr:
+        return ast.Lambda(args=lower_arguments(self.args), body=self.body.lower())
+
 
 class FuncDef(BlockStmt):
-    spacing = 1
+    __slots__ = ("name", "args", "rtype", "is_async", "type_params")
+
+    spacing = Spacing(1)
+
+    head_plan = (
+        When("is_async", "async", " "),
+        "def",
+        " ",
+        Text("name"),
+        When("type_params", "[", Join("type_params"), "]"),
+        "(",
+        Join("args"),
+        ")",
+        When("rtype", " ", "->", " ", Child("rtype")),
+    )
 
     def __init__(
         self,
@@ -70,9 +100,26 @@ class FuncDef(BlockStmt):
             yield " "
             yield from self.rtype.render(config)
 
+    def lower(self) -> ast.FunctionDef | ast.AsyncFunctionDef:
+        cls = ast.AsyncFunctionDef if self.is_async else ast.FunctionDef
+        return cls(
+            name=self.name,
+            args=lower_arguments(self.args),
+            body=lower_body(self.body),
+            decorator_list=[],
+            returns=self.rtype.lower() if self.rtype else None,
+            **lower_type_params(self.type_params),
+        )
+
 
 class Decorated(Statement):
-    def __init__(self, decorator: Expression, statement: ClassDef | FuncDef):
+    __slots__ = ("decorator", "statement")
+
+    render_plan = ("@", Child("decorator"), "\n", Child("statement"))
+
+    def __init__(
+        self, decorator: Expression, statement: ClassDef | FuncDef | Decorated
+    ):
         self.decorator = decorator
         self.statement = statement
 
@@ -82,5 +129,10 @@ class Decorated(Statement):
         yield "\n"
         yield from self.statement.render(config)
 
+    def lower(self) -> ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef:
+        node = self.statement.lower()
+        node.decorator_list.insert(0, self.decorator.lower())
+        return node
+
 
 from gekkota.classes import ClassDef
@@ -1,16 +1,23 @@
 from __future__ import annotations
+
+import ast
 from typing import Sequence
 
 from .core import Renderable
 from .constants import Config, StrGen
 from .expression import Expression
+from .plans import Child, Join, When
 
 
 class GeneratorPart(Renderable):
-    pass
+    __slots__ = ()
 
 
 class GeneratorIf(GeneratorPart):
+    __slots__ = ("condition",)
+
+    render_plan = ("if", " ", Child("condition"))
+
     def __init__(self, condition: Expression):
         self.condition = condition
 
@@ -21,6 +28,19 @@ class GeneratorIf(GeneratorPart):
 
 
 class GeneratorFor(GeneratorPart):
+    __slots__ = ("target", "iterator", "is_async")
+
+    render_plan = (
+        When("is_async", "async", " "),
+        "for",
+        " ",
+        Child("target"),
+        " ",
+        "in",
+        " ",
+        Child("iterator"),
+    )
+
     def __init__(
         self,
         target: AssignmentTarget,
@@ -44,8 +64,20 @@ class GeneratorFor(GeneratorPart):
         yield " "
         yield from self.iterator.render(config)
 
+    def lower(self) -> ast.comprehension:
+        return ast.comprehension(
+            target=store(self.target),
+            iter=self.iterator.lower(),
+            ifs=[],
+            is_async=int(self.is_async),
+        )
+
 
 class GeneratorBase(Renderable):
+    __slots__ = ("expression", "parts")
+
+    render_plan = (Child("expression"), When("parts", " ", Join("parts", " ")))
+
     def __init__(
         self, expression: Expression | KeyValue, parts: Sequence[GeneratorPart]
     ):
@@ -57,6 +89,10 @@ class GeneratorBase(Renderable):
 
 
 class GeneratorExpr(Expression):
+    __slots__ = ("base",)
+
+    render_plan = ("(", Child("base"), ")")
+
     def __init__(self, expression: Expression, parts: Sequence[GeneratorPart]):
         self.base = GeneratorBase(expression, parts)
 
@@ -65,7 +101,14 @@ class GeneratorExpr(Expression):
         yield from self.base.render(config)
         yield ")"
 
+    def lower(self) -> ast.expr:
+        return ast.GeneratorExp(
+            elt=self.base.expression.lower(),
+            generators=lower_generators(self.base.parts),
+        )
+
 
 from .assignment import AssignmentTarget
 from .sequences import KeyValue
 from .utils import Utils
+from .lowering import lower_generators, store
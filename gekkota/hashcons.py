@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence
+from typing_extensions import ParamSpec, TypeVar
+
+from .args import CallArg
+from .core import Renderable
+from .expression import Expression
+from .operator_expr import BinaryExpr, UnaryExpr
+from .values import CallExpr, GetAttr, Literal, LiteralValue, Name
+
+P = ParamSpec("P")
+T = TypeVar("T")
+AnnT = TypeVar("AnnT", Expression, None)
+
+
+class Unhashable(Exception):
+    pass
+
+
+def freeze(value: Any) -> Hashable:
+    """Makes a hashable key out of a constructor argument. Nodes are compared by identity, since their children are interned too"""
+    if isinstance(value, Renderable):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(map(freeze, value)))  # type: ignore
+
+    if isinstance(value, (float, complex)):
+        # repr tells apart 0.0 and -0.0, and nan is equal to itself
+        return (type(value), repr(value))
+
+    try:
+        hash(value)
+    except TypeError:
+        raise Unhashable from None
+
+    # type is a part of the key, so 1, 1.0 and True are different
+    return (type(value), value)
+
+
+class HashCons:
+    """
+
+    A table of interned nodes, with hit/miss counters.
+
+    Interned nodes are shared between all their users, so they should not be mutated after construction.
+    That's also why their digests (`node.digest()`) are computed once and kept in the table.
+
+    """
+
+    def __init__(self):
+        self.table: Dict[Hashable, Any] = {}
+        # digests of interned nodes by id, None until computed
+        self.digests: Dict[int, Optional[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        tables.add(self)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def clear(self) -> None:
+        self.table.clear()
+        self.digests.clear()
+
+    def make(self, cls: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Returns `cls(*args, **kwargs)`, or an existing node created from equal arguments"""
+        try:
+            key = (
+                cls,
+                tuple(map(freeze, args)),
+                tuple(sorted((k, freeze(v)) for k, v in kwargs.items())),
+            )
+        except Unhashable:
+            self.misses += 1
+            return cls(*args, **kwargs)
+
+        node = self.table.get(key)
+
+        if node is None:
+            self.misses += 1
+            node = self.table[key] = cls(*args, **kwargs)
+            self.digests[id(node)] = None
+        else:
+            self.hits += 1
+
+        return node
+
+
+interning_stack: List[HashCons] = []
+
+# all tables, to find digests of interned nodes. A table keeps its nodes alive, so their ids are not reused
+tables: weakref.WeakSet[HashCons] = weakref.WeakSet()
+
+
+def interned_tables() -> List[Dict[int, Optional[bytes]]]:
+    """Digest tables of all non-empty `HashCons` tables"""
+    return [table.digests for table in tables if table.digests]
+
+
+def interned_digest(
+    key: int, digests: List[Dict[int, Optional[bytes]]]
+) -> Optional[bytes]:
+    for table in digests:
+        digest = table.get(key)
+        if digest is not None:
+            return digest
+    return None
+
+
+def remember_interned(
+    key: int, digest: bytes, digests: List[Dict[int, Optional[bytes]]]
+) -> None:
+    for table in digests:
+        if key in table:
+            table[key] = digest
+
+
+@contextmanager
+def interning(table: Optional[HashCons] = None) -> Iterator[HashCons]:
+    """Enables interning in module-level factories, using `table` (or a new one). Outside of it factories just create new nodes"""
+    if table is None:
+        table = HashCons()
+
+    interning_stack.append(table)
+    try:
+        yield table
+    finally:
+        interning_stack.pop()
+
+
+def make(cls: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    if not interning_stack:
+        return cls(*args, **kwargs)
+    return interning_stack[-1].make(cls, *args, **kwargs)
+
+
+def interned_name(name: str, annotation: AnnT = None) -> Name[AnnT]:
+    return make(Name, name, annotation)
+
+
+def literal(value: LiteralValue) -> Literal:
+    return make(Literal, value)
+
+
+def interned_getattr(value: Expression, *attributes: str) -> GetAttr[Expression]:
+    return make(GetAttr, value, *attributes)
+
+
+def call(
+    callee: Expression, *args: CallArg | Expression, **kwargs: Expression
+) -> CallExpr[Expression]:
+    call_args: Sequence[CallArg | Expression] = [
+        *args,
+        *(make(CallArg, k, kwargs[k]) for k in kwargs),
+    ]
+    return make(CallExpr, callee, call_args)
+
+
+def binary(left: Expression, op: str, right: Expression) -> BinaryExpr:
+    return make(BinaryExpr, left, right, op)
+
+
+def unary(op: str, expression: Expression) -> UnaryExpr:
+    return make(UnaryExpr, expression, op)
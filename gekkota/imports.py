@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Sequence
+
+import ast
+from typing import Iterable, Sequence
 
 from gekkota.args import StarArg
 
@@ -7,9 +9,14 @@ from .utils import Utils
 from .values import Name
 from .constants import Config, StrGen
 from .core import Renderable, Statement
+from .plans import Child, Items, Join, JoinText, PlanItem, When
 
 
 class ImportSource(Renderable):
+    __slots__ = ("parts",)
+
+    render_plan = (JoinText("parts", "."),)
+
     def __init__(self, parts: Sequence[str]):
         self.parts = parts
 
@@ -22,6 +29,13 @@ class ImportSource(Renderable):
 
 
 class ImportDots(ImportSource):
+    __slots__ = ("length",)
+
+    render_plan = (Items(),)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        return ("." * self.length,)
+
     def __init__(self, length: int = 1):
         self.length = length
 
@@ -31,6 +45,10 @@ class ImportDots(ImportSource):
 
 
 class ImportAlias(Renderable):
+    __slots__ = ("name", "alias")
+
+    render_plan = (Child("name"), When("alias", " ", "as", " ", Child("alias")))
+
     def __init__(self, name: Name, alias: Name | None = None):
         self.name = name
         self.alias = alias
@@ -43,8 +61,25 @@ class ImportAlias(Renderable):
             yield " "
             yield from self.alias.render(config)
 
+    def lower(self) -> ast.alias:
+        return ast.alias(
+            name=self.name.name, asname=self.alias.name if self.alias else None
+        )
+
+
+def lower_alias(name: ImportAlias | Name | StarArg[None]) -> ast.alias:
+    if isinstance(name, ImportAlias):
+        return name.lower()
+    if isinstance(name, StarArg):
+        return ast.alias(name="*", asname=None)
+    return ast.alias(name=name.name, asname=None)
+
 
 class ImportStmt(Statement):
+    __slots__ = ("names",)
+
+    render_plan = ("import", " ", Join("names"))
+
     def __init__(self, names: Sequence[ImportAlias | Name | StarArg[None]]):
         self.names = names
 
@@ -53,8 +88,23 @@ class ImportStmt(Statement):
         yield " "
         yield from Utils.comma_separated(self.names, config)
 
+    def lower(self) -> ast.stmt:
+        return ast.Import(names=[lower_alias(name) for name in self.names])
+
 
 class FromImportStmt(Statement):
+    __slots__ = ("source", "names")
+
+    render_plan = (
+        "from",
+        " ",
+        Child("source"),
+        " ",
+        "import",
+        " ",
+        Join("names"),
+    )
+
     def __init__(
         self,
         source: ImportSource | Name,
@@ -71,3 +121,18 @@ class FromImportStmt(Statement):
         yield "import"
         yield " "
         yield from Utils.comma_separated(self.names, config)
+
+    def lower(self) -> ast.stmt:
+        module: str | None
+        if isinstance(self.source, ImportDots):
+            module, level = None, self.source.length
+        elif isinstance(self.source, ImportSource):
+            module, level = ".".join(self.source.parts), 0
+        else:
+            module, level = self.source.name, 0
+
+        return ast.ImportFrom(
+            module=module,
+            names=[lower_alias(name) for name in self.names],
+            level=level,
+        )
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config import full_config
+from .constants import Config
+from .core import Renderable, Statement
+from .plans import PlanWriter
+from .tokens import fuse
+
+# indentation it was rendered with, tokens, number of newlines in tokens, the node itself
+# and the nodes it directly contains (both are kept to keep their ids alive while they are keys)
+Fragment = Tuple[str, Tuple[str, ...], int, Renderable, Tuple[Renderable, ...]]
+
+
+class IncrementalWriter(PlanWriter):
+    """`PlanWriter` that reuses fragments of clean statements and records which statement contains each node"""
+
+    def __init__(self, renderer: IncrementalRenderer):
+        super().__init__(renderer.config)
+        self.renderer = renderer
+        # the closest statement (or the root) that contains the node being rendered, and nodes it directly contains
+        self.owner = 0
+        self.owned: List[Renderable] = []
+
+    def track(self, node: Renderable) -> None:
+        key = id(node)
+
+        parents = self.renderer.parents.get(key)
+        if parents is None:
+            parents = self.renderer.parents[key] = set()
+        if key != self.owner:
+            parents.add(self.owner)
+            self.owned.append(node)
+
+    def write(self, node: Renderable, out: List[str]) -> None:
+        self.track(node)
+        super().write(node, out)
+
+    def write_statement(self, statement: Statement, out: List[str]) -> None:
+        renderer = self.renderer
+        key = id(statement)
+        self.track(statement)
+
+        fragment = renderer.fragments.get(key)
+        if (
+            fragment is not None
+            and key not in renderer.dirty
+            and fragment[0] == self.indent
+        ):
+            out.extend(fragment[1])
+            self.newlines += fragment[2]
+            renderer.reused += 1
+            return
+
+        start = len(out)
+        newlines = self.newlines
+        owner, owned = self.owner, self.owned
+        self.owner, self.owned = key, []
+
+        super().write(statement, out)
+
+        contained = tuple(self.owned)
+        self.owner, self.owned = owner, owned
+        renderer.rendered += 1
+        renderer.fragments[key] = (
+            self.indent,
+            tuple(out[start:]),
+            self.newlines - newlines,
+            statement,
+            contained,
+        )
+        if fragment is not None:
+            renderer.replaced(key, fragment[4], contained)
+
+    def fallback(self, node: Renderable, out: List[str]) -> None:
+        # children of nodes without plans are not tracked, so their statement is rendered every time
+        self.renderer.volatile.add(self.owner)
+        super().fallback(node, out)
+
+
+class IncrementalRenderer:
+    """
+
+    Renders `root` again and again, reusing rendered statements that didn't change since the last render.
+
+    After changing a rendered node (e.g. `func.name = "g"` or `code.statements.append(...)`) call `invalidate(node)`,
+    it marks the node and all statements that contain it as changed, the next `render()` re-renders only those.
+    Statements that are no longer in the tree after a render are dropped with everything they contain.
+
+    With `detect`, attributes set on nodes are invalidated automatically, until `close()`. Changes inside lists
+    still have to be reported. With `verify`, every render is compared with a full render, a missed change raises RuntimeError.
+
+    """
+
+    def __init__(
+        self,
+        root: Renderable,
+        config: Optional[Config] = None,
+        detect: bool = False,
+        verify: bool = False,
+    ):
+        self.root = root
+        self.config = full_config(config)
+        self.verify = verify
+
+        self.fragments: Dict[int, Fragment] = {}
+        # ids of statements (or the root) that directly contain a node, by id of the node
+        self.parents: Dict[int, Set[int]] = {}
+        self.dirty: Set[int] = set()
+        self.volatile: Set[int] = set()
+        self.text: Optional[str] = None
+        # nodes that the root directly contains
+        self.owned: Tuple[Renderable, ...] = ()
+
+        # statements rendered and reused by the last `render()`
+        self.rendered = 0
+        self.reused = 0
+
+        if detect:
+            start_detecting(self)
+
+    def __enter__(self) -> IncrementalRenderer:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops detecting changes"""
+        stop_detecting(self)
+
+    def invalidate(self, node: Renderable) -> None:
+        """Marks `node` (and every statement that contains it) as changed"""
+        self.mark(id(node))
+
+    def mark(self, key: int) -> None:
+        stack = [key]
+
+        while stack:
+            key = stack.pop()
+            if key in self.dirty or key not in self.parents:
+                continue
+            self.dirty.add(key)
+            stack.extend(self.parents[key])
+
+    def replaced(
+        self,
+        owner: int,
+        before: Tuple[Renderable, ...],
+        after: Tuple[Renderable, ...],
+    ) -> None:
+        """Forgets that `owner` contains nodes of `before` that are not in `after`, nodes that are contained nowhere else are dropped"""
+        kept = set(map(id, after))
+        stack = [(owner, node) for node in before if id(node) not in kept]
+
+        while stack:
+            owner, node = stack.pop()
+            key = id(node)
+            parents = self.parents.get(key)
+            if parents is None:
+                continue
+
+            parents.discard(owner)
+            if not parents:
+                del self.parents[key]
+                fragment = self.fragments.pop(key, None)
+                if fragment is not None:
+                    stack.extend((key, child) for child in fragment[4])
+
+    def render(self) -> str:
+        for key in self.volatile:
+            self.mark(key)
+        self.volatile = set()
+
+        self.rendered = self.reused = 0
+
+        if self.text is None or id(self.root) in self.dirty:
+            self.text = self.splice()
+
+        if self.verify and self.text != self.root.render_str(self.config):
+            raise RuntimeError(
+                "incremental render differs from a full render, a change was not invalidated"
+            )
+        return self.text
+
+    def splice(self) -> str:
+        out: List[str] = []
+        writer = IncrementalWriter(self)
+        writer.owner = id(self.root)
+        writer.write(self.root, out)
+        self.dirty.clear()
+
+        owned = tuple(writer.owned)
+        self.replaced(id(self.root), self.owned, owned)
+        self.owned = owned
+
+        tokens = out
+        if self.config.get("compact", False):
+            tokens = fuse(out, self.config)
+        return "".join(tokens)
+
+
+# renderers that detect changes, `Renderable.__setattr__` is set only while there are any
+detectors: Tuple[IncrementalRenderer, ...] = ()
+hook_lock = threading.Lock()
+
+
+def detecting_setattr(self: Renderable, name: str, value: Any) -> None:
+    object.__setattr__(self, name, value)
+    key = id(self)
+    for renderer in detectors:
+        if key in renderer.parents:
+            renderer.mark(key)
+
+
+def start_detecting(renderer: IncrementalRenderer) -> None:
+    global detectors
+    with hook_lock:
+        if renderer not in detectors:
+            detectors = (*detectors, renderer)
+        setattr(Renderable, "__setattr__", detecting_setattr)
+
+
+def stop_detecting(renderer: IncrementalRenderer) -> None:
+    # unlike `__new__`, `__setattr__` can be removed, so node attributes are set at full speed again
+    global detectors
+    with hook_lock:
+        detectors = tuple(other for other in detectors if other is not renderer)
+        if not detectors and "__setattr__" in vars(Renderable):
+            delattr(Renderable, "__setattr__")
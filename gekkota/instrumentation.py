@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from itertools import accumulate
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .constants import Config
+from .core import Renderable
+from .plans import render_hooks
+from .sourcemap import MappingWriter
+
+
+class ClassStats:
+    """
+
+    Render statistics of a node class.
+
+    `tokens`, `bytes` (characters, actually) and `self_time` don't include children that are rendered separately,
+    `time` does (so it's counted more than once for classes nested in themselves, e.g. `BinaryExpr`).
+
+    """
+
+    __slots__ = ("calls", "tokens", "bytes", "time", "self_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+        self.bytes = 0
+        self.time = 0.0
+        self.self_time = 0.0
+
+    def add(self, other: ClassStats) -> None:
+        self.calls += other.calls
+        self.tokens += other.tokens
+        self.bytes += other.bytes
+        self.time += other.time
+        self.self_time += other.self_time
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RenderProfile:
+    """Statistics of renders made while profiling, by node class"""
+
+    def __init__(self):
+        self.stats: Dict[type, ClassStats] = {}
+        self.renders = 0
+        self.time = 0.0
+
+    def __getitem__(self, cls: type) -> ClassStats:
+        stats = self.stats.get(cls)
+        if stats is None:
+            stats = self.stats[cls] = ClassStats()
+        return stats
+
+    def add(self, other: RenderProfile) -> None:
+        self.renders += other.renders
+        self.time += other.time
+        for cls, stats in other.stats.items():
+            self[cls].add(stats)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Statistics by full class name (classes with the same name are merged)"""
+        merged: Dict[str, ClassStats] = {}
+
+        for cls, stats in self.stats.items():
+            name = f"{cls.__module__}.{cls.__qualname__}"
+            if name not in merged:
+                merged[name] = ClassStats()
+            merged[name].add(stats)
+
+        return {name: stats.as_dict() for name, stats in merged.items()}
+
+    def report(self, limit: int = 20) -> str:
+        """A table of classes with the largest `self_time`"""
+        lines = [
+            f"{'class':30} {'calls':>10} {'tokens':>10} {'bytes':>12} {'time, ms':>10} {'self, ms':>10}"
+        ]
+        ordered = sorted(self.stats.items(), key=lambda item: -item[1].self_time)
+
+        for cls, stats in ordered[:limit]:
+            lines.append(
+                f"{cls.__qualname__:30} {stats.calls:>10} {stats.tokens:>10} {stats.bytes:>12}"
+                f" {stats.time * 1000:>10.2f} {stats.self_time * 1000:>10.2f}"
+            )
+
+        return "\n".join(lines)
+
+
+class ProfilingWriter(MappingWriter):
+    """`MappingWriter` that also measures time spent on every node"""
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self.times: List[float] = []
+
+    def write(self, node: Renderable, out: List[str]) -> None:
+        index = len(self.times)
+        self.times.append(0.0)
+
+        start = perf_counter()
+        super().write(node, out)
+        self.times[index] = perf_counter() - start
+
+    def profile(self, out: List[str]) -> RenderProfile:
+        profile = RenderProfile()
+        count = len(self.nodes)
+        if not count:
+            return profile
+
+        first = self.starts[0]
+        offsets = list(accumulate(map(len, out[first:]), initial=0))
+
+        tokens = [end - start for start, end in zip(self.starts, self.ends)]
+        sizes = [
+            offsets[end - first] - offsets[start - first]
+            for start, end in zip(self.starts, self.ends)
+        ]
+        own_tokens = tokens[:]
+        own_sizes = sizes[:]
+        own_times = self.times[:]
+
+        # children are always recorded after their parent
+        for index in reversed(range(1, count)):
+            parent = self.parents[index]
+            if parent != -1:
+                own_tokens[parent] -= tokens[index]
+                own_sizes[parent] -= sizes[index]
+                own_times[parent] -= self.times[index]
+
+        for index, node in enumerate(self.nodes):
+            stats = profile[type(node)]
+            stats.calls += 1
+            stats.tokens += own_tokens[index]
+            stats.bytes += own_sizes[index]
+            stats.time += self.times[index]
+            stats.self_time += own_times[index]
+
+        profile.renders = 1
+        profile.time = self.times[0]
+        return profile
+
+
+SlowCallback = Callable[[Renderable, float, RenderProfile], None]
+
+
+@contextmanager
+def profiling(
+    profile: Optional[RenderProfile] = None,
+    *,
+    slow: Optional[float] = None,
+    on_slow: Optional[SlowCallback] = None,
+) -> Iterator[RenderProfile]:
+    """
+
+    Collects render statistics by node class into `profile` (or a new one) while active.
+
+    If a render takes at least `slow` seconds, `on_slow(node, seconds, profile_of_that_render)` is called.
+
+    Only `render_str` and `render_into` are profiled. Profiling is global (not limited to the current thread),
+    and rendering doesn't check anything else when it's not active.
+
+    """
+    if profile is None:
+        profile = RenderProfile()
+    total = profile
+
+    def render(node: Renderable, out: List[str], config: Config) -> None:
+        writer = ProfilingWriter(config)
+        writer.write(node, out)
+
+        current = writer.profile(out)
+        total.add(current)
+
+        if on_slow is not None and slow is not None and current.time >= slow:
+            on_slow(node, current.time, current)
+
+    render_hooks.append(render)
+    try:
+        yield profile
+    finally:
+        render_hooks.remove(render)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from .constants import Config, StrGen
+from .core import Renderable, Statement
+from .plans import (
+    CHILD,
+    INDENTED,
+    ITEMS,
+    JOIN,
+    JOIN_TEXT,
+    LINES,
+    OPERAND,
+    REPR,
+    TEXT,
+    WHEN,
+    WHEN_SET,
+    LineBreaks,
+    needs_parens,
+    plans_for,
+)
+
+
+# control ops used only by the iterative renderer, in addition to the plan ops
+DEDENT = -1
+CAPTURE = -2
+RELEASE = -3
+LEAVE = -4
+
+END: Any = object()
+# yielded after the tokens of a node when mapping, its start is marked by the node itself
+LEFT: Any = object()
+
+Frame = Tuple[Any, Iterator[Any]]
+Capture = Tuple[int, "LinesState", bool, str]
+
+
+class LinesState:
+    """Mutable state of a `Lines` op, shared between the renderer and `lines_items`"""
+
+    __slots__ = ("last_one_line",)
+
+    def __init__(self):
+        self.last_one_line = True
+
+
+def join_items(
+    children: Sequence[Renderable], separator: Tuple[str, ...]
+) -> Iterator[Any]:
+    for i, child in enumerate(children):
+        if i:
+            yield from separator
+        yield child
+
+
+def lines_items(
+    statements: Sequence[Statement],
+    compact: bool,
+    place_semicolons: bool,
+    inline_small: bool,
+) -> Iterator[Any]:
+    """Same as `PlanRenderer.lines`, but yields nodes and control ops instead of rendering statements itself"""
+    breaks = LineBreaks(statements, compact, place_semicolons, inline_small)
+    state = LinesState()
+
+    for i, statement in enumerate(statements):
+        if i:
+            semicolon, newlines = breaks.before(i, state.last_one_line)
+            if semicolon:
+                yield ";"
+            if not newlines:
+                yield " "
+            for _ in range(newlines):
+                yield "\n"
+
+        state.last_one_line = True
+
+        if not place_semicolons:
+            yield statement
+            continue
+
+        # the statement is buffered until its first newline to find out if it's multiline, the renderer updates `state`
+        yield (CAPTURE, state, i > 0)
+        yield statement
+        yield (RELEASE, state)
+
+
+class IterativeRenderer:
+    """
+
+    Renders nodes with compiled plans, using an explicit stack instead of nested generators.
+
+    Output is the same as `PlanRenderer`, but deep trees don't hit the recursion limit,
+    and every token is yielded once, regardless of how deep it is in the tree.
+    Nodes without plans are still rendered with their own `render()`.
+
+    With `mapped`, every node with a plan is also yielded before its tokens, followed by `LEFT` after them.
+
+    """
+
+    def __init__(self, config: Config, mapped: bool = False):
+        self.config = config
+        self.table = plans_for(config)
+        self.mapped = mapped
+
+    def render(self, root: Renderable) -> Iterator[Any]:
+        lookup = self.table.lookup
+        config = self.config
+        mapped = self.mapped
+
+        stack: List[Frame] = [(None, iter((root,)))]
+        # indentation prefixes of the enclosing `Indented` ops, the current one is emitted after every newline
+        indents: List[str] = [""]
+        # tokens, or nodes and `LEFT` when mapping
+        tokens: Iterable[Any]
+
+        # while statements are captured, output is kept in `pending`, with a slot reserved for a newline before each statement.
+        # the first newline shows that every open capture is multiline, so it's flushed and streaming resumes
+        pending: List[Any] = []
+        captures: List[Capture] = []
+
+        while stack:
+            node, ops = stack[-1]
+            op = next(ops, END)
+
+            if op is END:
+                stack.pop()
+                continue
+
+            if isinstance(op, str):
+                tokens = (op,)
+
+            elif isinstance(op, Renderable):
+                plan = lookup(type(op))
+                if not mapped:
+                    stack.append(
+                        (op, iter(plan if plan is not None else op.render(config)))
+                    )
+                    continue
+
+                # markers go through captures like tokens, so they stay in order with them
+                stack.append((op, iter(((LEAVE,),))))
+                stack.append(
+                    (op, iter(plan if plan is not None else op.render(config)))
+                )
+                tokens = (op,)
+
+            else:
+                kind = op[0]
+
+                if kind == CHILD:
+                    stack.append((node, iter((getattr(node, op[1]),))))
+                    continue
+
+                if kind == OPERAND:
+                    child = getattr(node, op[1])
+                    if needs_parens(child, node, op[2]):
+                        stack.append((node, iter((op[3], child, op[4]))))
+                    else:
+                        stack.append((node, iter((child,))))
+                    continue
+
+                if kind == TEXT:
+                    tokens = (getattr(node, op[1]),)
+
+                elif kind == REPR:
+                    tokens = (repr(getattr(node, op[1])),)
+
+                elif kind == WHEN:
+                    stack.append((node, iter(op[2] if getattr(node, op[1]) else op[3])))
+                    continue
+
+                elif kind == WHEN_SET:
+                    value = getattr(node, op[1])
+                    stack.append((node, iter(op[2] if value is not None else op[3])))
+                    continue
+
+                elif kind == JOIN:
+                    stack.append((node, join_items(getattr(node, op[1]), op[2])))
+                    continue
+
+                elif kind == JOIN_TEXT:
+                    items = getattr(node, op[1])
+                    if not items:
+                        continue
+                    tokens = (op[2].join(items),)
+
+                elif kind == LINES:
+                    stack.append((node, lines_items(getattr(node, op[1]), *op[2:])))
+                    continue
+
+                elif kind == INDENTED:
+                    stack.append((node, iter(((DEDENT,),))))
+                    stack.append((node, iter(op[1])))
+                    indents.append(indents[-1] + op[2])
+                    tokens = (op[2],)
+
+                elif kind == ITEMS:
+                    stack.append((node, iter(getattr(node, op[1])())))
+                    continue
+
+                elif kind == DEDENT:
+                    indents.pop()
+                    continue
+
+                elif kind == LEAVE:
+                    tokens = (LEFT,)
+
+                elif kind == CAPTURE:
+                    captures.append((len(pending), op[1], op[2], indents[-1]))
+                    pending.append(None)
+                    continue
+
+                elif kind == RELEASE:
+                    # still open, so the statement was single-line
+                    if captures and captures[-1][1] is op[1]:
+                        captures.pop()
+                        if not captures:
+                            yield from self.flush(pending)
+                    continue
+
+                else:
+                    raise ValueError(f"Unknown op: {op!r}")
+
+            for token in tokens:
+                if captures:
+                    if token != "\n":
+                        pending.append(token)
+                        continue
+
+                    for slot, state, prepend, indent in captures:
+                        state.last_one_line = False
+                        if prepend:
+                            pending[slot] = ("\n", indent) if indent else ("\n",)
+
+                    captures.clear()
+                    yield from self.flush(pending)
+
+                yield token
+                if token == "\n" and indents[-1]:
+                    yield indents[-1]
+
+    @staticmethod
+    def flush(pending: List[Any]) -> StrGen:
+        for item in pending:
+            if item.__class__ is tuple:
+                yield from item
+            elif item is not None:
+                yield item
+        pending.clear()
+
+
+def render_iterative(node: Renderable, config: Config) -> StrGen:
+    """Renders `node` with `IterativeRenderer`. Yields the same text as `node.render(config)` for trees of any depth"""
+    return IterativeRenderer(config).render(node)
@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import ast
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from .constants import op_priorities
+
+A = TypeVar("A", bound=ast.AST)
+
+
+binary_ops: Dict[str, type] = {
+    "+": ast.Add,
+    "-": ast.Sub,
+    "*": ast.Mult,
+    "/": ast.Div,
+    "//": ast.FloorDiv,
+    "%": ast.Mod,
+    "@": ast.MatMult,
+    "**": ast.Pow,
+    "<<": ast.LShift,
+    ">>": ast.RShift,
+    "|": ast.BitOr,
+    "^": ast.BitXor,
+    "&": ast.BitAnd,
+}
+
+bool_ops: Dict[str, type] = {"and": ast.And, "or": ast.Or}
+
+compare_ops: Dict[str, type] = {
+    "==": ast.Eq,
+    "!=": ast.NotEq,
+    "<": ast.Lt,
+    "<=": ast.LtE,
+    ">": ast.Gt,
+    ">=": ast.GtE,
+    "in": ast.In,
+    "not in": ast.NotIn,
+    "is": ast.Is,
+    "is not": ast.IsNot,
+}
+
+unary_ops: Dict[str, type] = {
+    "not ": ast.Not,
+    "-": ast.USub,
+    "+": ast.UAdd,
+    "~": ast.Invert,
+}
+
+shift_ops = ("<<", ">>")
+
+# type parameters (and `type` statements) exist in the AST since 3.12
+has_type_params = hasattr(ast, "TypeAlias")
+
+
+def locate(tree: A) -> A:
+    """
+
+    Gives every node in `tree` a synthetic position: each statement (or except clause) starts the next line,
+    other nodes share the line of their statement. Lines of compound statements end at their last nested statement.
+
+    """
+    order: List[Tuple[ast.AST, int]] = []
+    stack: List[Tuple[ast.AST, int]] = [(tree, 1)]
+    line = 0
+
+    while stack:
+        node, own = stack.pop()
+        if isinstance(node, (ast.stmt, ast.excepthandler)):
+            line += 1
+            own = line
+        order.append((node, own))
+        stack.extend(
+            (child, own) for child in reversed(list(ast.iter_child_nodes(node)))
+        )
+
+    # children come after their parent in `order`, so in reverse they are done first
+    ends: Dict[int, int] = {}
+    for node, own in reversed(order):
+        end = own
+        for child in ast.iter_child_nodes(node):
+            end = max(end, ends[id(child)])
+        ends[id(node)] = end
+
+        if "lineno" in node._attributes:
+            node.lineno = own  # type: ignore
+            node.col_offset = 0  # type: ignore
+            node.end_lineno = end  # type: ignore
+            node.end_col_offset = 0  # type: ignore
+
+    return tree
+
+
+def parse_rendered(node: Renderable) -> Any:
+    """Lowers a node without its own `lower()` by parsing its rendered code"""
+    text = node.render_str()
+
+    if isinstance(node, Expression):
+        return ast.parse(text, mode="eval").body
+
+    body = ast.parse(text).body
+    if len(body) == 1:
+        return body[0]
+    return ast.Module(body=body, type_ignores=[])
+
+
+def optional(node: Optional[Renderable]) -> Any:
+    """Lowers an optional child, with the same truthiness check as in rendering"""
+    return node.lower() if node else None
+
+
+def with_context(node: ast.expr, ctx: ast.expr_context) -> ast.expr:
+    """Marks a lowered target (and its elements) as stored or deleted"""
+    if isinstance(node, (ast.Name, ast.Attribute, ast.Subscript)):
+        node.ctx = ctx
+    elif isinstance(node, ast.Starred):
+        node.ctx = ctx
+        with_context(node.value, ctx)
+    elif isinstance(node, (ast.List, ast.Tuple)):
+        node.ctx = ctx
+        for element in node.elts:
+            with_context(element, ctx)
+    return node
+
+
+def store(node: Renderable) -> Any:
+    return with_context(node.lower(), ast.Store())
+
+
+def literal(value: Any) -> ast.expr:
+    text = repr(value)
+
+    if value is None or isinstance(value, (bool, str, bytes)):
+        return ast.Constant(value=value)
+
+    # negative numbers, complex numbers and `inf` are not constants in parsed code, so they are parsed too
+    if isinstance(value, (int, float)) and text[:1].isdigit():
+        return ast.Constant(value=value)
+
+    return ast.parse(text, mode="eval").body
+
+
+def subscript(value: ast.expr, index: ast.expr) -> ast.Subscript:
+    if sys.version_info < (3, 9):  # pragma: no cover
+        if isinstance(index, ast.Tuple) and any(
+            isinstance(element, ast.Slice) for element in index.elts
+        ):
+            dims = [
+                element if isinstance(element, ast.Slice) else ast.Index(value=element)
+                for element in index.elts
+            ]
+            index = ast.ExtSlice(dims=dims)  # type: ignore
+        elif not isinstance(index, ast.Slice):
+            index = ast.Index(value=index)  # type: ignore
+
+    return ast.Subscript(value=value, slice=index, ctx=ast.Load())
+
+
+def values_tuple(values: Sequence[Renderable]) -> Optional[ast.expr]:
+    """Lowers comma-separated values of `return`/`yield`: nothing, a single value, or a tuple"""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0].lower()
+    return ast.Tuple(elts=[value.lower() for value in values], ctx=ast.Load())
+
+
+def chain_parts(node: BinaryExpr | OperatorChain) -> List[Any]:
+    """Operands of `node` with their sides and operators between them, in text order"""
+    if isinstance(node, BinaryExpr):
+        return [(node.left, node, "left"), node.op, (node.right, node, "right")]
+
+    parts: List[Any] = []
+    for i, (operand, side) in enumerate(zip(node.operands, node.sides())):
+        if i:
+            parts.append(node.ops[i - 1])
+        parts.append((operand, node, side))
+    return parts
+
+
+def first_op(node: BinaryExpr | OperatorChain) -> str:
+    return node.op if isinstance(node, BinaryExpr) else node.ops[0]
+
+
+def operator_chain(
+    node: BinaryExpr | OperatorChain,
+) -> Tuple[List[Expression], List[str]]:
+    """
+
+    Collects operands and operators of `node` and its unparenthesized children with the same priority, in text order.
+    This is how rendered code is parsed, e.g. `BinaryExpr(a, b < c, "<")` renders as a chained comparison `a < b < c`
+
+    """
+    node_op = first_op(node)
+    priority = op_priorities[node_op]
+    shift = node_op in shift_ops
+    same_op = node_op in bool_ops
+
+    operands: List[Expression] = []
+    ops: List[str] = []
+    # operators, and operands with their parent and side (operands in parentheses end the chain)
+    stack: List[Any] = [(node, node, "none")]
+
+    while stack:
+        item = stack.pop()
+
+        if isinstance(item, str):
+            ops.append(item)
+            continue
+
+        operand, parent, side = item
+
+        if operand is not node and not isinstance(operand, (BinaryExpr, OperatorChain)):
+            operands.append(operand)
+            continue
+
+        op = first_op(operand)
+
+        if operand is node or (
+            op_priorities[op] == priority
+            and (op == node_op if same_op else (op in shift_ops) == shift)
+            and not needs_parens(operand, parent, side)
+        ):
+            stack.extend(reversed(chain_parts(operand)))
+        else:
+            operands.append(operand)
+
+    return operands, ops
+
+
+def lower_binary(node: BinaryExpr | OperatorChain) -> ast.expr:
+    op = first_op(node)
+
+    if isinstance(node, BinaryExpr) and op == ":=":
+        return ast.NamedExpr(target=store(node.left), value=node.right.lower())
+
+    operands, ops = operator_chain(node)
+    lowered = [operand.lower() for operand in operands]
+
+    if op in bool_ops:
+        return ast.BoolOp(op=bool_ops[op](), values=lowered)
+
+    if op in compare_ops:
+        return ast.Compare(
+            left=lowered[0],
+            ops=[compare_ops[op]() for op in ops],
+            comparators=lowered[1:],
+        )
+
+    if op == "**":  # the only right-associative operator
+        result = lowered[-1]
+        for operator, operand in zip(reversed(ops), reversed(lowered[:-1])):
+            result = ast.BinOp(left=operand, op=binary_ops[operator](), right=result)
+        return result
+
+    result = lowered[0]
+    for operator, operand in zip(ops, lowered[1:]):
+        result = ast.BinOp(left=result, op=binary_ops[operator](), right=operand)
+    return result
+
+
+def lower_call_args(
+    args: Sequence[Renderable],
+) -> Tuple[List[ast.expr], List[ast.keyword]]:
+    """Splits lowered call (or class) arguments into positional ones and keywords"""
+    positional: List[ast.expr] = []
+    keywords: List[ast.keyword] = []
+
+    for arg in args:
+        if isinstance(arg, DoubleStarArg):
+            keywords.append(ast.keyword(arg=None, value=arg.value.lower()))
+            continue
+
+        lowered = arg.lower()
+        if isinstance(lowered, ast.keyword):
+            keywords.append(lowered)
+        else:
+            positional.append(lowered)
+
+    return positional, keywords
+
+
+def lower_arg(arg: Any) -> ast.arg:
+    annotation = getattr(arg, "annotation", None)
+    return ast.arg(
+        arg=arg.name, annotation=annotation.lower() if annotation is not None else None
+    )
+
+
+def lower_arguments(args: Sequence[FuncArg]) -> ast.arguments:
+    posonly: List[ast.arg] = []
+    regular: List[ast.arg] = []
+    defaults: List[ast.expr] = []
+    kwonly: List[ast.arg] = []
+    kw_defaults: List[Optional[ast.expr]] = []
+    vararg: Optional[ast.arg] = None
+    kwarg: Optional[ast.arg] = None
+    keyword_only = False
+
+    for arg in args:
+        if isinstance(arg, Slash):
+            posonly.extend(regular)
+            regular = []
+            continue
+
+        if isinstance(arg, DoubleStarArg):
+            kwarg = lower_arg(arg.value)
+            continue
+
+        if isinstance(arg, StarArg):
+            keyword_only = True
+            if arg.value is not None:
+                vararg = lower_arg(arg.value)
+            continue
+
+        if getattr(arg, "late_bound_default", False):
+            raise ValueError(f"late-bound default of {arg.name!r} has no Python AST")
+
+        lowered = lower_arg(arg)
+        default = optional(getattr(arg, "default_value", None))
+
+        if keyword_only:
+            kwonly.append(lowered)
+            kw_defaults.append(default)
+        else:
+            regular.append(lowered)
+            if default is not None:
+                defaults.append(default)
+
+    return ast.arguments(
+        posonlyargs=posonly,
+        args=regular,
+        vararg=vararg,
+        kwonlyargs=kwonly,
+        kw_defaults=kw_defaults,
+        kwarg=kwarg,
+        defaults=defaults,
+    )
+
+
+def lower_type_params(params: Sequence[TypeParam]) -> Dict[str, Any]:
+    """Keyword arguments with lowered type parameters for a definition node, empty before 3.12"""
+    if not has_type_params:
+        if params:
+            raise ValueError("type parameters need Python 3.12 or newer to be lowered")
+        return {}
+
+    return {"type_params": [lower_type_param(param) for param in params]}
+
+
+def lower_type_param(param: TypeParam) -> ast.AST:
+    if isinstance(param, Name):
+        return ast.TypeVar(name=param.name, bound=None)  # type: ignore
+    return param.lower()
+
+
+def type_param_default(default: Optional[Expression]) -> Dict[str, Any]:
+    if not default:
+        return {}
+    if "default_value" not in ast.TypeVar._fields:  # type: ignore
+        raise ValueError(
+            "type parameter defaults need Python 3.13 or newer to be lowered"
+        )
+    return {"default_value": default.lower()}
+
+
+def lower_generators(parts: Sequence[GeneratorPart]) -> List[ast.comprehension]:
+    generators: List[ast.comprehension] = []
+
+    for part in parts:
+        if isinstance(part, GeneratorIf):
+            if not generators:
+                raise ValueError("generator has to start with a `for` clause")
+            generators[-1].ifs.append(part.condition.lower())
+        else:
+            generators.append(part.lower())
+
+    return generators
+
+
+def lower_body(statement: Statement) -> List[ast.stmt]:
+    body = (
+        lower_statements(statement.statements)
+        if isinstance(statement, Code)
+        else [lower_statement(statement)]
+    )
+    return body or [ast.Pass()]
+
+
+def lower_statement(statement: Renderable) -> ast.stmt:
+    if isinstance(statement, Name) and statement.annotation is not None:
+        return ast.AnnAssign(
+            target=ast.Name(id=statement.name, ctx=ast.Store()),
+            annotation=statement.annotation.lower(),
+            value=None,
+            simple=1,
+        )
+
+    lowered = statement.lower()
+    if isinstance(lowered, ast.expr):
+        return ast.Expr(value=lowered)
+    return lowered
+
+
+def lower_statements(statements: Sequence[Statement]) -> List[ast.stmt]:
+    """
+
+    Lowers a sequence of statements. `elif`, `else`, `except` and `finally` clauses are separate statements in gekkota,
+    here they are attached to the statement before them, as they are in Python AST
+
+    """
+    body: List[ast.stmt] = []
+
+    for statement in statements:
+        if isinstance(statement, (ElifStmt, ElseStmt, ExceptStmt, FinallyStmt)):
+            attach_clause(body[-1] if body else None, statement)
+        elif isinstance(statement, Code):
+            body.extend(lower_statements(statement.statements))
+        else:
+            body.append(lower_statement(statement))
+
+    return body
+
+
+def attach_clause(previous: Optional[ast.stmt], clause: BlockStmt) -> None:
+    if isinstance(previous, ast.If) and isinstance(clause, (ElifStmt, ElseStmt)):
+        # elif chains are nested ifs in `orelse`
+        while len(previous.orelse) == 1 and isinstance(previous.orelse[0], ast.If):
+            previous = previous.orelse[0]
+
+        if not previous.orelse:
+            if isinstance(clause, ElifStmt):
+                previous.orelse = [clause.lower()]
+            else:
+                previous.orelse = lower_body(clause.body)
+            return
+
+    elif isinstance(previous, (ast.For, ast.AsyncFor, ast.While)):
+        if isinstance(clause, ElseStmt) and not previous.orelse:
+            previous.orelse = lower_body(clause.body)
+            return
+
+    elif isinstance(previous, ast.Try) and not previous.finalbody:
+        if isinstance(clause, ExceptStmt) and not previous.orelse:
+            previous.handlers.append(clause.lower())
+            return
+
+        if isinstance(clause, ElseStmt) and previous.handlers and not previous.orelse:
+            previous.orelse = lower_body(clause.body)
+            return
+
+        if isinstance(clause, FinallyStmt):
+            previous.finalbody = lower_body(clause.body)
+            return
+
+    raise ValueError(
+        f"{type(clause).__name__} doesn't follow a statement it can be attached to"
+    )
+
+
+from .core import Renderable, Statement
+from .plans import needs_parens
+from .expression import Expression
+from .args import DoubleStarArg, FuncArg, Slash, StarArg
+from .values import Name
+from .operator_expr import BinaryExpr, OperatorChain
+from .generator_expr import GeneratorIf, GeneratorPart
+from .annotations import TypeParam
+from .block import BlockStmt, Code
+from .control_flow import ElifStmt, ElseStmt
+from .exceptions import ExceptStmt, FinallyStmt
@@ -1,41 +1,152 @@
+from __future__ import annotations
+
+import ast
+from typing import Iterable, List, Sequence
+
 from gekkota.constants import Config, StrGen, op_priorities, op_associativities
-from gekkota.expression import Expression
+from gekkota.expression import Expression, render_operand
+from gekkota.lowering import lower_binary, shift_ops, unary_ops
+from gekkota.plans import Items, Operand, PlanItem, Text, needs_parens
 
 
 class BinaryExpr(Expression):
+    __slots__ = ("op", "priority", "associativity", "left", "right")
+
+    render_plan = (
+        Operand("left", "left"),
+        " ",
+        Text("op"),
+        " ",
+        Operand("right", "right"),
+    )
+
     def __init__(self, left: Expression, right: Expression, op: str):
         self.op = op
         self.priority = op_priorities[op]
         self.associativity = op_associativities.get(op, "both")
-        self.left = left.respect_priority(self, side="left")
-        self.right = right.respect_priority(self, side="right")
+        self.left = left
+        self.right = right
 
     def render(self, config: Config) -> StrGen:
-        yield from self.left.render(config)
+        yield from render_operand(self.left, self, config, side="left")
         yield " "
         yield self.op
         yield " "
-        yield from self.right.render(config)
+        yield from render_operand(self.right, self, config, side="right")
+
+    def lower(self) -> ast.expr:
+        return lower_binary(self)
+
+    @staticmethod
+    def chain(op: str, operands: Sequence[Expression]) -> Expression:
+        """
+
+        Joins `operands` with `op` in a single flat node, e.g. `BinaryExpr.chain("+", terms)` or `BinaryExpr.chain("and", conditions)`.
+        Renders the same as `a + b + c`, but there's no nesting, so any number of operands is built in linear time.
+        A single operand is returned as is.
+
+        """
+        if len(operands) == 1:
+            return operands[0]
+        return OperatorChain(operands, [op] * (len(operands) - 1))
+
+
+class OperatorChain(Expression):
+    """
+
+    Operands with operators of the same priority between them, as one node: `a + b - c`, `a and b and c` or `a < b <= c`.
+    Operands are grouped the same way as nested `BinaryExpr`s.
+
+    """
+
+    __slots__ = ("ops", "priority", "associativity", "operands")
+
+    render_plan = (Items(),)
+
+    def __init__(self, operands: Sequence[Expression], ops: Sequence[str]):
+        if not ops or len(ops) != len(operands) - 1:
+            raise ValueError(
+                "a chain needs at least two operands and an operator between every two of them"
+            )
+
+        op = ops[0]
+        priority = op_priorities[op]
+        shift = op in shift_ops
+        if op == ":=" or any(
+            op_priorities[other] != priority or (other in shift_ops) != shift
+            for other in ops
+        ):
+            raise ValueError(
+                f"operators {', '.join(sorted(set(ops)))} can't be chained"
+            )
+
+        self.ops = ops
+        self.priority = priority
+        self.associativity = op_associativities.get(op, "both")
+        self.operands = operands
+
+    def sides(self) -> List[str]:
+        """Which side of an operator every operand is on, as if the chain was nested `BinaryExpr`s"""
+        count = len(self.operands)
+        if self.associativity == "right":
+            return ["left"] * (count - 1) + ["right"]
+        return ["left"] + ["right"] * (count - 1)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        for i, (operand, side) in enumerate(zip(self.operands, self.sides())):
+            if i:
+                yield " "
+                yield self.ops[i - 1]
+                yield " "
+            if needs_parens(operand, self, side):
+                yield from ("(", operand, ")")
+            else:
+                yield operand
+
+    def render(self, config: Config) -> StrGen:
+        for i, (operand, side) in enumerate(zip(self.operands, self.sides())):
+            if i:
+                yield " "
+                yield self.ops[i - 1]
+                yield " "
+            yield from render_operand(operand, self, config, side=side)
+
+    def lower(self) -> ast.expr:
+        return lower_binary(self)
 
 
 class UnaryExpr(Expression):
+    __slots__ = ("op", "priority", "expression")
+
+    render_plan = (Text("op"), Operand("expression"))
+
     def __init__(self, expression: Expression, op: str):
         self.op = op
         self.priority = op_priorities[f"u{op}"]
-        self.expression = expression.respect_priority(self)
+        self.expression = expression
 
     def render(self, config: Config) -> StrGen:
         yield self.op
-        yield from self.expression.render(config)
+        yield from render_operand(self.expression, self, config)
+
+    def lower(self) -> ast.expr:
+        return ast.UnaryOp(op=unary_ops[self.op](), operand=self.expression.lower())
 
 
 class AwaitExpr(Expression):
+    __slots__ = ("awaitable",)
+
+    render_plan = ("await", " ", Operand("awaitable", "right"))
+
     priority = op_priorities["await"]
 
     def __init__(self, awaitable: Expression):
-        self.awaitable = awaitable.respect_priority(self, side="right")
+        self.awaitable = awaitable
 
     def render(self, config: Config) -> StrGen:
         yield "await"
         yield " "
-        yield from self.awaitable.render(config)
+        yield from render_operand(self.awaitable, self, config, side="right")
+
+    def lower(self) -> ast.expr:
+        return ast.Await(value=self.awaitable.lower())
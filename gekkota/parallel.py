@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+from typing import List, Sequence, Tuple
+
+from .config import RenderConfig
+from .constants import PARALLEL_CHUNK_SIZE, Config
+from .core import Statement
+from .plans import LineBreaks
+
+# tokens of every statement in a chunk, with a flag that tells if the statement is multiline
+RenderedChunk = List[Tuple[List[str], bool]]
+
+
+def render_chunk(statements: Sequence[Statement], config: Config) -> RenderedChunk:
+    rendered: RenderedChunk = []
+    join = not config.get("compact", False)
+
+    for statement in statements:
+        out: List[str] = []
+        statement.render_into(out, config)
+        multiline = "\n" in out
+
+        # compact output is post-processed by tokens, so it can be joined only after compacting
+        rendered.append((["".join(out)] if join else out, multiline))
+
+    return rendered
+
+
+def render_parallel(
+    statements: Sequence[Statement], out: List[str], config: Config, workers: int
+) -> None:
+    """
+
+    Renders statements (same as `Code`) on a thread pool of `workers` threads, chunk by chunk, and appends tokens to `out`.
+
+    Separators between statements are added afterwards, so the output is the same as with a single thread.
+    Threads only speed up rendering on free-threaded Python builds.
+
+    """
+    inline_small = config.get("inline_small_stmts", False)
+    place_semicolons = config.get("place_semicolons", False) or inline_small
+    compact = config.get("compact", False)
+
+    # statements are rendered one by one inside chunks, nested `Code` doesn't start its own pool
+    if isinstance(config, RenderConfig):
+        # keeps plan and cache keys of the config precomputed
+        config = config.replace(workers=0)
+    else:
+        config = {**config, "workers": 0}
+    size = max(1, min(PARALLEL_CHUNK_SIZE, -(-len(statements) // workers)))
+    chunks = [statements[i : i + size] for i in range(0, len(statements), size)]
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(render_chunk, chunks, repeat(config)))
+
+    breaks = LineBreaks(statements, compact, place_semicolons, inline_small)
+    last_one_line = True
+
+    for i, (tokens, multiline) in enumerate(chain.from_iterable(results)):
+        if i:
+            semicolon, newlines = breaks.before(i, last_one_line)
+            if semicolon:
+                out.append(";")
+            if not newlines:
+                out.append(" ")
+            out.extend("\n" * newlines)
+
+            # a multiline statement needs its own line
+            if place_semicolons and multiline:
+                out.append("\n")
+
+        out.extend(tokens)
+        last_one_line = not multiline
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Sequence, Union
+
+import ast
+from typing import Iterable, Sequence, Union
 
 from .small_stmt import PassStmt
 from .utils import Utils
@@ -8,9 +10,15 @@ from .core import Renderable, Statement
 from .constants import Config, StrGen
 from .expression import Expression
 from .block import Block, BlockStmt
+from .lowering import literal, lower_body, optional
+from .plans import Child, Items, Join, PlanItem, Repr, Text, When, separated_items
 
 
 class MatchStmt(BlockStmt):
+    __slots__ = ("value",)
+
+    head_plan = ("match", " ", Child("value"))
+
     def __init__(self, value: Expression, cases: Sequence[CaseStmt]):
         self.body = Block(cases) if cases else PassStmt()
         self.value = value
@@ -20,8 +28,28 @@ class MatchStmt(BlockStmt):
         yield " "
         yield from self.value.render(config)
 
+    def lower(self) -> ast.stmt:
+        if not hasattr(ast, "Match"):
+            raise ValueError(
+                "`match` statements need Python 3.10 or newer to be lowered"
+            )
+
+        cases = self.body.statements if isinstance(self.body, Block) else ()
+        return ast.Match(
+            subject=self.value.lower(), cases=[case.lower() for case in cases]
+        )
+
 
 class CaseStmt(BlockStmt):
+    __slots__ = ("pattern", "guard")
+
+    head_plan = (
+        "case",
+        " ",
+        Child("pattern"),
+        When("guard", " ", "if", " ", Child("guard")),
+    )
+
     def __init__(
         self, pattern: Pattern, body: Statement, guard: Expression | None = None
     ):
@@ -39,12 +67,23 @@ class CaseStmt(BlockStmt):
             yield " "
             yield from self.guard.render(config)
 
+    def lower(self) -> ast.match_case:
+        return ast.match_case(
+            pattern=self.pattern.lower(),
+            guard=optional(self.guard),
+            body=lower_body(self.body),
+        )
+
 
 class Pattern(Renderable):
-    pass
+    __slots__ = ()
 
 
 class AsPattern(Pattern):
+    __slots__ = ("pattern", "alias")
+
+    render_plan = (Child("pattern"), " ", "as", " ", Child("alias"))
+
     def __init__(self, pattern: OrPattern | ClosedPattern, alias: CapturePattern):
         self.pattern = pattern
         self.alias = alias
@@ -56,8 +95,15 @@ class AsPattern(Pattern):
         yield " "
         yield from self.alias.render(config)
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchAs(pattern=self.pattern.lower(), name=self.alias.name)
+
 
 class OrPattern(Pattern):
+    __slots__ = ("alternatives",)
+
+    render_plan = (Join("alternatives", " | "),)
+
     def __init__(self, alternatives: Sequence[ClosedPattern]):
         self.alternatives = alternatives
         assert alternatives, "OrPattern cannot be empty"
@@ -65,6 +111,11 @@ class OrPattern(Pattern):
     def render(self, config: Config) -> StrGen:
         yield from Utils.separated(" | ", self.alternatives, config)
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchOr(
+            patterns=[alternative.lower() for alternative in self.alternatives]
+        )
+
     def __or__(self, other: ClosedPattern | OrPattern) -> OrPattern:
         if isinstance(other, OrPattern):
             return OrPattern([*self.alternatives, *other.alternatives])
@@ -75,6 +126,8 @@ class OrPattern(Pattern):
 
 
 class ClosedPattern(Pattern):
+    __slots__ = ()
+
     def __or__(self, other: ClosedPattern | OrPattern) -> OrPattern:
         if isinstance(other, OrPattern):
             return OrPattern([self, *other.alternatives])
@@ -88,41 +141,75 @@ PositionalPattern = Union[AsPattern, OrPattern, ClosedPattern]
 
 
 class WildcardPattern(ClosedPattern):
+    __slots__ = ()
+
+    render_plan = ("_",)
+
     def render(self, config: Config) -> StrGen:
         yield "_"
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchAs(pattern=None, name=None)
+
 
 class CapturePattern(ClosedPattern):
+    __slots__ = ("name",)
+
+    render_plan = (Text("name"),)
+
     def __init__(self, name: str):
         self.name = name
 
     def render(self, config: Config) -> StrGen:
         yield self.name
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchAs(pattern=None, name=self.name)
+
     def getattr(self, attr: str) -> ValuePattern:
         return ValuePattern(Name(self.name).getattr(attr))
 
 
 class ValuePattern(ClosedPattern):
+    __slots__ = ("name",)
+
+    render_plan = (Child("name"),)
+
     def __init__(self, name: GetAttr[Identifier]):
         self.name = name
 
     def render(self, config: Config) -> StrGen:
         yield from self.name.render(config)
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchValue(value=self.name.lower())
+
     def getattr(self, attr: str) -> ValuePattern:
         return ValuePattern(self.name.getattr(attr))
 
 
 class LiteralPattern(ClosedPattern):
+    __slots__ = ("value",)
+
+    render_plan = (Repr("value"),)
+
     def __init__(self, value: LiteralValue):
         self.value = value
 
     def render(self, config: Config) -> StrGen:
         return Literal(self.value).render(config)
 
+    def lower(self) -> ast.pattern:
+        if self.value is None or isinstance(self.value, bool):
+            return ast.MatchSingleton(value=self.value)
+        return ast.MatchValue(value=literal(self.value))
+
 
 class StarPattern(Renderable):
+    __slots__ = ("pattern",)
+
+    render_plan = ("*", Child("pattern"))
+
     def __init__(self, pattern: CapturePattern | WildcardPattern):
         self.pattern = pattern
 
@@ -130,8 +217,16 @@ class StarPattern(Renderable):
         yield "*"
         yield from self.pattern.render_str(config)
 
+    def lower(self) -> ast.pattern:
+        name = self.pattern.name if isinstance(self.pattern, CapturePattern) else None
+        return ast.MatchStar(name=name)
+
 
 class OpenSequencePattern(Pattern):
+    __slots__ = ("elements",)
+
+    render_plan = (Join("elements"), ",")
+
     def __init__(self, elements: Sequence[StarPattern | PositionalPattern]):
         self.elements = elements
         assert elements, "OpenSequencePattern cannot be empty"
@@ -140,16 +235,32 @@ class OpenSequencePattern(Pattern):
         yield from Utils.comma_separated(self.elements, config)
         yield ","
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchSequence(
+            patterns=[element.lower() for element in self.elements]
+        )
+
 
 class SequencePattern(ClosedPattern):
+    __slots__ = ("pattern",)
+
+    render_plan = ("[", Child("pattern"), "]")
+
     def __init__(self, elements: Sequence[StarPattern | PositionalPattern]):
         self.pattern = OpenSequencePattern(elements)
 
     def render(self, config: Config) -> StrGen:
         yield from Utils.wrap("[]", self.pattern.render(config))
 
+    def lower(self) -> ast.pattern:
+        return self.pattern.lower()
+
 
 class KeywordPattern(Renderable):
+    __slots__ = ("name", "pattern")
+
+    render_plan = (Text("name"), "=", Child("pattern"))
+
     def __init__(self, name: str, pattern: PositionalPattern):
         self.name = name
         self.pattern = pattern
@@ -161,6 +272,10 @@ class KeywordPattern(Renderable):
 
 
 class ClassPattern(ClosedPattern):
+    __slots__ = ("classname", "positional_args", "keyword_args")
+
+    render_plan = (Child("classname"), "(", Items(), ")")
+
     def __init__(
         self,
         classname: Identifier | GetAttr[Identifier],
@@ -171,6 +286,9 @@ class ClassPattern(ClosedPattern):
         self.positional_args = positional_args
         self.keyword_args = keyword_args
 
+    def plan_items(self) -> Iterable[PlanItem]:
+        return separated_items([*self.positional_args, *self.keyword_args])
+
     def render(self, config: Config) -> StrGen:
         yield from self.classname.render(config)
         yield "("
@@ -180,8 +298,20 @@ class ClassPattern(ClosedPattern):
         )
         yield ")"
 
+    def lower(self) -> ast.pattern:
+        return ast.MatchClass(
+            cls=self.classname.lower(),
+            patterns=[pattern.lower() for pattern in self.positional_args],
+            kwd_attrs=[keyword.name for keyword in self.keyword_args],
+            kwd_patterns=[keyword.pattern.lower() for keyword in self.keyword_args],
+        )
+
 
 class DoubleStarPattern(Renderable):
+    __slots__ = ("pattern",)
+
+    render_plan = ("**", Child("pattern"))
+
     def __init__(self, pattern: CapturePattern):
         self.pattern = pattern
 
@@ -191,6 +321,10 @@ class DoubleStarPattern(Renderable):
 
 
 class KeyValuePattern(Renderable):
+    __slots__ = ("key", "value")
+
+    render_plan = (Child("key"), ":", " ", Child("value"))
+
     def __init__(self, key: LiteralPattern | ValuePattern, value: PositionalPattern):
         self.key = key
         self.value = value
@@ -203,16 +337,47 @@ class KeyValuePattern(Renderable):
 
 
 class MappingPattern(ClosedPattern):
+    __slots__ = ("items",)
+
+    render_plan = ("{", Join("items"), "}")
+
     def __init__(self, items: Sequence[KeyValuePattern | DoubleStarPattern]):
         self.items = items
 
     def render(self, config: Config) -> StrGen:
         return Utils.wrap("{}", Utils.comma_separated(self.items, config))
 
+    def lower(self) -> ast.pattern:
+        keys: list[ast.expr] = []
+        patterns: list[ast.pattern] = []
+        rest = None
+
+        for item in self.items:
+            if isinstance(item, DoubleStarPattern):
+                rest = item.pattern.name
+                continue
+
+            key = item.key
+            keys.append(
+                literal(key.value)
+                if isinstance(key, LiteralPattern)
+                else key.name.lower()
+            )
+            patterns.append(item.value.lower())
+
+        return ast.MatchMapping(keys=keys, patterns=patterns, rest=rest)
+
 
 class GroupPattern(ClosedPattern):
+    __slots__ = ("pattern",)
+
+    render_plan = ("(", Child("pattern"), ")")
+
     def __init__(self, pattern: PositionalPattern):
         self.pattern = pattern
 
     def render(self, config: Config) -> StrGen:
         yield from Utils.wrap("()", self.pattern.render(config))
+
+    def lower(self) -> ast.pattern:
+        return self.pattern.lower()
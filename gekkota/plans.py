@@ -0,0 +1,963 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .constants import Config, StrGen
+from .core import Renderable, Statement
+from .tokens import (
+    Indent,
+    Newline,
+    NodeMarker,
+    Punctuation,
+    TypedGen,
+    Whitespace,
+    classify,
+    classify_tokens,
+)
+
+
+# ops of a compiled plan: constant strings are stored as is, everything else is a tuple starting with one of these
+CHILD = 0
+TEXT = 1
+REPR = 2
+WHEN = 3
+WHEN_SET = 4
+JOIN = 5
+JOIN_TEXT = 6
+LINES = 7
+INDENTED = 8
+ITEMS = 9
+# typed versions of the ops above, used when rendering typed tokens
+TYPED_TEXT = 10
+TYPED_REPR = 11
+TYPED_JOIN_TEXT = 12
+TYPED_ITEMS = 13
+OPERAND = 14
+
+Op = Union[str, Tuple[Any, ...]]
+Ops = Tuple[Op, ...]
+
+PlanItem = Union[str, Renderable]
+Writer = Callable[[Renderable, List[str], "PlanWriter"], None]
+
+
+class PlanOptions:
+    """Config options that affect compiled plans"""
+
+    __slots__ = ("compact", "tab", "place_semicolons", "inline_small_stmts", "typed")
+
+    def __init__(self, config: Config):
+        self.compact: bool = config.get("compact", False)
+        self.tab: str = config.get("tab_size", 4) * config.get("tab_char", " ")
+        self.inline_small_stmts: bool = config.get("inline_small_stmts", False)
+        self.place_semicolons: bool = (
+            config.get("place_semicolons", False) or self.inline_small_stmts
+        )
+        # typed plans keep every constant as a separate typed token, compaction is done by `tokens.fuse`
+        self.typed: bool = config.get("typed_tokens", False)
+        if self.typed:
+            self.tab = Indent(self.tab)
+
+    @staticmethod
+    def key(config: Config) -> Tuple[Any, ...]:
+        return (
+            config.get("compact", False),
+            config.get("tab_size", 4),
+            config.get("tab_char", " "),
+            config.get("place_semicolons", False),
+            config.get("inline_small_stmts", False),
+            config.get("typed_tokens", False),
+        )
+
+
+class Step:
+    """A part of a render plan, other than a constant string"""
+
+    __slots__ = ()
+
+    def compile(self, options: PlanOptions) -> Op:
+        raise NotImplementedError
+
+
+PlanSpec = Sequence[Union[str, Step]]
+
+
+class Child(Step):
+    """Renders a node stored in `attr`"""
+
+    __slots__ = ("attr",)
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (CHILD, self.attr)
+
+
+def needs_parens(operand: Any, parent: Any, side: str = "none") -> bool:
+    """Checks if `operand` has to be parenthesized on `side` of `parent`, from their priorities and associativity"""
+    priority = operand.priority
+
+    if priority != parent.priority:
+        return priority < parent.priority
+
+    associativity = operand.associativity
+    return side != "none" and associativity != "both" and associativity != side
+
+
+class Operand(Step):
+    """Renders an expression stored in `attr`, in parentheses if `needs_parens` says so (no `Parens` nodes are made for that)"""
+
+    __slots__ = ("attr", "side")
+
+    def __init__(self, attr: str, side: str = "none"):
+        self.attr = attr
+        self.side = side
+
+    def compile(self, options: PlanOptions) -> Op:
+        if options.typed:
+            return (OPERAND, self.attr, self.side, classify("("), classify(")"))
+        return (OPERAND, self.attr, self.side, "(", ")")
+
+
+class Text(Step):
+    """Renders a string stored in `attr` as a token"""
+
+    __slots__ = ("attr",)
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (TYPED_TEXT if options.typed else TEXT, self.attr)
+
+
+class Repr(Step):
+    """Renders `repr()` of a value stored in `attr`"""
+
+    __slots__ = ("attr",)
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (TYPED_REPR if options.typed else REPR, self.attr)
+
+
+class When(Step):
+    """Renders `steps` if `attr` is truthy, `otherwise` if not"""
+
+    __slots__ = ("attr", "steps", "otherwise")
+
+    def __init__(self, attr: str, *steps: Union[str, Step], otherwise: PlanSpec = ()):
+        self.attr = attr
+        self.steps = steps
+        self.otherwise = otherwise
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (
+            WHEN,
+            self.attr,
+            compile_steps(self.steps, options),
+            compile_steps(self.otherwise, options),
+        )
+
+
+class WhenSet(When):
+    """Same as `When`, but checks that `attr` is not None"""
+
+    __slots__ = ()
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (WHEN_SET, *When.compile(self, options)[1:])
+
+
+class Join(Step):
+    """Renders a sequence of nodes stored in `attr` with `separator` tokens between them (same as Utils.separated)"""
+
+    __slots__ = ("attr", "separator")
+
+    def __init__(self, attr: str, separator: Sequence[str] = ", "):
+        self.attr = attr
+        self.separator = separator
+
+    def compile(self, options: PlanOptions) -> Op:
+        if options.typed:
+            return (JOIN, self.attr, tuple(map(classify, self.separator)))
+
+        separator = merge_constants(self.separator, options.compact)
+        return (JOIN, self.attr, (separator,) if separator else ())
+
+
+class JoinText(Step):
+    """Renders a sequence of strings stored in `attr`, joined with `separator`, as one token. Not meant for whitespace separators"""
+
+    __slots__ = ("attr", "separator")
+
+    def __init__(self, attr: str, separator: str):
+        self.attr = attr
+        self.separator = separator
+
+    def compile(self, options: PlanOptions) -> Op:
+        if options.typed:
+            return (TYPED_JOIN_TEXT, self.attr, classify(self.separator))
+        return (JOIN_TEXT, self.attr, self.separator)
+
+
+class Lines(Step):
+    """Renders a sequence of statements stored in `attr` on separate lines (same as Code.spaced_render)"""
+
+    __slots__ = ("attr",)
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (
+            LINES,
+            self.attr,
+            options.compact,
+            options.place_semicolons,
+            options.inline_small_stmts,
+        )
+
+
+class LineBreaks:
+    """
+
+    Separators between statements of `Lines` (and `Code`), shared by all renderers.
+
+    Statements are separated by a newline and blank lines (the biggest `spacing` of a statement and its neighbours, none in compact mode).
+    With `place_semicolons`, one-line statements are followed by `;`. With `inline_small`, the next statement goes on the same line after a space,
+    and a multiline statement (other than the first one) still starts on a new line.
+
+    """
+
+    __slots__ = (
+        "statements",
+        "compact",
+        "place_semicolons",
+        "inline_small",
+        "current",
+        "next",
+    )
+
+    def __init__(
+        self,
+        statements: Sequence[Statement],
+        compact: bool,
+        place_semicolons: bool,
+        inline_small: bool,
+    ):
+        self.statements = statements
+        self.compact = compact
+        self.place_semicolons = place_semicolons
+        self.inline_small = inline_small
+
+        # spacings of the statement before the next separator and the one after it,
+        # statements are visited in order, so spacing of every statement is read once (and lazy sequences stay lazy)
+        self.current = 0
+        self.next = 0
+        if not compact and len(statements) > 1:
+            self.current = statements[0].spacing
+            self.next = statements[1].spacing
+
+    def before(self, i: int, last_one_line: bool) -> Tuple[bool, int]:
+        """
+
+        Separator before statement `i`: whether `;` is placed, and the number of newlines (a space if 0).
+        It has to be called for every `i` from 1, in order.
+
+        """
+        spacing = 0
+
+        if not self.compact:
+            following = self.next
+            if i + 1 < len(self.statements):
+                following = self.statements[i + 1].spacing
+
+            spacing = max(self.current, self.next, following)
+            self.current = self.next
+            self.next = following
+
+        if not last_one_line:
+            return False, 1 + spacing
+        if self.inline_small:
+            return self.place_semicolons, 0
+        return self.place_semicolons, 1 + spacing
+
+
+class Indented(Step):
+    """Renders `steps` with an extra indentation level (same as Utils.add_tab)"""
+
+    __slots__ = ("steps",)
+
+    def __init__(self, *steps: Union[str, Step]):
+        self.steps = steps
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (INDENTED, compile_steps(self.steps, options), options.tab)
+
+
+class Items(Step):
+    """Calls `method` of the node, which returns strings and nodes to render in order. Used for logic that doesn't fit other steps"""
+
+    __slots__ = ("method",)
+
+    def __init__(self, method: str = "plan_items"):
+        self.method = method
+
+    def compile(self, options: PlanOptions) -> Op:
+        return (TYPED_ITEMS if options.typed else ITEMS, self.method)
+
+
+def separated_items(
+    renderables: Sequence[Renderable], separator: Sequence[str] = ", "
+) -> Iterator[PlanItem]:
+    """Same as `Utils.separated`, but for `Items` methods"""
+    for i, renderable in enumerate(renderables):
+        if i:
+            yield from separator
+        yield renderable
+
+
+def is_word_start(token: str) -> bool:
+    return token[0] == "_" or token[0].isalnum()
+
+
+def is_word_end(token: str) -> bool:
+    return token[-1] == "_" or token[-1].isalnum()
+
+
+def merge_constants(tokens: Iterable[str], compact: bool) -> str:
+    """Joins constant tokens, the way they would look after `tokens.fuse` if `compact` is set"""
+    result = ""
+
+    for token in tokens:
+        if not token or compact and token == " ":
+            continue
+        if compact and result and is_word_end(result) and is_word_start(token):
+            result += " "
+        result += token
+
+    return result
+
+
+def compile_steps(steps: PlanSpec, options: PlanOptions) -> Ops:
+    """
+
+    Compiles plan steps for the given options: adjacent constants are merged into one token.
+
+    Newlines always stay separate tokens, since indentation and statement separation depend on them.
+
+    """
+    ops: List[Op] = []
+    constants: List[str] = []
+
+    def flush():
+        if options.typed:
+            ops.extend(classify(constant) for constant in constants if constant)
+        else:
+            merged = merge_constants(constants, options.compact)
+            if merged:
+                ops.append(merged)
+        constants.clear()
+
+    for step in steps:
+        if isinstance(step, str):
+            if step == "\n":
+                flush()
+                ops.append(classify(step) if options.typed else step)
+            else:
+                constants.append(step)
+            continue
+
+        flush()
+        ops.append(step.compile(options))
+
+    flush()
+    return tuple(ops)
+
+
+RENDER_METHODS = ("render", "render_head", "render_one", "render_empty")
+PLAN_ATTRIBUTES = ("render_plan", "head_plan")
+
+
+def defining_class(cls: type, names: Sequence[str]) -> Optional[type]:
+    for base in cls.__mro__:
+        if any(name in vars(base) for name in names):
+            return base
+    return None
+
+
+def get_spec(cls: Type[Renderable]) -> Optional[PlanSpec]:
+    """
+
+    Returns a plan spec for `cls`, or None if `cls` has to be rendered with `render()`.
+
+    A plan is used only if it's defined in the same class as the render methods or in its subclass,
+    so subclasses that override `render` (or `render_head`, etc.) are still rendered by their own code.
+
+    """
+    plan_owner = defining_class(cls, PLAN_ATTRIBUTES)
+    render_owner = defining_class(cls, RENDER_METHODS)
+
+    if plan_owner is None or render_owner is None:
+        return None
+
+    if not issubclass(plan_owner, render_owner):
+        return None
+
+    spec: Any = getattr(cls, "render_plan", None)
+    if callable(spec):
+        spec = spec()
+    return spec
+
+
+render_into_overrides: Dict[type, bool] = {}
+
+
+def overrides_render_into(cls: type) -> bool:
+    """Checks if `cls` has its own `render_into`, not overridden by `render` (or `render_head`, etc.) in a subclass"""
+    result = render_into_overrides.get(cls)
+
+    if result is None:
+        into_owner = defining_class(cls, ("render_into",))
+        render_owner = defining_class(cls, RENDER_METHODS)
+        result = render_into_overrides[cls] = (
+            into_owner is not Renderable
+            and into_owner is not None
+            and render_owner is not None
+            and issubclass(into_owner, render_owner)
+        )
+
+    return result
+
+
+class PlanTable:
+    """Compiled plans for every class, for a particular set of options"""
+
+    __slots__ = ("options", "plans", "writers")
+
+    def __init__(self, options: PlanOptions):
+        self.options = options
+        self.plans: Dict[type, Optional[Ops]] = {}
+        self.writers: Dict[type, Optional[Writer]] = {}
+
+    def compile(self, cls: Type[Renderable]) -> Optional[Ops]:
+        spec = get_spec(cls)
+        plan = None if spec is None else compile_steps(spec, self.options)
+        self.plans[cls] = plan
+        return plan
+
+    def lookup(self, cls: Type[Renderable]) -> Optional[Ops]:
+        try:
+            return self.plans[cls]
+        except KeyError:
+            return self.compile(cls)
+
+    def writer(self, cls: Type[Renderable]) -> Optional[Writer]:
+        try:
+            return self.writers[cls]
+        except KeyError:
+            ops = self.lookup(cls)
+            writer = None if ops is None else compile_writer(cls, ops)
+            self.writers[cls] = writer
+            return writer
+
+
+plan_tables: Dict[Tuple[Any, ...], PlanTable] = {}
+
+
+def plans_for(config: Config) -> PlanTable:
+    """Returns (cached) plans compiled for `config`"""
+    if config.__class__ is RenderConfig:
+        key = config.plan_key  # type: ignore
+    else:
+        key = PlanOptions.key(config)
+    table = plan_tables.get(key)
+
+    if table is None:
+        table = plan_tables[key] = PlanTable(PlanOptions(config))
+
+    return table
+
+
+def compile_plan(cls: Type[Renderable], config: Config) -> Optional[Ops]:
+    """Returns a compiled plan of `cls` for `config`, or None if `cls` is rendered with `render()`"""
+    return plans_for(config).lookup(cls)
+
+
+def indent_lines(generator: StrGen, indent: str) -> StrGen:
+    """Adds `indent` after every newline"""
+    for token in generator:
+        yield token
+        if token == "\n":
+            yield indent
+
+
+class PlanRenderer:
+    """
+
+    Renders nodes using compiled plans, falling back to `render()` for nodes without them.
+
+    Current indentation is kept as one prefix string and emitted once after every newline,
+    instead of filtering tokens through a generator per nesting level.
+
+    """
+
+    newline_token = "\n"
+    semicolon = ";"
+    space = " "
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.table = plans_for(config)
+        self.indent = ""
+
+    def render(self, node: Renderable) -> StrGen:
+        ops = self.table.lookup(type(node))
+
+        if ops is None:
+            if self.indent:
+                return indent_lines(node.render(self.config), self.indent)
+            return node.render(self.config)
+
+        return self.run(node, ops)
+
+    def run(self, node: Renderable, ops: Ops) -> StrGen:
+        for op in ops:
+            if isinstance(op, str):
+                yield op
+                if op == "\n" and self.indent:
+                    yield self.indent
+                continue
+
+            kind = op[0]
+
+            if kind == CHILD:
+                yield from self.render(getattr(node, op[1]))
+
+            elif kind == OPERAND:
+                child = getattr(node, op[1])
+                if needs_parens(child, node, op[2]):
+                    yield op[3]
+                    yield from self.render(child)
+                    yield op[4]
+                else:
+                    yield from self.render(child)
+
+            elif kind == TEXT:
+                yield getattr(node, op[1])
+
+            elif kind == REPR:
+                yield repr(getattr(node, op[1]))
+
+            elif kind == WHEN:
+                yield from self.run(node, op[2] if getattr(node, op[1]) else op[3])
+
+            elif kind == WHEN_SET:
+                value = getattr(node, op[1])
+                yield from self.run(node, op[2] if value is not None else op[3])
+
+            elif kind == JOIN:
+                separator = op[2]
+                for i, child in enumerate(getattr(node, op[1])):
+                    if i:
+                        yield from separator
+                    yield from self.render(child)
+
+            elif kind == JOIN_TEXT:
+                items = getattr(node, op[1])
+                if items:
+                    yield op[2].join(items)
+
+            elif kind == LINES:
+                yield from self.lines(getattr(node, op[1]), *op[2:])
+
+            elif kind == INDENTED:
+                outer = self.indent
+                self.indent = op[2].__class__(outer + op[2])
+                # a generator closed between tokens (e.g. an unfinished `render()`) must not leave the renderer indented
+                try:
+                    yield op[2]
+                    yield from self.run(node, op[1])
+                finally:
+                    self.indent = outer
+
+            elif kind == ITEMS:
+                for item in getattr(node, op[1])():
+                    if isinstance(item, str):
+                        yield item
+                        if item == "\n" and self.indent:
+                            yield self.indent
+                    else:
+                        yield from self.render(item)
+
+            elif kind == TYPED_TEXT:
+                yield classify(getattr(node, op[1]))
+
+            elif kind == TYPED_REPR:
+                yield classify(repr(getattr(node, op[1])))
+
+            elif kind == TYPED_JOIN_TEXT:
+                for i, item in enumerate(getattr(node, op[1])):
+                    if i:
+                        yield op[2]
+                    yield classify(item)
+
+            elif kind == TYPED_ITEMS:
+                for item in getattr(node, op[1])():
+                    if isinstance(item, str):
+                        yield classify(item)
+                        if item == "\n" and self.indent:
+                            yield self.indent
+                    else:
+                        yield from self.render(item)
+
+    def lines(
+        self,
+        statements: Sequence[Statement],
+        compact: bool,
+        place_semicolons: bool,
+        inline_small: bool,
+    ) -> StrGen:
+        if not statements:
+            return
+
+        breaks = LineBreaks(statements, compact, place_semicolons, inline_small)
+        last_one_line = True
+
+        for i, statement in enumerate(statements):
+            if i:
+                semicolon, newlines = breaks.before(i, last_one_line)
+                if semicolon:
+                    yield self.semicolon
+                if not newlines:
+                    yield self.space
+                for _ in range(newlines):
+                    yield from self.newline()
+
+            last_one_line = True
+            generator = iter(self.render(statement))
+
+            if not place_semicolons:
+                yield from generator
+                continue
+
+            if not i:
+                for token in generator:
+                    if token == "\n":
+                        last_one_line = False
+                    yield token
+                continue
+
+            # tokens are buffered only until the first newline, which means the statement needs its own line
+            head: List[str] = []
+            for token in generator:
+                if token == "\n":
+                    last_one_line = False
+                    yield from self.newline()
+                    yield from head
+                    yield token
+                    break
+                head.append(token)
+            else:
+                yield from head
+
+            yield from generator
+
+    def newline(self) -> Tuple[str, ...]:
+        if self.indent:
+            return (self.newline_token, self.indent)
+        return (self.newline_token,)
+
+
+class TypedPlanRenderer(PlanRenderer):
+    """
+
+    Renders typed tokens (check `gekkota.tokens`) with node markers around every node that has a plan.
+    Tokens of nodes rendered with their own `render()` are classified by their text.
+
+    """
+
+    newline_token = Newline("\n")
+    semicolon = Punctuation(";")
+    space = Whitespace(" ")
+
+    def __init__(self, config: Config):
+        super().__init__({**config, "typed_tokens": True})
+        self.indent = Indent("")
+
+    def render(self, node: Renderable) -> TypedGen:  # type: ignore
+        ops = self.table.lookup(type(node))
+
+        if ops is None:
+            return classify_tokens(super().render(node))
+
+        return self.marked(node, ops)
+
+    def marked(self, node: Renderable, ops: Ops) -> TypedGen:
+        yield NodeMarker(node)
+        yield from self.run(node, ops)
+        yield NodeMarker(node, end=True)
+
+
+def write_child(value: str, lines: List[str], pad: str) -> None:
+    # writers of known classes are called directly, others (and all nodes of `PlanWriter` subclasses that override `write`) go through `write`
+    lines.append(f"{pad}child = {value}")
+    lines.append(f"{pad}writer = direct.get(child.__class__)")
+    lines.append(f"{pad}if writer is None:")
+    lines.append(f"{pad}    write(child, out)")
+    lines.append(f"{pad}else:")
+    lines.append(f"{pad}    writer(child, out, w)")
+
+
+def writer_lines(ops: Ops, lines: List[str], depth: int) -> None:
+    pad = "    " * depth
+
+    if not ops:
+        lines.append(f"{pad}pass")
+
+    for op in ops:
+        if isinstance(op, str):
+            if op == "\n":
+                lines.append(f"{pad}w.newlines += 1")
+                lines.append(f"{pad}extend(w.newline)")
+            else:
+                lines.append(f"{pad}append({op!r})")
+            continue
+
+        kind = op[0]
+
+        if kind == CHILD:
+            write_child(f"node.{op[1]}", lines, pad)
+
+        elif kind == OPERAND:
+            lines.append(f"{pad}if needs_parens(node.{op[1]}, node, {op[2]!r}):")
+            lines.append(f"{pad}    append({op[3]!r})")
+            write_child(f"node.{op[1]}", lines, pad + "    ")
+            lines.append(f"{pad}    append({op[4]!r})")
+            lines.append(f"{pad}else:")
+            write_child(f"node.{op[1]}", lines, pad + "    ")
+
+        elif kind == TEXT:
+            lines.append(f"{pad}append(node.{op[1]})")
+
+        elif kind == REPR:
+            lines.append(f"{pad}append(repr(node.{op[1]}))")
+
+        elif kind == WHEN or kind == WHEN_SET:
+            check = " is not None" if kind == WHEN_SET else ""
+            lines.append(f"{pad}if node.{op[1]}{check}:")
+            writer_lines(op[2], lines, depth + 1)
+            if op[3]:
+                lines.append(f"{pad}else:")
+                writer_lines(op[3], lines, depth + 1)
+
+        elif kind == JOIN:
+            if not op[2]:
+                lines.append(f"{pad}for item in node.{op[1]}:")
+            else:
+                lines.append(f"{pad}for i, item in enumerate(node.{op[1]}):")
+                lines.append(f"{pad}    if i:")
+                lines.append(f"{pad}        extend({op[2]!r})")
+            write_child("item", lines, pad + "    ")
+
+        elif kind == JOIN_TEXT:
+            lines.append(f"{pad}if node.{op[1]}:")
+            lines.append(f"{pad}    append({op[2]!r}.join(node.{op[1]}))")
+
+        elif kind == LINES:
+            lines.append(f"{pad}w.lines(node.{op[1]}, out, {op[2]}, {op[3]}, {op[4]})")
+
+        elif kind == INDENTED:
+            outer = f"outer_{len(lines)}"
+            lines.append(f"{pad}{outer} = w.indent, w.newline")
+            lines.append(f"{pad}w.indent = {outer}[0] + {op[2]!r}")
+            lines.append(f"{pad}w.newline = ('\\n', w.indent)")
+            lines.append(f"{pad}append({op[2]!r})")
+            writer_lines(op[1], lines, depth)
+            lines.append(f"{pad}w.indent, w.newline = {outer}")
+
+        elif kind == ITEMS:
+            lines.append(f"{pad}w.items(node.{op[1]}(), out)")
+
+        else:
+            raise ValueError(f"Unknown op: {op!r}")
+
+
+def compile_writer(cls: type, ops: Ops) -> Writer:
+    """
+
+    Compiles a plan into a Python function that appends tokens of a `cls` instance to a list.
+
+    Constants become literals and steps become plain statements (e.g. `When` is an `if`),
+    so no ops are interpreted while rendering.
+
+    """
+    lines = [
+        "def write_node(node, out, w):",
+        "    append = out.append",
+        "    extend = out.extend",
+        "    write = w.write",
+        "    direct = w.direct",
+    ]
+    writer_lines(ops, lines, 1)
+
+    namespace: Dict[str, Any] = {"needs_parens": needs_parens}
+    exec(compile("\n".join(lines), f"<plan of {cls.__qualname__}>", "exec"), namespace)
+    return namespace["write_node"]
+
+
+class PlanWriter:
+    """
+
+    Appends tokens to a list using plans compiled into functions (check `compile_writer`).
+    Output is the same as `PlanRenderer`, but there's no generator per node to resume for every token.
+
+    Nodes without plans are rendered with their own `render_into()` (if overridden) or `render()`.
+
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.table = plans_for(config)
+        # compiled writers by class, called by other writers without `write()` (unless a subclass overrides it)
+        self.direct: Dict[type, Optional[Writer]] = (
+            self.table.writers if type(self).write is PlanWriter.write else {}
+        )
+        self.direct_statements = (
+            self.direct
+            if type(self).write_statement is PlanWriter.write_statement
+            else {}
+        )
+        self.indent = ""
+        self.newline: Tuple[str, ...] = ("\n",)
+        # number of newlines written so far, `Lines` uses it to find out if a statement is multiline
+        self.newlines = 0
+
+    def write(self, node: Renderable, out: List[str]) -> None:
+        writer = self.table.writer(type(node))
+
+        if writer is None:
+            self.fallback(node, out)
+        else:
+            writer(node, out, self)
+
+    def fallback(self, node: Renderable, out: List[str]) -> None:
+        tokens: StrGen
+        if overrides_render_into(type(node)):
+            start = len(out)
+            node.render_into(out, self.config)
+            tokens = out[start:]
+            del out[start:]
+        else:
+            tokens = node.render(self.config)
+
+        if not self.indent and not self.table.options.place_semicolons:
+            out.extend(tokens)
+            return
+
+        for token in tokens:
+            if token == "\n":
+                self.newlines += 1
+                out.extend(self.newline)
+            else:
+                out.append(token)
+
+    def write_statement(self, statement: Statement, out: List[str]) -> None:
+        """Writes a statement of `Lines`, subclasses can handle statements separately from other nodes"""
+        self.write(statement, out)
+
+    def items(self, items: Iterable[PlanItem], out: List[str]) -> None:
+        for item in items:
+            if not isinstance(item, str):
+                self.write(item, out)
+            elif item == "\n":
+                self.newlines += 1
+                out.extend(self.newline)
+            else:
+                out.append(item)
+
+    def lines(
+        self,
+        statements: Sequence[Statement],
+        out: List[str],
+        compact: bool,
+        place_semicolons: bool,
+        inline_small: bool,
+    ) -> None:
+        breaks = LineBreaks(statements, compact, place_semicolons, inline_small)
+        last_one_line = True
+        direct = self.direct_statements
+
+        for i, statement in enumerate(statements):
+            if i:
+                semicolon, newlines = breaks.before(i, last_one_line)
+                if semicolon:
+                    out.append(";")
+                if not newlines:
+                    out.append(" ")
+                for _ in range(newlines):
+                    self.newlines += 1
+                    out.extend(self.newline)
+
+            start = len(out)
+            newlines = self.newlines
+
+            writer = direct.get(statement.__class__)
+            if writer is None:
+                self.write_statement(statement, out)
+            else:
+                writer(statement, out, self)
+
+            if not place_semicolons:
+                continue
+
+            last_one_line = self.newlines == newlines
+
+            # a multiline statement needs its own line, only its own tokens are moved
+            if i and not last_one_line:
+                self.break_line(out, start)
+
+    def break_line(self, out: List[str], start: int) -> None:
+        """Inserts a newline before tokens from `start`"""
+        out[start:start] = self.newline
+
+
+def render_planned(node: Renderable, config: Config) -> StrGen:
+    """Renders `node` with compiled plans. Yields the same text as `node.render(config)`"""
+    return PlanRenderer(config).render(node)
+
+
+def render_typed(node: Renderable, config: Config) -> TypedGen:
+    """Renders `node` into typed tokens with node markers. Joined text is the same as `render_planned` with `compact` off"""
+    return TypedPlanRenderer(config).render(node)
+
+
+# functions that replace `PlanWriter` in `write_planned` (the last one is used), e.g. to profile rendering
+render_hooks: List[Callable[[Renderable, List[str], Config], None]] = []
+
+
+def write_planned(node: Renderable, out: List[str], config: Config) -> None:
+    """Appends tokens of `node` to `out` with `PlanWriter`, same tokens as `render_planned(node, config)`"""
+    if render_hooks:
+        render_hooks[-1](node, out, config)
+    else:
+        PlanWriter(config).write(node, out)
+
+
+from .config import RenderConfig
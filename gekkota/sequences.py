@@ -1,24 +1,32 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Sequence
+import ast
+from typing import Any, Generic, Iterable, Sequence
 from typing_extensions import Type, TypeVar
 
 
-from .values import Name
+from .values import Literal, Name
 from .core import Renderable
 from .constants import Config, StrGen
 from .expression import Expression
+from .plans import Child, Items, Join, PlanItem, PlanSpec, separated_items
 from .utils import Utils
 
 T = TypeVar("T", default=Expression, bound=Renderable)
 
 
 class SequenceExpr(Expression, Generic[T]):
+    __slots__ = ("values",)
+
     parens: tuple[str, str] = ("", "")
 
     def __init__(self, values: Sequence[T]):
         self.values = values
 
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (cls.parens[0], Join("values"), cls.parens[1])
+
     def render_empty(self, config: Config) -> StrGen:
         yield from self.parens
 
@@ -35,14 +43,36 @@ class SequenceExpr(Expression, Generic[T]):
 
         yield from Utils.wrap(self.parens, Utils.comma_separated(self.values, config))
 
+    def lower(self) -> ast.expr:
+        return ast.Tuple(elts=[value.lower() for value in self.values], ctx=ast.Load())
+
 
 class ListExpr(SequenceExpr):
+    __slots__ = ()
+
     parens = ("[", "]")
 
+    def lower(self) -> ast.expr:
+        return ast.List(elts=[value.lower() for value in self.values], ctx=ast.Load())
+
 
 class TupleExpr(SequenceExpr):
+    __slots__ = ()
+
     parens = ("(", ")")
 
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (Items(),)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        yield self.parens[0]
+        yield from separated_items(self.values)
+        if len(self.values) == 1:
+            yield ","
+            yield " "
+        yield self.parens[1]
+
     def render_one(self, config: Config) -> StrGen:
         yield self.parens[0]
         yield from self.values[0].render(config)
@@ -52,13 +82,37 @@ class TupleExpr(SequenceExpr):
 
 
 class SetExpr(SequenceExpr):
+    __slots__ = ()
+
     parens = ("{", "}")
 
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (Items(),)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        if not self.values:
+            yield Name("set")()
+            return
+
+        yield self.parens[0]
+        yield from separated_items(self.values)
+        yield self.parens[1]
+
     def render_empty(self, config: Config) -> StrGen:
         yield from Name("set")().render(config)
 
+    def lower(self) -> ast.expr:
+        if not self.values:
+            return Name("set")().lower()
+        return ast.Set(elts=[value.lower() for value in self.values])
+
 
 class KeyValue(Expression):
+    __slots__ = ("key", "value")
+
+    render_plan = (Child("key"), ":", " ", Child("value"))
+
     def __init__(self, key: Expression, value: Expression):
         self.key = key
         self.value = value
@@ -69,15 +123,89 @@ class KeyValue(Expression):
         yield " "
         yield from self.value.render(config)
 
+    def lower(self) -> ast.expr:
+        raise ValueError("`key: value` pairs can only be lowered in dicts")
+
+
+class DictExpr(SequenceExpr["KeyValue | DoubleStarArg"]):
+    __slots__ = ()
 
-class DictExpr(SequenceExpr[KeyValue]):
     parens = ("{", "}")
 
+    def lower(self) -> ast.expr:
+        keys: list[ast.expr | None] = []
+        values: list[ast.expr] = []
+
+        for item in self.values:
+            if isinstance(item, DoubleStarArg):
+                keys.append(None)
+                values.append(item.value.lower())
+            elif isinstance(item, KeyValue):
+                keys.append(item.key.lower())
+                values.append(item.value.lower())
+            else:
+                raise ValueError(
+                    f"{type(item).__name__} can't be lowered as a dict item"
+                )
+
+        return ast.Dict(keys=keys, values=values)
+
+
+class LiteralSequence(Expression):
+    """
+
+    A list (or a tuple, depending on `kind`) of numbers and strings, stored as plain values.
+    Renders the same way as `kind` of `Literal` values, but values are joined in a single token, without a node per value.
+
+    `to_expression` makes these for arrays and, with `pack_runs=True`, for long runs of numbers and strings (e.g. numeric tables).
+
+    """
+
+    __slots__ = ("values", "kind")
+
+    def __init__(
+        self,
+        values: Sequence[int | float | str],
+        kind: Type[ListExpr | TupleExpr] = ListExpr,
+    ):
+        self.values = values
+        self.kind = kind
+
+    def render(self, config: Config) -> StrGen:
+        if len(self.values) < 2:
+            # empty sequences and 1-tuples are rendered in a special way
+            yield from self.kind(list(map(Literal, self.values))).render(config)
+            return
+
+        texts: Iterable[str] = map(repr, self.values)
+
+        if config.get("compact", False):
+            texts = (text[1:] if text.startswith("0.") else text for text in texts)
+            separator = ","
+        else:
+            separator = ", "
+
+        yield self.kind.parens[0]
+        yield separator.join(texts)
+        yield self.kind.parens[1]
+
+    def lower(self) -> ast.expr:
+        return self.kind(list(map(Literal, self.values))).lower()
+
 
 S = TypeVar("S", bound=Type[SequenceExpr[Any]])
 
 
 class Comprehension(Expression, Generic[S]):
+    __slots__ = ("ctype", "generator")
+
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (Items(),)
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        return (self.ctype.parens[0], self.generator, self.ctype.parens[1])
+
     def __init__(self, comprehension_type: S, generator: GeneratorBase):
         self.ctype = comprehension_type
         self.generator = generator
@@ -85,6 +213,25 @@ class Comprehension(Expression, Generic[S]):
     def render(self, config: Config) -> StrGen:
         yield from Utils.wrap(self.ctype.parens, self.generator.render(config))
 
+    def lower(self) -> ast.expr:
+        expression = self.generator.expression
+        generators = lower_generators(self.generator.parts)
+
+        if issubclass(self.ctype, DictExpr):
+            if not isinstance(expression, KeyValue):
+                raise ValueError("dict comprehension has to produce `key: value` pairs")
+            return ast.DictComp(
+                key=expression.key.lower(),
+                value=expression.value.lower(),
+                generators=generators,
+            )
+
+        if issubclass(self.ctype, SetExpr):
+            return ast.SetComp(elt=expression.lower(), generators=generators)
+        if issubclass(self.ctype, ListExpr):
+            return ast.ListComp(elt=expression.lower(), generators=generators)
+        return ast.GeneratorExp(elt=expression.lower(), generators=generators)
+
 
 class ListComprehension(Comprehension[Type[ListExpr]]):
     """
@@ -97,6 +244,8 @@ class ListComprehension(Comprehension[Type[ListExpr]]):
 
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         generator_or_expr: GeneratorBase | Expression,
@@ -119,6 +268,8 @@ class SetComprehension(Comprehension[Type[SetExpr]]):
 
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         generator_or_expr: GeneratorBase | Expression,
@@ -141,6 +292,8 @@ class DictComprehension(Comprehension[Type[DictExpr]]):
 
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         generator_or_expr: GeneratorBase | KeyValue,
@@ -153,3 +306,5 @@ class DictComprehension(Comprehension[Type[DictExpr]]):
 
 
 from .generator_expr import GeneratorBase, GeneratorPart
+from .args import DoubleStarArg
+from .lowering import lower_generators
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import codecs
+import gzip
+import lzma
+import os
+from typing import IO, Iterator, Union
+from typing_extensions import Protocol
+
+from .constants import DEFAULT_CHUNK_SIZE, Config, StrGen
+from .core import Renderable
+
+
+FileTarget = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+class TextSink(Protocol):
+    def write(self, __s: str) -> object:
+        ...
+
+
+class BinarySink(Protocol):
+    def write(self, __b: bytes) -> object:
+        ...
+
+
+def iter_chunks(tokens: StrGen, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Joins a token stream into strings of at least `chunk_size` characters (except for the last one)"""
+    buffer: list[str] = []
+    buffered = 0
+
+    for token in tokens:
+        buffer.append(token)
+        buffered += len(token)
+
+        if buffered >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_to_text(
+    renderable: Renderable,
+    sink: TextSink,
+    config: Config | None = None,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Renders `renderable` into a text stream, returns the number of characters written"""
+    written = 0
+
+    for chunk in iter_chunks(renderable.render_tokens(config), chunk_size):
+        sink.write(chunk)
+        written += len(chunk)
+
+    return written
+
+
+def render_to_binary(
+    renderable: Renderable,
+    sink: BinarySink,
+    config: Config | None = None,
+    *,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Renders `renderable` into a binary stream, encoding it incrementally. Returns the number of bytes written"""
+    encoder = codecs.getincrementalencoder(encoding)()
+    written = 0
+
+    for chunk in iter_chunks(renderable.render_tokens(config), chunk_size):
+        data = encoder.encode(chunk)
+        sink.write(data)
+        written += len(data)
+
+    tail = encoder.encode("", final=True)
+    if tail:
+        sink.write(tail)
+        written += len(tail)
+
+    return written
+
+
+def render_to_gzip(
+    renderable: Renderable,
+    target: FileTarget,
+    config: Config | None = None,
+    *,
+    compresslevel: int = 9,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Renders `renderable` into a gzip file (a path or a binary file object). Returns the number of uncompressed bytes"""
+    with gzip.open(target, mode="wb", compresslevel=compresslevel) as file:
+        return render_to_binary(
+            renderable, file, config, encoding=encoding, chunk_size=chunk_size
+        )
+
+
+def render_to_lzma(
+    renderable: Renderable,
+    target: FileTarget,
+    config: Config | None = None,
+    *,
+    preset: int | None = None,
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Renders `renderable` into a .xz file (a path or a binary file object). Returns the number of uncompressed bytes"""
+    with lzma.LZMAFile(target, mode="wb", preset=preset) as file:
+        return render_to_binary(
+            renderable, file, config, encoding=encoding, chunk_size=chunk_size
+        )
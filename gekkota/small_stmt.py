@@ -1,8 +1,11 @@
-from typing import Generic
+import ast
+from typing import Generic, Optional
 from typing_extensions import Never, TypeVar
 from .constants import Config, StrGen
 from .core import Renderable, Statement
 from .expression import Expression
+from .lowering import values_tuple, with_context
+from .plans import Join, PlanSpec, When
 from .utils import Utils
 from .values import Identifier
 
@@ -10,11 +13,17 @@ T = TypeVar("T", default=Expression, bound=Renderable)
 
 
 class SmallStmt(Statement, Generic[T]):
+    __slots__ = ("contents",)
+
     prefix: str
 
     def __init__(self, *contents: T):
         self.contents = contents
 
+    @classmethod
+    def render_plan(cls) -> PlanSpec:
+        return (cls.prefix, When("contents", " ", Join("contents")))
+
     def render(self, config: Config) -> StrGen:
         yield self.prefix
 
@@ -26,42 +35,102 @@ class SmallStmt(Statement, Generic[T]):
 
 
 class ReturnStmt(SmallStmt):
+    __slots__ = ()
+
     prefix = "return"
 
+    def lower(self) -> ast.stmt:
+        return ast.Return(value=values_tuple(self.contents))
+
 
 class BreakStmt(SmallStmt[Never]):
+    __slots__ = ()
+
     prefix = "break"
 
+    def lower(self) -> ast.stmt:
+        return ast.Break()
+
 
 class ContinueStmt(SmallStmt[Never]):
+    __slots__ = ()
+
     prefix = "continue"
 
+    def lower(self) -> ast.stmt:
+        return ast.Continue()
+
 
 class YieldStmt(SmallStmt, Expression):
+    __slots__ = ()
+
     priority = -1
     prefix = "yield"
 
+    def lower(self) -> ast.expr:
+        return ast.Yield(value=values_tuple(self.contents))
+
 
 class YieldFromStmt(SmallStmt, Expression):
+    __slots__ = ()
+
     prefix = "yield from"
     priority = -1
 
+    def lower(self) -> ast.expr:
+        value: Optional[ast.expr] = values_tuple(self.contents)
+        if value is None:
+            raise ValueError("`yield from` needs a value")
+        return ast.YieldFrom(value=value)
+
 
 class PassStmt(SmallStmt[Never]):
+    __slots__ = ()
+
     prefix = "pass"
 
+    def lower(self) -> ast.stmt:
+        return ast.Pass()
+
 
 class GlobalStmt(SmallStmt[Identifier]):
+    __slots__ = ()
+
     prefix = "global"
 
+    def lower(self) -> ast.stmt:
+        return ast.Global(names=[name.name for name in self.contents])
+
 
 class NonLocalStmt(GlobalStmt):
+    __slots__ = ()
+
     prefix = "nonlocal"
 
+    def lower(self) -> ast.stmt:
+        return ast.Nonlocal(names=[name.name for name in self.contents])
+
 
 class DelStmt(SmallStmt):
+    __slots__ = ()
+
     prefix = "del"
 
+    def lower(self) -> ast.stmt:
+        return ast.Delete(
+            targets=[
+                with_context(target.lower(), ast.Del()) for target in self.contents
+            ]
+        )
+
 
 class AssertStmt(SmallStmt):
+    __slots__ = ()
+
     prefix = "assert"
+
+    def lower(self) -> ast.stmt:
+        test, *message = self.contents
+        return ast.Assert(
+            test=test.lower(), msg=message[0].lower() if message else None
+        )
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .constants import Config
+from .core import Renderable
+from .iterative import LEFT, IterativeRenderer
+from .plans import PlanWriter
+from .tokens import fuse
+
+
+class Span:
+    """Where a node is in the rendered text: offsets of its first and after its last character, line (from 1) and column (from 0) of its start"""
+
+    __slots__ = ("node", "start", "end", "line", "column")
+
+    def __init__(self, node: Renderable, start: int, end: int, line: int, column: int):
+        self.node = node
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = column
+
+    def __repr__(self) -> str:
+        return f"Span({type(self.node).__name__}, {self.start}:{self.end}, line={self.line}, column={self.column})"
+
+
+class SourceMap:
+    """
+
+    Spans of all nodes of a rendered tree, created by `Renderable.render_mapped`.
+
+    Nodes without render plans are mapped as a whole, their children are not.
+
+    """
+
+    def __init__(
+        self,
+        text: str,
+        nodes: List[Renderable],
+        starts: List[int],
+        ends: List[int],
+        parents: List[int],
+    ):
+        # spans are stored as columns, in the order nodes were rendered, so a parent always comes before its children
+        self.nodes = nodes
+        self.starts = starts
+        self.ends = ends
+        self.parents = parents
+
+        self.line_starts = [0]
+        newline = text.find("\n")
+        while newline != -1:
+            self.line_starts.append(newline + 1)
+            newline = text.find("\n", newline + 1)
+
+        self.indices: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def span_at(self, index: int) -> Span:
+        start = self.starts[index]
+        line, column = self.position(start)
+        return Span(self.nodes[index], start, self.ends[index], line, column)
+
+    def spans(self) -> Iterator[Span]:
+        return map(self.span_at, range(len(self.nodes)))
+
+    def span(self, node: Renderable) -> Optional[Span]:
+        """Span of `node` (its first occurrence, if it's rendered more than once), or None if it's not in the tree"""
+        if self.indices is None:
+            self.indices = {}
+            for index in reversed(range(len(self.nodes))):
+                self.indices[id(self.nodes[index])] = index
+
+        index = self.indices.get(id(node))
+        return None if index is None else self.span_at(index)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Line (from 1) and column (from 0) of `offset`"""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+    def offset(self, line: int, column: int) -> int:
+        """Offset of a position, `line` starts from 1 and `column` from 0 (same as in tracebacks and `ast`)"""
+        return self.line_starts[line - 1] + column
+
+    def nodes_at(self, offset: int) -> List[Renderable]:
+        """All nodes that contain the character at `offset`, from the innermost to the root"""
+        index = bisect_right(self.starts, offset) - 1
+        result: List[Renderable] = []
+
+        while index != -1:
+            if offset < self.ends[index]:
+                result.append(self.nodes[index])
+            index = self.parents[index]
+
+        return result
+
+    def node_at(self, line: int, column: int) -> Optional[Renderable]:
+        """The innermost node that contains the character at a position, or None"""
+        nodes = self.nodes_at(self.offset(line, column))
+        return nodes[0] if nodes else None
+
+
+class MappingWriter(PlanWriter):
+    """`PlanWriter` that records token indices where every node starts and ends"""
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self.nodes: List[Renderable] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.parents: List[int] = []
+        self.current = -1
+
+    def write(self, node: Renderable, out: List[str]) -> None:
+        index = len(self.nodes)
+        self.nodes.append(node)
+        self.starts.append(len(out))
+        self.ends.append(0)
+        self.parents.append(self.current)
+
+        parent = self.current
+        self.current = index
+        super().write(node, out)
+        self.current = parent
+
+        self.ends[index] = len(out)
+
+    def break_line(self, out: List[str], start: int) -> None:
+        super().break_line(out, start)
+
+        # nodes of the moved statement are the last ones recorded
+        shift = len(self.newline)
+        index = len(self.nodes) - 1
+        while index >= 0 and self.starts[index] >= start:
+            self.starts[index] += shift
+            self.ends[index] += shift
+            index -= 1
+
+
+def compacted_offsets(
+    tokens: List[str], config: Config
+) -> Tuple[str, List[int], List[int]]:
+    """
+
+    Compacts tokens with `tokens.fuse`, returns the text, offsets where every original token starts in it
+    and offsets where tokens before it end (they differ if a space is added between words).
+
+    """
+    starts = [0] * (len(tokens) + 1)
+    ends = [0] * (len(tokens) + 1)
+    parts: List[str] = []
+    position = 0
+    index = -1
+
+    def source() -> Iterator[str]:
+        nonlocal index
+        for index, token in enumerate(tokens):
+            starts[index] = ends[index] = position
+            yield token
+
+    for part in fuse(source(), config):
+        # a space added between two words belongs to neither of them
+        if part == " " and tokens[index] != " ":
+            starts[index] += 1
+        parts.append(part)
+        position += len(part)
+
+    for rest in range(index + 1, len(tokens) + 1):
+        starts[rest] = ends[rest] = position
+
+    return "".join(parts), starts, ends
+
+
+class IterativeMapping:
+    """Same lists as `MappingWriter`, read from the markers of a mapped `IterativeRenderer`"""
+
+    def __init__(self, node: Renderable, config: Config, out: List[str]):
+        self.nodes: List[Renderable] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.parents: List[int] = []
+        current = -1
+
+        for token in IterativeRenderer(config, mapped=True).render(node):
+            if isinstance(token, str):
+                out.append(token)
+            elif token is LEFT:
+                self.ends[current] = len(out)
+                current = self.parents[current]
+            else:
+                self.nodes.append(token)
+                self.starts.append(len(out))
+                self.ends.append(0)
+                self.parents.append(current)
+                current = len(self.nodes) - 1
+
+
+def render_mapped(node: Renderable, config: Config) -> Tuple[str, SourceMap]:
+    out: List[str] = []
+    writer: MappingWriter | IterativeMapping
+    if config.get("iterative", False):
+        writer = IterativeMapping(node, config, out)
+    else:
+        writer = MappingWriter(config)
+        writer.write(node, out)
+
+    if config.get("compact", False):
+        text, starts, ends = compacted_offsets(out, config)
+    else:
+        text = "".join(out)
+        starts = ends = list(accumulate(map(len, out), initial=0))
+
+    source_map = SourceMap(
+        text,
+        writer.nodes,
+        [starts[start] for start in writer.starts],
+        [ends[end] for end in writer.ends],
+        writer.parents,
+    )
+    return text, source_map
+
+
+class Site:
+    """Where a node was created: the first frame outside of gekkota"""
+
+    __slots__ = ("filename", "line", "function")
+
+    def __init__(self, filename: str, line: int, function: str):
+        self.filename = filename
+        self.line = line
+        self.function = function
+
+    def __repr__(self) -> str:
+        return f"Site({self.filename}:{self.line} in {self.function})"
+
+
+package_dir = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+class SiteRecorder:
+    """Creation sites of nodes, only every `every`-th created node is recorded"""
+
+    def __init__(self, every: int = 100):
+        self.every = every
+        self.created = 0
+        # nodes are kept alive, so their ids can't be reused
+        self.sites: Dict[int, Tuple[Renderable, Site]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def record(self, node: Renderable) -> None:
+        self.created += 1
+        if self.created % self.every:
+            return
+
+        frame: Any = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename.startswith(package_dir):
+            frame = frame.f_back
+
+        if frame is not None:
+            code = frame.f_code
+            self.sites[id(node)] = (
+                node,
+                Site(code.co_filename, frame.f_lineno, code.co_name),
+            )
+
+    def get(self, node: Renderable) -> Optional[Site]:
+        entry = self.sites.get(id(node))
+        return None if entry is None else entry[1]
+
+    def find(self, nodes: Iterable[Renderable]) -> Optional[Site]:
+        """Site of the first node that has one, e.g. `sites.find(source_map.nodes_at(offset))` for the closest recorded node"""
+        for node in nodes:
+            site = self.get(node)
+            if site is not None:
+                return site
+        return None
+
+
+# recorders of the current context (thread or task), so nodes created elsewhere are not recorded
+recorders: ContextVar[Tuple[SiteRecorder, ...]] = ContextVar("recorders", default=())
+hook_lock = threading.Lock()
+
+
+def recording_new(cls: Any, *args: Any, **kwargs: Any) -> Any:
+    node = object.__new__(cls)
+    for recorder in recorders.get():
+        recorder.record(node)
+    return node
+
+
+def enable_site_recording() -> None:
+    """
+
+    Sets `Renderable.__new__`, so `recording_sites` can record where nodes are created. Call it at startup, before building trees.
+
+    The hook stays for the rest of the process (CPython keeps calling `__new__` of subclasses once set)
+    and makes node construction about 2.3 times slower (e.g. `Name("a")` 0.18 -> 0.43 µs), even outside of recordings.
+
+    """
+    with hook_lock:
+        if vars(Renderable).get("__new__") is not recording_new:
+            setattr(Renderable, "__new__", recording_new)
+
+
+@contextmanager
+def recording_sites(every: int = 100) -> Iterator[SiteRecorder]:
+    """
+
+    Records where nodes are created in the current thread (or task), while active. Only every `every`-th node is recorded.
+
+    Requires `enable_site_recording()`, otherwise raises RuntimeError.
+
+    """
+    if vars(Renderable).get("__new__") is not recording_new:
+        raise RuntimeError("call enable_site_recording() before recording_sites")
+
+    recorder = SiteRecorder(every)
+    token = recorders.set((*recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        recorders.reset(token)
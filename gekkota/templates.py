@@ -0,0 +1,797 @@
+from __future__ import annotations
+
+import ast
+import copy
+import re
+import textwrap
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .args import CallArg, DoubleStarArg, FuncArg, Slash, StarArg
+from .assignment import AnnotatedTarget, Assignment, AugmentedAssignment
+from .block import Block, Code
+from .classes import ClassDef
+from .constants import op_priorities
+from .control_flow import (
+    ElifStmt,
+    ElseStmt,
+    ForStmt,
+    IfExpr,
+    IfStmt,
+    WhileStmt,
+    WithStmt,
+    WithTarget,
+)
+from .core import Renderable, Statement
+from .digests import fields_of
+from .exceptions import ExceptStmt, FinallyStmt, RaiseStmt, TryStmt
+from .expression import Expression, Parens
+from .functions import Decorated, FuncDef, LambDef
+from .generator_expr import GeneratorExpr, GeneratorFor, GeneratorIf, GeneratorPart
+from .imports import FromImportStmt, ImportAlias, ImportDots, ImportStmt
+from .lowering import binary_ops, bool_ops, compare_ops, unary_ops
+from .operator_expr import AwaitExpr, BinaryExpr, UnaryExpr
+from .sequences import (
+    DictComprehension,
+    DictExpr,
+    KeyValue,
+    ListComprehension,
+    ListExpr,
+    SequenceExpr,
+    SetComprehension,
+    SetExpr,
+    TupleExpr,
+)
+from .small_stmt import (
+    AssertStmt,
+    BreakStmt,
+    ContinueStmt,
+    DelStmt,
+    GlobalStmt,
+    NonLocalStmt,
+    PassStmt,
+    ReturnStmt,
+    YieldFromStmt,
+    YieldStmt,
+)
+from .to_expression import to_expression
+from .values import (
+    CallExpr,
+    FormatSpec,
+    FString,
+    FStringPart,
+    GetAttr,
+    Indexing,
+    Literal,
+    Name,
+    SliceExpr,
+)
+
+
+HOLE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+# holes are replaced with identifiers starting with this prefix before parsing
+PREFIX = "_gekkota_hole_"
+PLACEHOLDER = re.compile(PREFIX + r"(\w+)")
+
+# names of operators by their AST classes
+binary_names = {cls: name for name, cls in binary_ops.items()}
+bool_names = {cls: name for name, cls in bool_ops.items()}
+compare_names = {cls: name for name, cls in compare_ops.items()}
+unary_names = {cls: name for name, cls in unary_ops.items()}
+
+# priorities of operators as Python parses them: shifts bind looser than `+` and `-`
+python_priorities = {**op_priorities, "<<": op_priorities[">>"]}
+PRIMARY = op_priorities["call"]
+
+
+def restore_holes(text: str) -> str:
+    """Puts `$name` back into string constants, holes are not substituted inside strings"""
+    return PLACEHOLDER.sub(r"$\1", text)
+
+
+def python_priority(node: ast.expr) -> int:
+    if isinstance(node, ast.BinOp):
+        return python_priorities[binary_names[type(node.op)]]
+    if isinstance(node, ast.BoolOp):
+        return op_priorities[bool_names[type(node.op)]]
+    if isinstance(node, ast.UnaryOp):
+        return op_priorities[f"u{unary_names[type(node.op)]}"]
+    if isinstance(node, ast.Compare):
+        return op_priorities["=="]
+    if isinstance(node, ast.IfExp):
+        return op_priorities["ternary"]
+    if isinstance(node, ast.Lambda):
+        return op_priorities["lambda"]
+    if isinstance(node, ast.NamedExpr):
+        return op_priorities[":="]
+    if isinstance(node, ast.Await):
+        return op_priorities["await"]
+    if isinstance(node, (ast.Yield, ast.YieldFrom)):
+        return -1
+    return PRIMARY
+
+
+class Lifter:
+    """
+
+    Converts Python AST into gekkota nodes. Only the structure is kept: comments and formatting are lost,
+    and operands get `Parens` where Python needs parentheses that gekkota doesn't place by itself.
+
+    """
+
+    def __init__(self):
+        # ids of `Name`s that stand for identifiers (e.g. an alias in `except E as e`), holes in them take strings
+        self.identifiers: Set[int] = set()
+
+    def unsupported(self, node: ast.AST) -> Any:
+        raise ValueError(f"{type(node).__name__} is not supported in templates")
+
+    def identifier(self, name: str, annotation: Optional[Expression] = None) -> Name:
+        node = Name(name, annotation)  # type: ignore
+        self.identifiers.add(id(node))
+        return node
+
+    def expression(self, node: ast.expr) -> Expression:
+        return getattr(self, f"lift_{type(node).__name__}", self.unsupported)(node)
+
+    def target(self, node: ast.expr) -> Any:
+        # Python's parser only accepts valid targets, so they are not checked again
+        return self.expression(node)
+
+    def optional(self, node: Optional[ast.expr]) -> Any:
+        return None if node is None else self.expression(node)
+
+    def operand(self, node: ast.expr, priority: int, same: bool = False) -> Expression:
+        """Lifts an operand, in `Parens` if its priority is lower than `priority` (or the same, if `same` is set)"""
+        lifted = self.expression(node)
+        own = python_priority(node)
+
+        if own < priority or same and own == priority:
+            return Parens(lifted)
+        return lifted
+
+    def statements(self, nodes: Sequence[ast.stmt]) -> List[Statement]:
+        result: List[Statement] = []
+        for node in nodes:
+            lifted = getattr(self, f"lift_{type(node).__name__}", self.unsupported)(
+                node
+            )
+            if isinstance(lifted, list):
+                result.extend(lifted)
+            else:
+                result.append(lifted)
+        return result
+
+    def block(self, nodes: Sequence[ast.stmt]) -> Block:
+        return Block(self.statements(nodes))
+
+    def orelse(self, nodes: Sequence[ast.stmt]) -> List[Statement]:
+        return [ElseStmt(self.block(nodes))] if nodes else []
+
+    # expressions
+
+    def lift_Name(self, node: ast.Name) -> Expression:
+        return Name(node.id)
+
+    def lift_Constant(self, node: ast.Constant) -> Expression:
+        if node.value is Ellipsis:
+            return Name("...")
+        if isinstance(node.value, str):
+            return Literal(restore_holes(node.value))
+        return Literal(node.value)  # type: ignore
+
+    def lift_BinOp(self, node: ast.BinOp) -> Expression:
+        op = binary_names[type(node.op)]
+        priority = python_priorities[op]
+        return BinaryExpr(
+            self.operand(node.left, priority, same=op == "**"),
+            self.operand(node.right, priority, same=op != "**"),
+            op,
+        )
+
+    def lift_BoolOp(self, node: ast.BoolOp) -> Expression:
+        op = bool_names[type(node.op)]
+        priority = op_priorities[op]
+        return BinaryExpr.chain(
+            op, [self.operand(value, priority, same=True) for value in node.values]
+        )
+
+    def lift_Compare(self, node: ast.Compare) -> Expression:
+        priority = op_priorities["=="]
+        left = self.operand(node.left, priority, same=True)
+        comparisons = [
+            (compare_names[type(op)], self.operand(comparator, priority, same=True))
+            for op, comparator in zip(node.ops, node.comparators)
+        ]
+
+        if len(comparisons) == 1:
+            op, right = comparisons[0]
+            return BinaryExpr(left, right, op)
+        return left.compare(*comparisons)
+
+    def lift_UnaryOp(self, node: ast.UnaryOp) -> Expression:
+        op = unary_names[type(node.op)]
+        return UnaryExpr(self.operand(node.operand, op_priorities[f"u{op}"]), op)
+
+    def lift_Await(self, node: ast.Await) -> Expression:
+        return AwaitExpr(self.operand(node.value, PRIMARY))
+
+    def lift_NamedExpr(self, node: ast.NamedExpr) -> Expression:
+        return BinaryExpr(
+            self.expression(node.target), self.expression(node.value), ":="
+        )
+
+    def lift_IfExp(self, node: ast.IfExp) -> Expression:
+        priority = op_priorities["ternary"]
+        return IfExpr(
+            self.operand(node.body, priority, same=True),
+            self.operand(node.test, priority, same=True),
+            self.expression(node.orelse),
+        )
+
+    def lift_Lambda(self, node: ast.Lambda) -> Expression:
+        return LambDef(self.arguments(node.args), self.expression(node.body))
+
+    def lift_Attribute(self, node: ast.Attribute) -> Expression:
+        value = self.operand(node.value, PRIMARY)
+        if type(value) is GetAttr:
+            return GetAttr(value.value, *value.attributes, node.attr)
+        return GetAttr(value, node.attr)
+
+    def lift_Call(self, node: ast.Call) -> Expression:
+        args: List[Any] = [self.expression(arg) for arg in node.args]
+
+        for keyword in node.keywords:
+            value = self.expression(keyword.value)
+            args.append(
+                DoubleStarArg(value)
+                if keyword.arg is None
+                else CallArg(keyword.arg, value)
+            )
+
+        return CallExpr(self.operand(node.func, PRIMARY), args)
+
+    def lift_Subscript(self, node: ast.Subscript) -> Expression:
+        return Indexing(self.operand(node.value, PRIMARY), self.index(node.slice))
+
+    def index(self, node: Any) -> Any:
+        if isinstance(node, ast.Tuple) and node.elts:
+            return SequenceExpr([self.index(element) for element in node.elts])
+        if isinstance(node, ast.Slice):
+            return SliceExpr(
+                self.optional(node.lower),
+                self.optional(node.upper),
+                self.optional(node.step),
+            )
+        # before 3.9, indices are wrapped in `Index` and `ExtSlice`
+        if type(node).__name__ == "Index":
+            return self.index(node.value)  # type: ignore
+        if type(node).__name__ == "ExtSlice":
+            return SequenceExpr([self.index(element) for element in node.dims])
+        return self.expression(node)
+
+    def lift_Starred(self, node: ast.Starred) -> Expression:
+        return StarArg(self.expression(node.value))
+
+    def lift_Tuple(self, node: ast.Tuple) -> Expression:
+        return TupleExpr([self.expression(element) for element in node.elts])
+
+    def lift_List(self, node: ast.List) -> Expression:
+        return ListExpr([self.expression(element) for element in node.elts])
+
+    def lift_Set(self, node: ast.Set) -> Expression:
+        return SetExpr([self.expression(element) for element in node.elts])
+
+    def lift_Dict(self, node: ast.Dict) -> Expression:
+        return DictExpr(
+            [
+                DoubleStarArg(self.expression(value))
+                if key is None
+                else KeyValue(self.expression(key), self.expression(value))
+                for key, value in zip(node.keys, node.values)
+            ]  # type: ignore
+        )
+
+    def generators(self, nodes: Sequence[ast.comprehension]) -> List[GeneratorPart]:
+        parts: List[GeneratorPart] = []
+        for node in nodes:
+            parts.append(
+                GeneratorFor(
+                    self.target(node.target),
+                    self.expression(node.iter),
+                    is_async=bool(node.is_async),
+                )
+            )
+            parts.extend(GeneratorIf(self.expression(test)) for test in node.ifs)
+        return parts
+
+    def lift_ListComp(self, node: ast.ListComp) -> Expression:
+        return ListComprehension(
+            self.expression(node.elt), self.generators(node.generators)
+        )
+
+    def lift_SetComp(self, node: ast.SetComp) -> Expression:
+        return SetComprehension(
+            self.expression(node.elt), self.generators(node.generators)
+        )
+
+    def lift_DictComp(self, node: ast.DictComp) -> Expression:
+        return DictComprehension(
+            KeyValue(self.expression(node.key), self.expression(node.value)),
+            self.generators(node.generators),
+        )
+
+    def lift_GeneratorExp(self, node: ast.GeneratorExp) -> Expression:
+        return GeneratorExpr(
+            self.expression(node.elt), self.generators(node.generators)
+        )
+
+    def lift_Yield(self, node: ast.Yield) -> Expression:
+        return YieldStmt(*self.values(node.value))
+
+    def lift_YieldFrom(self, node: ast.YieldFrom) -> Expression:
+        return YieldFromStmt(self.expression(node.value))
+
+    def values(self, node: Optional[ast.expr]) -> List[Expression]:
+        """Values of `return` and `yield`: a tuple is written as comma-separated values"""
+        if node is None:
+            return []
+        if isinstance(node, ast.Tuple) and node.elts:
+            return [self.expression(element) for element in node.elts]
+        return [self.expression(node)]
+
+    def lift_JoinedStr(self, node: ast.JoinedStr) -> Expression:
+        return FString(self.fstring_parts(node.values))
+
+    def fstring_parts(self, nodes: Sequence[ast.expr]) -> List[FStringPart]:
+        parts: List[FStringPart] = []
+
+        for node in nodes:
+            if isinstance(node, ast.Constant):
+                parts.append(restore_holes(str(node.value)))
+                continue
+
+            if not isinstance(node, ast.FormattedValue) or node.conversion != -1:
+                raise ValueError(
+                    "conversions in f-strings are not supported in templates"
+                )
+
+            value = self.expression(node.value)
+            if isinstance(node.format_spec, ast.JoinedStr):
+                spec = self.fstring_parts(node.format_spec.values)
+                if all(isinstance(part, str) for part in spec):
+                    spec = "".join(spec)  # type: ignore
+                parts.append(FormatSpec(value, spec))
+            else:
+                parts.append(value)
+
+        return parts
+
+    def arguments(self, node: ast.arguments) -> List[FuncArg]:
+        args: List[FuncArg] = []
+        positional = [*node.posonlyargs, *node.args]
+        defaults: List[Optional[ast.expr]] = [None] * (
+            len(positional) - len(node.defaults)
+        )
+
+        for i, (arg, default) in enumerate(
+            zip(positional, [*defaults, *node.defaults])
+        ):
+            args.append(self.argument(arg, default))
+            if i == len(node.posonlyargs) - 1:
+                args.append(Slash())
+
+        if node.vararg is not None:
+            args.append(StarArg(self.argument_name(node.vararg)))
+        elif node.kwonlyargs:
+            args.append(StarArg())
+
+        for arg, default in zip(node.kwonlyargs, node.kw_defaults):
+            args.append(self.argument(arg, default))
+
+        if node.kwarg is not None:
+            args.append(DoubleStarArg(self.argument_name(node.kwarg)))
+
+        return args
+
+    def argument(self, node: ast.arg, default: Optional[ast.expr]) -> FuncArg:
+        return FuncArg(node.arg, self.optional(node.annotation), self.optional(default))
+
+    def argument_name(self, node: ast.arg) -> Name:
+        return self.identifier(node.arg, self.optional(node.annotation))
+
+    # statements
+
+    def lift_Expr(self, node: ast.Expr) -> Statement:
+        value = self.expression(node.value)
+        # `x := 1` is not a statement without parentheses
+        return Parens(value) if isinstance(node.value, ast.NamedExpr) else value
+
+    def lift_Pass(self, node: ast.Pass) -> Statement:
+        return PassStmt()
+
+    def lift_Break(self, node: ast.Break) -> Statement:
+        return BreakStmt()
+
+    def lift_Continue(self, node: ast.Continue) -> Statement:
+        return ContinueStmt()
+
+    def lift_Return(self, node: ast.Return) -> Statement:
+        return ReturnStmt(*self.values(node.value))
+
+    def lift_Delete(self, node: ast.Delete) -> Statement:
+        return DelStmt(*map(self.target, node.targets))
+
+    def lift_Assert(self, node: ast.Assert) -> Statement:
+        message = [] if node.msg is None else [self.expression(node.msg)]
+        return AssertStmt(self.expression(node.test), *message)
+
+    def lift_Global(self, node: ast.Global) -> Statement:
+        return GlobalStmt(*map(self.identifier, node.names))
+
+    def lift_Nonlocal(self, node: ast.Nonlocal) -> Statement:
+        return NonLocalStmt(*map(self.identifier, node.names))
+
+    def lift_Raise(self, node: ast.Raise) -> Statement:
+        return RaiseStmt(self.optional(node.exc), self.optional(node.cause))
+
+    def assigned(self, node: ast.expr) -> Expression:
+        value = self.expression(node)
+        return Parens(value) if isinstance(node, ast.NamedExpr) else value
+
+    def lift_Assign(self, node: ast.Assign) -> Statement:
+        return Assignment(
+            [self.target(target) for target in node.targets],
+            self.assigned(node.value),
+        )
+
+    def lift_AugAssign(self, node: ast.AugAssign) -> Statement:
+        return AugmentedAssignment(
+            self.target(node.target),
+            f"{binary_names[type(node.op)]}=",
+            self.assigned(node.value),
+        )
+
+    def lift_AnnAssign(self, node: ast.AnnAssign) -> Statement:
+        annotation = self.expression(node.annotation)
+
+        if node.value is None:
+            if isinstance(node.target, ast.Name):
+                return self.identifier(node.target.id, annotation)
+            return AnnotatedTarget(self.target(node.target), annotation)
+
+        target = AnnotatedTarget(self.target(node.target), annotation)
+        return Assignment(target, self.assigned(node.value))
+
+    def lift_If(self, node: ast.If, clause: type = IfStmt) -> List[Statement]:
+        statements: List[Statement] = [
+            clause(self.expression(node.test), self.block(node.body))
+        ]
+
+        # `elif` is a single `if` in `orelse`
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            statements.extend(self.lift_If(node.orelse[0], ElifStmt))
+        else:
+            statements.extend(self.orelse(node.orelse))
+
+        return statements
+
+    def lift_While(self, node: ast.While) -> List[Statement]:
+        return [
+            WhileStmt(self.expression(node.test), self.block(node.body)),
+            *self.orelse(node.orelse),
+        ]
+
+    def lift_For(self, node: Union[ast.For, ast.AsyncFor]) -> List[Statement]:
+        loop = ForStmt(
+            self.target(node.target),
+            self.expression(node.iter),
+            self.block(node.body),
+            is_async=isinstance(node, ast.AsyncFor),
+        )
+        return [loop, *self.orelse(node.orelse)]
+
+    lift_AsyncFor = lift_For
+
+    def lift_With(self, node: Union[ast.With, ast.AsyncWith]) -> Statement:
+        targets: List[Any] = []
+
+        for item in node.items:
+            expression = self.expression(item.context_expr)
+            if item.optional_vars is None:
+                targets.append(expression)
+            elif isinstance(item.optional_vars, ast.Name):
+                targets.append(WithTarget(expression, item.optional_vars.id))
+            else:
+                raise ValueError("only names are supported after `as` in templates")
+
+        return WithStmt(
+            targets, self.block(node.body), is_async=isinstance(node, ast.AsyncWith)
+        )
+
+    lift_AsyncWith = lift_With
+
+    def lift_Try(self, node: ast.Try) -> List[Statement]:
+        statements: List[Statement] = [TryStmt(self.block(node.body))]
+
+        for handler in node.handlers:
+            exceptions = None
+            if handler.type is not None:
+                exceptions = self.values(handler.type)
+
+            alias = None if handler.name is None else self.identifier(handler.name)
+            statements.append(ExceptStmt(exceptions, alias, self.block(handler.body)))
+
+        statements.extend(self.orelse(node.orelse))
+        if node.finalbody:
+            statements.append(FinallyStmt(self.block(node.finalbody)))
+
+        return statements
+
+    def lift_Import(self, node: ast.Import) -> Statement:
+        return ImportStmt([self.alias(name) for name in node.names])
+
+    def lift_ImportFrom(self, node: ast.ImportFrom) -> Statement:
+        source: Any
+        if node.module is None:
+            source = ImportDots(node.level or 1)
+        else:
+            source = self.identifier("." * (node.level or 0) + node.module)
+
+        return FromImportStmt(
+            source,
+            [
+                StarArg() if name.name == "*" else self.alias(name)
+                for name in node.names
+            ],
+        )
+
+    def alias(self, node: ast.alias) -> Any:
+        name = self.identifier(node.name)
+        if node.asname is None:
+            return name
+        return ImportAlias(name, self.identifier(node.asname))
+
+    def type_params(self, node: Any) -> None:
+        if getattr(node, "type_params", None):
+            raise ValueError("type parameters are not supported in templates")
+
+    def decorated(self, node: Any, statement: Statement) -> Statement:
+        for decorator in reversed(node.decorator_list):
+            statement = Decorated(self.expression(decorator), statement)  # type: ignore
+        return statement
+
+    def lift_FunctionDef(
+        self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+    ) -> Statement:
+        self.type_params(node)
+        function = FuncDef(
+            node.name,
+            self.arguments(node.args),
+            self.block(node.body),
+            rtype=self.optional(node.returns),
+            is_async=isinstance(node, ast.AsyncFunctionDef),
+        )
+        return self.decorated(node, function)
+
+    lift_AsyncFunctionDef = lift_FunctionDef
+
+    def lift_ClassDef(self, node: ast.ClassDef) -> Statement:
+        self.type_params(node)
+        args: List[Any] = [self.expression(base) for base in node.bases]
+
+        for keyword in node.keywords:
+            value = self.expression(keyword.value)
+            args.append(
+                DoubleStarArg(value)
+                if keyword.arg is None
+                else CallArg(keyword.arg, value)
+            )
+
+        return self.decorated(node, ClassDef(node.name, args, self.block(node.body)))
+
+
+class Hole:
+    """A place in a template where a value is substituted: an identifier, an expression or a statement"""
+
+    __slots__ = ("name", "kind")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+
+    def convert(self, value: Any) -> Any:
+        if self.kind == "identifier":
+            if isinstance(value, Name):
+                return value.name
+            if isinstance(value, str):
+                return value
+            raise TypeError(
+                f"${self.name} is an identifier, got {type(value).__name__}"
+            )
+
+        if self.kind == "statement":
+            if isinstance(value, (list, tuple)):
+                for item in value:  # type: ignore
+                    if not isinstance(item, Statement):
+                        raise TypeError(
+                            f"${self.name} takes statements, got {type(item).__name__}"
+                        )
+                return list(value)  # type: ignore
+            if isinstance(value, Statement):
+                return value
+
+        if isinstance(value, Expression):
+            return value
+        return to_expression(value)
+
+
+# trie of hole sites: keys are attribute names of nodes or indices in sequences, leaves are holes
+Sites = Dict[Union[str, int], Union["Sites", Hole]]
+
+
+class Template:
+    """
+
+    A gekkota tree parsed from code with `$name` holes (check `template`).
+
+    `fill` copies only the nodes on the way to holes, the rest of the tree is shared between all filled copies,
+    so they (like interned nodes) should not be mutated.
+
+    """
+
+    __slots__ = ("text", "root", "holes", "sites")
+
+    def __init__(self, text: str):
+        self.text = text
+
+        source = HOLE.sub(PREFIX + r"\1", textwrap.dedent(text).strip("\n"))
+        lifter = Lifter()
+        root: Renderable
+
+        try:
+            tree: Any = ast.parse(source, mode="eval")
+            root = lifter.expression(tree.body)
+            # a template of a single hole is a statement too, it takes both statements and expressions
+            top_kind = "statement" if isinstance(tree.body, ast.Name) else "expression"
+        except SyntaxError:
+            statements = lifter.statements(ast.parse(source).body)
+            root = statements[0] if len(statements) == 1 else Code(statements)
+            top_kind = "statement"
+
+        self.root = root
+        # kinds of sites of every hole, e.g. `self.$name = $name` has an identifier and an expression
+        self.holes: Dict[str, Set[str]] = {}
+        self.sites: Union[Sites, Hole] = self.find_holes(top_kind, lifter.identifiers)
+
+    def hole(self, name: str, kind: str) -> Hole:
+        self.holes.setdefault(name, set()).add(kind)
+        return Hole(name, kind)
+
+    def find_holes(self, top_kind: str, identifiers: Set[int]) -> Union[Sites, Hole]:
+        root_hole = self.node_hole(self.root, top_kind, identifiers)
+        if root_hole is not None:
+            return root_hole
+
+        root_sites: Sites = {}
+        # (value, its trie, kind of a hole in it)
+        stack: List[Tuple[Any, Sites, str]] = [(self.root, root_sites, top_kind)]
+
+        while stack:
+            value, sites, kind = stack.pop()
+
+            if isinstance(value, Renderable):
+                names = fields_of(type(value))[1]
+                items = [(name, getattr(value, name, None)) for name in names]
+                child_kind = "expression"
+            else:
+                items = list(enumerate(value))
+                child_kind = kind
+
+            if isinstance(value, Code):
+                # `Code` and `Block` keep statements in a list
+                child_kind = "statement"
+
+            for key, item in items:
+                if isinstance(item, str):
+                    match = PLACEHOLDER.fullmatch(item)
+                    if match:
+                        sites[key] = self.hole(match.group(1), "identifier")
+                    elif PREFIX in item:
+                        raise ValueError(
+                            f"holes can't be a part of a name: {restore_holes(item)}"
+                        )
+                    continue
+
+                hole = self.node_hole(item, child_kind, identifiers)
+                if hole is not None:
+                    sites[key] = hole
+                elif isinstance(item, (Renderable, list, tuple)):
+                    nested: Sites = {}
+                    stack.append((item, nested, child_kind))
+                    sites[key] = nested
+
+        prune(root_sites)
+        return root_sites
+
+    def node_hole(self, value: Any, kind: str, identifiers: Set[int]) -> Optional[Hole]:
+        if type(value) is not Name or id(value) in identifiers:
+            return None
+        if value.annotation is not None:
+            return None
+
+        match = PLACEHOLDER.fullmatch(value.name)
+        if match is None:
+            return None
+        return self.hole(match.group(1), kind)
+
+    def fill(self, **values: Any) -> Any:
+        """Substitutes `values` into holes: identifiers take strings, expressions take nodes or values for `to_expression`, statements also take lists of statements"""
+        missing = self.holes.keys() - values.keys()
+        if missing:
+            raise TypeError(f"no values for {', '.join(sorted(missing))}")
+
+        unexpected = values.keys() - self.holes.keys()
+        if unexpected:
+            raise TypeError(f"no holes for {', '.join(sorted(unexpected))}")
+
+        if isinstance(self.sites, Hole):
+            filled = self.sites.convert(values[self.sites.name])
+            return Code(filled) if isinstance(filled, list) else filled
+
+        return rebuild(self.root, self.sites, values)
+
+
+def prune(sites: Sites) -> bool:
+    """Removes branches without holes, returns True if there are holes left"""
+    for key in list(sites):
+        site = sites[key]
+        if isinstance(site, dict) and not prune(site):
+            del sites[key]
+    return bool(sites)
+
+
+def rebuild(value: Any, sites: Sites, values: Dict[str, Any]) -> Any:
+    if isinstance(value, Renderable):
+        node = copy.copy(value)
+        for key, site in sites.items():
+            child = getattr(value, key)  # type: ignore
+            if isinstance(site, Hole):
+                setattr(node, key, site.convert(values[site.name]))  # type: ignore
+            else:
+                setattr(node, key, rebuild(child, site, values))  # type: ignore
+        return node
+
+    items = list(value)
+    # from the end, so statements spliced into the list don't shift the next indices
+    for key in sorted(sites, reverse=True):  # type: ignore
+        site = sites[key]
+        if isinstance(site, Hole):
+            filled = site.convert(values[site.name])
+            if isinstance(filled, list):
+                items[key : key + 1] = filled  # type: ignore
+            else:
+                items[key] = filled  # type: ignore
+        else:
+            items[key] = rebuild(items[key], site, values)  # type: ignore
+
+    return tuple(items) if isinstance(value, tuple) else items
+
+
+templates: Dict[str, Template] = {}
+
+
+def template(text: str) -> Template:
+    """
+
+    Parses code with `$name` holes into a `Template`, e.g. `template("def $name(self):\\n    return self.$attr")`.
+    Text is parsed with `ast` once, templates are cached by their text.
+
+    Holes in identifiers (names of functions, attributes, arguments, etc.) take strings,
+    holes in expressions and statements take nodes. Holes are not substituted inside string literals.
+
+    """
+    found = templates.get(text)
+    if found is None:
+        found = templates[text] = Template(text)
+    return found
@@ -1,7 +1,20 @@
-from typing import Union, overload
+from __future__ import annotations
 
-from .values import Literal, LiteralValue
-from .sequences import DictExpr, KeyValue, ListExpr, SequenceExpr, SetExpr, TupleExpr
+import gc
+import typing
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, overload
+
+from .values import Literal, LiteralValue, Name
+from .sequences import (
+    DictExpr,
+    KeyValue,
+    ListExpr,
+    LiteralSequence,
+    SequenceExpr,
+    SetExpr,
+    TupleExpr,
+)
 from .expression import Expression
 
 
@@ -12,48 +25,237 @@ SequenceLiteral = Union[
     "tuple[ValueOrExpression, ...]",
 ]
 
-ValueOrExpression = Union[LiteralValue, Expression, SequenceLiteral]
+ValueOrExpression = Union[
+    LiteralValue, Expression, SequenceLiteral, range, "array[Any]", memoryview
+]
+
+# a converter returns an Expression, or a value that is converted again (e.g. a tuple of attributes)
+Converter = Callable[[Any], Any]
+
+
+def keep(value: Expression) -> Expression:
+    return value
+
+
+def make_dict(items: List[Expression]) -> DictExpr:
+    return DictExpr([KeyValue(items[i], items[i + 1]) for i in range(0, len(items), 2)])
+
+
+def split_dict(value: Dict[Any, Any]) -> List[Any]:
+    return [item for pair in value.items() for item in pair]
+
+
+# with `pack_runs`, lists and tuples of at least this many numbers and strings become a single `LiteralSequence`
+min_run = 16
+run_types = {int, float, str}
+
+
+def pack_list(value: Sequence[Any]) -> Optional[Expression]:
+    if len(value) >= min_run and set(map(type, value)) <= run_types:
+        return LiteralSequence(list(value))
+    return None
+
+
+def pack_tuple(value: Sequence[Any]) -> Optional[Expression]:
+    if len(value) >= min_run and set(map(type, value)) <= run_types:
+        return LiteralSequence(list(value), TupleExpr)
+    return None
+
+
+def convert_range(value: range) -> Expression:
+    args = [value.start, value.stop, value.step]
+    if value.step == 1:
+        args.pop()
+        if value.start == 0:
+            args.pop(0)
+    return Name("range")(*map(Literal, args))
+
+
+def convert_array(value: array[Any]) -> Expression:
+    # a list of values, since `array(...)` would need an import in the generated code
+    return LiteralSequence(value.tolist())
+
+
+def convert_memoryview(value: memoryview) -> Expression:
+    if value.ndim != 1:
+        raise ValueError(
+            f"only 1-dimensional memoryviews can be converted, got {value.ndim} dimensions (convert `view.tolist()` instead)"
+        )
+    if value.format in ("B", "c"):
+        return Literal(value.tobytes())
+    # e.g. a cast to ints: a single node with all values, same as arrays
+    return LiteralSequence(value.tolist())
+
+
+# containers: items of the value (as a new list), a function that makes an expression of converted items,
+# and (optionally) a function that makes a single node for the whole value if possible
+Container = Tuple[
+    Callable[[Any], List[Any]],
+    Callable[[List[Expression]], Expression],
+    Optional[Callable[[Any], Optional[Expression]]],
+]
+
+containers: Dict[type, Container] = {
+    list: (list, ListExpr, pack_list),
+    tuple: (list, TupleExpr, pack_tuple),
+    set: (list, SetExpr, None),
+    dict: (split_dict, make_dict, None),
+}
+
+registered: Dict[type, Converter] = {
+    **{cls: Literal for cls in (int, float, complex, str, bytes, bool, type(None))},
+    Expression: keep,
+    range: convert_range,
+    array: convert_array,
+    memoryview: convert_memoryview,
+}
+
+# exact type -> converter or container, filled lazily from `registered` and `containers` along the MRO
+dispatch: Dict[type, Union[Converter, Container]] = {}
+
+
+def register_converter(cls: type, converter: Converter) -> None:
+    """
+
+    Registers a converter for `cls` (and its subclasses) in `to_expression`.
+
+    A converter returns an Expression, or another value to convert (e.g. `lambda point: (point.x, point.y)`).
+
+    """
+    registered[cls] = converter
+    dispatch.clear()
+
+
+def resolve(cls: type) -> Union[Converter, Container]:
+    for base in cls.__mro__:
+        if base in registered:
+            found = registered[base]
+            break
+        if base in containers:
+            found = containers[base]
+            break
+    else:
+        found = Literal
+
+    dispatch[cls] = found
+    return found
 
 
 @overload
-def to_expression(convertable: LiteralValue) -> Literal:
+def to_expression(
+    convertable: LiteralValue, *, pause_gc: bool = False, pack_runs: bool = False
+) -> Literal:
     ...
 
 
 @overload
-def to_expression(convertable: SequenceLiteral) -> SequenceExpr:
+def to_expression(
+    convertable: SequenceLiteral,
+    *,
+    pause_gc: bool = False,
+    pack_runs: typing.Literal[False] = False,
+) -> SequenceExpr:
     ...
 
 
 @overload
-def to_expression(convertable: ValueOrExpression) -> Expression:
+def to_expression(
+    convertable: ValueOrExpression | object,
+    *,
+    pause_gc: bool = False,
+    pack_runs: bool = False,
+) -> Expression:
     ...
 
 
 def to_expression(
-    convertable: ValueOrExpression,
+    convertable: Any, *, pause_gc: bool = False, pack_runs: bool = False
 ) -> Expression:
-    """Converts a value into an Expression instance. If Expression instance passed, returns it unchanged"""
-    if isinstance(convertable, Expression):
-        return convertable
+    """
 
-    if isinstance(convertable, (list, set, tuple)):
-        seq_converted = list(map(to_expression, convertable))
+    Converts a value into an Expression instance. If Expression instance passed, returns it unchanged.
 
-        if isinstance(convertable, list):
-            return ListExpr(seq_converted)
+    Values are converted by exact type (check `register_converter`), nested containers are converted without recursion.
+    With `pack_runs=True`, long lists and tuples of numbers and strings become a single `LiteralSequence` instead of `ListExpr` and `TupleExpr`.
+    It's off by default, since a `LiteralSequence` has no nodes for its items: code that checks for `ListExpr`
+    or reads `values` of the result as nodes (e.g. to change an item) would break. Arrays and memoryviews have no such users, so they are always packed.
 
-        if isinstance(convertable, tuple):
-            return TupleExpr(seq_converted)
+    Created nodes are not cyclic, but the cyclic GC still traverses them again and again while a large value is converted.
+    `pause_gc=True` disables the GC during the conversion, which makes converting large values faster.
+    It affects the whole process, so don't use it while other threads make a lot of cyclic garbage.
 
-        return SetExpr(seq_converted)
+    """
+    if not pause_gc or not gc.isenabled():
+        return convert(convertable, pack_runs)
 
-    if isinstance(convertable, dict):
-        return DictExpr(
-            [
-                KeyValue(to_expression(key), to_expression(value))
-                for key, value in convertable.items()
-            ]
-        )
+    gc.disable()
+    try:
+        return convert(convertable, pack_runs)
+    finally:
+        gc.enable()
+
+
+def convert(convertable: Any, pack_runs: bool) -> Expression:
+    result: List[Any] = [convertable]
+
+    # a task is (None, value, target, index) to convert value into target[index],
+    # or (make, items, target, index) to make an expression from converted items
+    tasks: List[Any] = [(None, convertable, result, 0)]
+    pop = tasks.pop
+    push = tasks.append
+    get = dispatch.get
+
+    while tasks:
+        make, value, target, index = pop()
+
+        if make is not None:
+            target[index] = make(value)
+            continue
+
+        cls = type(value)
+        handler = get(cls) or resolve(cls)
+
+        if handler.__class__ is not tuple:
+            converted = handler(value)  # type: ignore
+            if isinstance(converted, Expression):
+                target[index] = converted
+            else:
+                push((None, converted, target, index))
+            continue
+
+        split, make, pack = handler  # type: ignore
+
+        if pack is not None and pack_runs:
+            packed = pack(value)
+            if packed is not None:
+                target[index] = packed
+                continue
+
+        items = split(value)
+        deferred: List[Any] = []
+
+        for i, item in enumerate(items):
+            item_cls = type(item)
+            handler = get(item_cls) or resolve(item_cls)
+
+            # leaves are converted in place, containers are deferred
+            if handler is Literal:
+                items[i] = Literal(item)
+                continue
+
+            if handler.__class__ is not tuple:
+                converted = handler(item)  # type: ignore
+                if isinstance(converted, Expression):
+                    items[i] = converted
+                    continue
+                item = converted
+
+            deferred.append((None, item, items, i))
+
+        if deferred:
+            push((make, items, target, index))
+            tasks.extend(deferred)
+        else:
+            target[index] = make(items)
 
-    return Literal(convertable)
+    return result[0]
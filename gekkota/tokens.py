@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from keyword import iskeyword
+from typing import Any, Dict, Iterable, Iterator, Type, Union
+
+from .constants import Config, StrGen
+
+
+class Token(str):
+    """
+
+    A string token that knows its kind. Typed tokens are still strings, so they can be used as usual tokens,
+    but post-processing can check `token.__class__` instead of looking at characters.
+
+    """
+
+    __slots__ = ()
+
+    kind = "text"
+    # if True, the token always starts and ends with a word character (otherwise characters are checked in compact mode)
+    word = False
+
+
+class Keyword(Token):
+    __slots__ = ()
+
+    kind = "keyword"
+    word = True
+
+
+class Identifier(Token):
+    __slots__ = ()
+
+    kind = "identifier"
+    word = True
+
+
+class Number(Token):
+    __slots__ = ()
+
+    kind = "number"
+
+
+class String(Token):
+    __slots__ = ()
+
+    kind = "string"
+
+
+class Punctuation(Token):
+    __slots__ = ()
+
+    kind = "punctuation"
+
+
+class Whitespace(Token):
+    __slots__ = ()
+
+    kind = "whitespace"
+
+
+class Newline(Token):
+    __slots__ = ()
+
+    kind = "newline"
+
+
+class Indent(Token):
+    __slots__ = ()
+
+    kind = "indent"
+
+
+class NodeMarker:
+    """Marks start (or end) of a rendered node in a typed token stream. Not a string, has to be dropped before joining"""
+
+    __slots__ = ("node", "end")
+
+    kind = "node"
+
+    def __init__(self, node: Any, end: bool = False):
+        self.node = node
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"NodeMarker({type(self.node).__name__}, end={self.end})"
+
+
+TypedToken = Union[str, NodeMarker]  # strings in typed streams are `Token` instances
+TypedGen = Iterable[TypedToken]
+
+soft_keywords = {"match", "case", "type"}
+string_prefixes = set("rRbBuUfF")
+
+# constants are classified many times, so results are kept. Identifiers and literals are not, to keep the table small
+classified: Dict[str, Token] = {}
+
+
+def token_class(text: str) -> Type[Token]:
+    if text == "\n":
+        return Newline
+    if text.isspace():
+        return Whitespace
+
+    # a keyword with spaces around it (e.g. `not ` of a unary expression) is not a word in compact mode, its edges are checked by characters
+    if text[:1].isspace() or text[-1:].isspace():
+        return Token
+
+    words = text.split()
+    if all(iskeyword(word) or word in soft_keywords for word in words):
+        return Keyword
+    if text.isidentifier():
+        return Identifier
+
+    first = text.lstrip("-")[:1]
+    if first.isdigit() or first == "." and text.lstrip("-")[1:2].isdigit():
+        return Number
+    if (
+        first in "'\""
+        or first in string_prefixes
+        and text.lstrip("rRbBuUfF")[:1] in ("'", '"')
+    ):
+        return String
+
+    # other text with word characters at the edges (e.g. a dotted name `a.b`) is checked by characters in compact mode
+    for edge in (text[:1], text[-1:]):
+        if edge == "_" or edge.isalnum():
+            return Token
+    return Punctuation
+
+
+def classify(text: str) -> Token:
+    """Returns `text` as a typed token, tokens that are already typed are returned as is"""
+    if isinstance(text, Token):
+        return text
+
+    token = classified.get(text)
+    if token is not None:
+        return token
+
+    cls = token_class(text)
+    token = cls(text)
+
+    if cls is not Identifier and cls is not Number and cls is not String:
+        classified[text] = token
+
+    return token
+
+
+def classify_tokens(tokens: Iterable[Any]) -> Iterator[TypedToken]:
+    """Types plain string tokens (e.g. from a custom `render()`), markers and typed tokens are passed as is"""
+    for token in tokens:
+        if token.__class__ is str:
+            yield classify(token)
+        else:
+            yield token
+
+
+def fuse(tokens: TypedGen, config: Config) -> StrGen:
+    """
+
+    Post-processes a typed token stream in one pass: drops node markers and,
+    if `config["compact"]` is set, removes redundant whitespace (same as `Utils.make_compact`, but using token kinds).
+    Plain string tokens are checked by their characters, so it also compacts usual token streams.
+
+    Unlike `Utils.make_compact`, words that end with a digit (e.g. `x1` or `0x1f`) are still separated from the next word.
+
+    """
+    compact = config.get("compact", False)
+
+    if not compact:
+        for token in tokens:
+            if token.__class__ is not NodeMarker:
+                yield token  # type: ignore
+        return
+
+    line_start = False
+    last_word = False
+
+    for token in tokens:
+        cls = token.__class__
+
+        if cls is NodeMarker:
+            continue
+
+        if cls is str:
+            # plain tokens are checked by characters, which gives the same result as classifying them first
+            if token == "\n":
+                cls = Newline
+            elif token.isspace():  # type: ignore
+                cls = Whitespace
+            else:
+                cls = Token
+
+        if cls is Whitespace:
+            if line_start:
+                yield token  # type: ignore
+            continue
+
+        if cls is Newline:
+            line_start = True
+            last_word = False
+            yield token  # type: ignore
+            continue
+
+        if cls is Indent:
+            yield token  # type: ignore
+            continue
+
+        line_start = False
+
+        if token.startswith("0.") and (cls is Number or cls is Token):  # type: ignore
+            token = token.__class__(token[1:])  # type: ignore
+
+        if cls.word:  # type: ignore
+            starts = ends = True
+        elif cls is Punctuation:
+            starts = ends = False
+        else:
+            starts = token[:1] == "_" or token[:1].isalnum()  # type: ignore
+            ends = token[-1:] == "_" or token[-1:].isalnum()  # type: ignore
+
+        if starts and last_word:
+            yield " "
+
+        last_word = ends
+        yield token  # type: ignore
@@ -49,7 +49,8 @@ class Utils:
         for token in generator:
             if token == "\n":
                 is_tab = True
-            elif token != " ":
+            # indentation can be a token per level or a single prefix
+            elif not token.isspace():
                 is_tab = False
 
             if token == " " and not is_tab:
@@ -1,14 +1,31 @@
 from __future__ import annotations
+
+import ast
 from collections.abc import Iterable
 
-from typing import Generic, Optional, Sequence, Union
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Union
 from typing_extensions import TypeVar
 
 from gekkota.core import Renderable
 
 from .args import CallArg, FuncArg
 from .constants import Config, StrGen, op_priorities
-from .expression import Expression
+from .expression import Expression, index_expression, render_operand
+from .lowering import literal, lower_call_args, optional, subscript
+from .plans import (
+    Child,
+    Items,
+    Join,
+    JoinText,
+    Operand,
+    PlanItem,
+    Repr,
+    Text,
+    When,
+    WhenSet,
+    needs_parens,
+    separated_items,
+)
 from .utils import Utils
 
 
@@ -16,6 +33,10 @@ AnnT = TypeVar("AnnT", Expression, None)
 
 
 class Name(Expression, FuncArg, Generic[AnnT]):
+    __slots__ = ()
+
+    render_plan = (Text("name"), WhenSet("annotation", ":", " ", Child("annotation")))
+
     def __init__(self, name: str, annotation: AnnT = None):
         self.name = name
         self.annotation = annotation
@@ -28,6 +49,9 @@ class Name(Expression, FuncArg, Generic[AnnT]):
             yield " "
             yield from self.annotation.render(config)
 
+    def lower(self) -> ast.expr:
+        return ast.Name(id=self.name, ctx=ast.Load())
+
 
 Identifier = Name[None]
 TypedName = Name[Expression]
@@ -36,18 +60,32 @@ LiteralValue = Union[int, float, complex, str, bytes, bool, None]
 
 
 class Literal(Expression):
-    priority = 15
+    __slots__ = ("value",)
+
+    render_plan = (Repr("value"),)
 
     def __init__(self, value: LiteralValue):
         self.value = value
-        if isinstance(value, (str, bytes)):
-            self.priority = 100
+
+    @property
+    def priority(self) -> int:  # type: ignore
+        # subclasses (e.g. WSString) may not set `value` at all
+        if isinstance(getattr(self, "value", None), (str, bytes)):
+            return 100
+        return 15
 
     def render(self, config: Config) -> StrGen:
         yield repr(self.value)
 
+    def lower(self) -> ast.expr:
+        return literal(self.value)
+
 
 class FormatSpec(Expression):
+    __slots__ = ("expression", "spec")
+
+    render_plan = (Child("expression"),)
+
     def __init__(self, expression: Expression, spec: str | Sequence[FStringPart]):
         self.expression = expression
         self.spec = spec
@@ -55,13 +93,43 @@ class FormatSpec(Expression):
     def render(self, config: Config) -> StrGen:
         return self.expression.render(config)
 
+    def lower(self) -> ast.expr:
+        return self.expression.lower()
+
 
 class FString(Expression):
+    """
+
+    A formatted string of `parts`: strings, expressions and `FormatSpec`s (an expression with a format spec).
+
+    Renders as a `str.format()` call, or as an f-string literal if `"fstrings"` is set in config.
+    Parts are rendered only when the node is.
+
+    """
+
+    __slots__ = ("parts",)
+
     def __init__(self, parts: Sequence[FStringPart] = ()):
-        self.expression = make_fstring(parts)
+        self.parts = parts
+
+    @property
+    def expression(self) -> Literal | CallExpr[GetAttr[Literal]]:
+        """The same string as a `str.format()` call (or a string literal if there are no expressions)"""
+        return make_fstring(self.parts)
 
     def render(self, config: Config) -> StrGen:
-        return self.expression.render(config)
+        if config.get("fstrings", False):
+            text = render_fstring(self.parts, config)
+            if text is not None:
+                yield text
+                return
+
+        yield from self.expression.render(config)
+
+    def lower(self) -> ast.expr:
+        if not any(isinstance(part, Expression) for part in self.parts):
+            return self.expression.lower()
+        return ast.JoinedStr(values=lower_fstring_parts(self.parts))
 
 
 FStringPart = Union[str, Expression, FormatSpec]
@@ -95,7 +163,8 @@ def make_fstring(
 
     def render_part(part: FStringPart) -> StrGen:
         if isinstance(part, str):
-            yield repr(part)[1:-1].replace("{", "{{").replace("}", "}}")
+            # the whole template is quoted by Literal
+            yield part.replace("{", "{{").replace("}", "}}")
             return
 
         yield "{"
@@ -119,24 +188,173 @@ def make_fstring(
     return Literal("".join(render_parts())).getattr("format")(*expression_parts)
 
 
+# a replacement field of an f-string: the rendered expression and its format spec
+Field = Tuple[str, Optional[List["FStringSegment"]]]
+FStringSegment = Union[str, Field]
+
+
+def fstring_field(expression: Expression, config: Config, texts: List[str]) -> str:
+    text = expression.render_str(config)
+
+    # `lambda` and `:=` would be read as a format spec
+    if text.startswith("lambda") or expression.priority < op_priorities["ternary"]:
+        text = f"({text})"
+    # `{{` is an escaped brace
+    if text.startswith("{"):
+        text = " " + text
+
+    texts.append(text)
+    return text
+
+
+def fstring_segments(
+    parts: Sequence[FStringPart], config: Config, texts: List[str]
+) -> List[FStringSegment]:
+    segments: List[FStringSegment] = []
+
+    for part in parts:
+        if isinstance(part, str):
+            segments.append(part)
+        elif isinstance(part, FormatSpec):
+            spec = [part.spec] if isinstance(part.spec, str) else part.spec
+            segments.append(
+                (
+                    fstring_field(part.expression, config, texts),
+                    fstring_segments(spec, config, texts),
+                )
+            )
+        else:
+            segments.append((fstring_field(part, config, texts), None))
+
+    return segments
+
+
+def fstring_text(text: str, quote: str) -> str:
+    """Escapes `text` for an f-string in `quote` quotes"""
+    quoted = repr(text)
+    body = quoted[1:-1]
+
+    # repr escapes only the quote it uses
+    if quoted[0] != quote:
+        body = body.replace("\\" + quoted[0], quoted[0]).replace(quote, "\\" + quote)
+
+    return body.replace("{", "{{").replace("}", "}}")
+
+
+def render_fstring(parts: Sequence[FStringPart], config: Config) -> Optional[str]:
+    """
+
+    Renders an f-string literal, or returns None if it can't be written as one for all Python versions
+    (before 3.12 expressions in f-strings can't have backslashes, comments or the quotes of the f-string).
+
+    """
+    # the f-string is a single token, so its fields are rendered as plain text (also when rendering typed tokens)
+    if config.get("typed_tokens", False):
+        config = {**config, "typed_tokens": False}
+
+    texts: List[str] = []
+    segments = fstring_segments(parts, config, texts)
+
+    if not texts or any("\\" in text or "#" in text for text in texts):
+        return None
+
+    for quote in ("'", '"', "'''", '"""'):
+        if all(quote not in text for text in texts) and (
+            len(quote) == 3 or all("\n" not in text for text in texts)
+        ):
+            break
+    else:
+        return None
+
+    out: List[str] = ["f", quote]
+
+    def write(segments: List[FStringSegment]) -> None:
+        for segment in segments:
+            if isinstance(segment, str):
+                out.append(fstring_text(segment, quote[0]))
+                continue
+
+            text, spec = segment
+            out.append("{")
+            out.append(text)
+            if spec is not None:
+                out.append(":")
+                write(spec)
+            out.append("}")
+
+    write(segments)
+    out.append(quote)
+    return "".join(out)
+
+
+def lower_fstring_parts(parts: Sequence[FStringPart]) -> List[ast.expr]:
+    values: List[ast.expr] = []
+    # adjacent strings are a single constant in parsed code
+    text = ""
+
+    for part in parts:
+        if isinstance(part, str):
+            text += part
+            continue
+
+        if text:
+            values.append(literal(text))
+            text = ""
+
+        if isinstance(part, FormatSpec):
+            spec = [part.spec] if isinstance(part.spec, str) else part.spec
+            values.append(
+                ast.FormattedValue(
+                    value=part.expression.lower(),
+                    conversion=-1,
+                    format_spec=ast.JoinedStr(values=lower_fstring_parts(spec)),
+                )
+            )
+        else:
+            values.append(
+                ast.FormattedValue(value=part.lower(), conversion=-1, format_spec=None)
+            )
+
+    if text:
+        values.append(literal(text))
+
+    return values
+
+
 T = TypeVar("T", default=Expression, bound=Expression)
 
 
 class Indexing(Expression, Generic[T]):
+    __slots__ = ("expression", "index_")
+
+    render_plan = (Operand("expression", "left"), "[", Child("index_"), "]")
+
     priority = op_priorities["getitem"]
 
     def __init__(self, expression: T, index: Expression | SliceExpr):
-        self.expression = expression.respect_priority(self, side="left")
+        self.expression = expression
         self.index_ = index
 
     def render(self, config: Config) -> StrGen:
-        yield from self.expression.render(config)
+        yield from render_operand(self.expression, self, config, side="left")
         yield "["
         yield from self.index_.render(config)
         yield "]"
 
+    def lower(self) -> ast.expr:
+        return subscript(self.expression.lower(), self.index_.lower())
+
 
 class SliceExpr(Renderable):
+    __slots__ = ("start", "stop", "step")
+
+    render_plan = (
+        When("start", Child("start")),
+        ":",
+        When("stop", Child("stop")),
+        When("step", ":", Child("step")),
+    )
+
     def __init__(
         self,
         start: Optional[Expression] = None,
@@ -160,32 +378,161 @@ class SliceExpr(Renderable):
             yield ":"
             yield from self.step.render(config)
 
+    def lower(self) -> ast.Slice:
+        return ast.Slice(
+            lower=optional(self.start),
+            upper=optional(self.stop),
+            step=optional(self.step),
+        )
+
 
 class CallExpr(Expression, Generic[T]):
+    __slots__ = ("callee", "args")
+
+    render_plan = (Operand("callee", "left"), "(", Join("args"), ")")
+
     priority = op_priorities["call"]
 
     def __init__(self, callee: T, args: Sequence[CallArg | Expression]):
-        self.callee = callee.respect_priority(self, side="left")
+        self.callee = callee
         self.args = args
 
     def render(self, config: Config) -> StrGen:
-        yield from self.callee.render(config)
+        yield from render_operand(self.callee, self, config, side="left")
         yield "("
         yield from Utils.comma_separated(self.args, config)
         yield ")"
 
+    def lower(self) -> ast.expr:
+        args, keywords = lower_call_args(self.args)
+        return ast.Call(func=self.callee.lower(), args=args, keywords=keywords)
+
 
 class GetAttr(Expression, Generic[T]):
+    __slots__ = ("value", "attributes")
+
+    render_plan = (Operand("value", "left"), ".", JoinText("attributes", "."))
+
     priority = op_priorities["."]
 
     def __init__(self, value: T, *attributes: str):
-        self.value = value.respect_priority(self, side="left")
+        self.value = value
         self.attributes = attributes
 
     def render(self, config: Config) -> StrGen:
-        yield from self.value.render(config)
+        yield from render_operand(self.value, self, config, side="left")
         yield "."
         yield from Utils.separated_str(".", self.attributes, config)
 
+    def lower(self) -> ast.expr:
+        node = self.value.lower()
+        for attribute in self.attributes:
+            node = ast.Attribute(value=node, attr=attribute, ctx=ast.Load())
+        return node
+
     def getattr(self, other: str) -> GetAttr[T]:
         return GetAttr(self.value, *self.attributes, other)
+
+
+# a trailer of `TrailerChain`: (".", attribute), ("(", call arguments) or ("[", index)
+Trailer = Tuple[str, Any]
+
+
+class TrailerChain(Expression):
+    """
+
+    `value` followed by attribute references, calls and subscripts (e.g. `a.b(c)[d].e`), stored flat in `trailers`.
+    Renders the same as nested `GetAttr`, `CallExpr` and `Indexing`, but a long chain is a single node (check `ChainBuilder`).
+
+    """
+
+    __slots__ = ("value", "trailers")
+
+    render_plan = (Items(),)
+
+    priority = op_priorities["call"]
+
+    def __init__(self, value: Expression, trailers: Sequence[Trailer]):
+        self.value = value
+        self.trailers = trailers
+
+    def plan_items(self) -> Iterable[PlanItem]:
+        if needs_parens(self.value, self, "left"):
+            yield from ("(", self.value, ")")
+        else:
+            yield self.value
+
+        for kind, trailer in self.trailers:
+            if kind == ".":
+                yield "."
+                yield trailer
+            elif kind == "(":
+                yield "("
+                yield from separated_items(trailer)
+                yield ")"
+            else:
+                yield "["
+                yield trailer
+                yield "]"
+
+    def render(self, config: Config) -> StrGen:
+        yield from render_operand(self.value, self, config, side="left")
+
+        for kind, trailer in self.trailers:
+            if kind == ".":
+                yield "."
+                yield trailer
+            elif kind == "(":
+                yield "("
+                yield from Utils.comma_separated(trailer, config)
+                yield ")"
+            else:
+                yield "["
+                yield from trailer.render(config)
+                yield "]"
+
+    def lower(self) -> ast.expr:
+        node = self.value.lower()
+
+        for kind, trailer in self.trailers:
+            if kind == ".":
+                node = ast.Attribute(value=node, attr=trailer, ctx=ast.Load())
+            elif kind == "(":
+                args, keywords = lower_call_args(trailer)
+                node = ast.Call(func=node, args=args, keywords=keywords)
+            else:
+                node = subscript(node, trailer.lower())
+
+        return node
+
+
+class ChainBuilder:
+    """
+
+    Builds a `TrailerChain` step by step: `ChainBuilder(a).getattr("b").call(c).index(d).build()` is `a.b(c)[d]`.
+    Every step takes amortised constant time (`GetAttr.getattr` copies the attributes), and the builder can be reused after `build()`.
+
+    """
+
+    __slots__ = ("value", "trailers")
+
+    def __init__(self, value: Expression):
+        self.value = value
+        self.trailers: List[Trailer] = []
+
+    def getattr(self, *attributes: str) -> ChainBuilder:
+        self.trailers.extend((".", attribute) for attribute in attributes)
+        return self
+
+    def call(self, *args: CallArg | Expression, **kwargs: Expression) -> ChainBuilder:
+        self.trailers.append(("(", [*args, *(CallArg(k, kwargs[k]) for k in kwargs)]))
+        return self
+
+    def index(
+        self, index: Expression | SliceExpr | Sequence[SliceExpr]
+    ) -> ChainBuilder:
+        self.trailers.append(("[", index_expression(index)))
+        return self
+
+    def build(self) -> TrailerChain:
+        return TrailerChain(self.value, list(self.trailers))
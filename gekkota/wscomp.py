@@ -1,9 +1,14 @@
+import ast
+
 from wordstreamer import Context, Renderable as WSBaseRenderable, Renderer, TokenStream
+from wordstreamer.core import Marker
 from wordstreamer.utils import is_marker
 
 from .values import Literal
 from .constants import Config, StrGen
 from .core import Renderable
+from .lowering import parse_rendered
+from .tokens import NodeMarker, TypedGen
 
 
 class WSRenderable(WSBaseRenderable):
@@ -27,6 +32,16 @@ def adapt_tokenstream(ts: TokenStream) -> StrGen:
             yield token
 
 
+def typed_tokenstream(tokens: TypedGen) -> TokenStream:
+    """Converts a typed token stream (from `Renderable.render_typed`) into a wordstreamer token stream, node markers become wordstreamer markers"""
+    for token in tokens:
+        if isinstance(token, NodeMarker):
+            key = "node_end" if token.end else "node_start"
+            yield Marker(key, {"node": token.node, "kind": type(token.node).__name__})
+        else:
+            yield token
+
+
 class WStoG:
     """
 
@@ -58,6 +73,8 @@ class WStoG:
 class WSString(Literal):
     """Lets you render a wordstreamer.Renderable inside a Python string"""
 
+    __slots__ = ("renderable",)
+
     def __init__(self, renderable: WSBaseRenderable):
         self.renderable = renderable
 
@@ -68,3 +85,6 @@ class WSString(Literal):
         for token in stream:
             yield token.replace('"', '"')
         yield '"""'
+
+    def lower(self) -> ast.expr:
+        return parse_rendered(self)
@@ -0,0 +1,335 @@
+import ast
+import sys
+
+import pytest
+
+from gekkota import (
+    AnnotatedTarget,
+    AssertStmt,
+    Assignment,
+    AugmentedAssignment,
+    Block,
+    CallArg,
+    CapturePattern,
+    CaseStmt,
+    ClassDef,
+    ClassPattern,
+    Code,
+    Decorated,
+    DelStmt,
+    DictComprehension,
+    DictExpr,
+    DoubleStarArg,
+    DoubleStarPattern,
+    ElifStmt,
+    ElseStmt,
+    ExceptStmt,
+    Expression,
+    FinallyStmt,
+    ForStmt,
+    FormatSpec,
+    FromImportStmt,
+    FString,
+    FuncArg,
+    FuncDef,
+    GeneratorExpr,
+    GeneratorFor,
+    GeneratorIf,
+    GlobalStmt,
+    IfExpr,
+    IfStmt,
+    ImportAlias,
+    ImportDots,
+    ImportSource,
+    ImportStmt,
+    KeyValue,
+    KeyValuePattern,
+    KeywordPattern,
+    LambDef,
+    ListComprehension,
+    ListExpr,
+    Literal,
+    LiteralPattern,
+    MappingPattern,
+    MatchStmt,
+    Name,
+    NonLocalStmt,
+    PassStmt,
+    RaiseStmt,
+    ReturnStmt,
+    SequenceExpr,
+    SequencePattern,
+    SetComprehension,
+    SetExpr,
+    Slash,
+    SliceExpr,
+    StarArg,
+    StarPattern,
+    TryStmt,
+    TupleExpr,
+    TypeStmt,
+    TypeVarParam,
+    WhileStmt,
+    WildcardPattern,
+    WithStmt,
+    WithTarget,
+    YieldFromStmt,
+    YieldStmt,
+    to_expression,
+)
+from gekkota.assignment import AssignmentTarget, AugAssignmentTarget
+from gekkota.values import GetAttr, Indexing
+
+
+a = Name("a")
+b = Name("b")
+c = Name("c")
+x = CapturePattern("x")
+
+expressions = [
+    (a + b) * -c,
+    a - b - c,
+    a - (b - c),
+    a**b**c,
+    a.and_(b).and_(c).or_(a.not_()),
+    (a < b) < c,
+    a.is_not(b).eq(c),
+    a.getattr("b").getattr("c")[b : c : Literal(2)],
+    a[SequenceExpr([b, SliceExpr(None, c)])],
+    a(b, StarArg(c), CallArg("x", Literal("y")), DoubleStarArg(a)),
+    IfExpr(a, b, c),
+    LambDef([a, FuncArg("b", None, Literal(1)), StarArg(), Name("c")], a + b),
+    TupleExpr([a]),
+    TupleExpr([]),
+    ListExpr([a, StarArg(b)]),
+    SetExpr([]),
+    SetExpr([a, b]),
+    DictExpr([KeyValue(a, b), DoubleStarArg(c)]),
+    GeneratorExpr(
+        a,
+        [
+            GeneratorFor(SequenceExpr[AssignmentTarget]([a, b]), c),
+            GeneratorIf(a),
+            GeneratorIf(b),
+        ],
+    ),
+    ListComprehension(a, [GeneratorFor(a, b, is_async=True)]),
+    SetComprehension(a, [GeneratorFor(a, b), GeneratorFor(b, a)]),
+    DictComprehension(KeyValue(a, b), [GeneratorFor(a, b)]),
+    FString(["x", a, FormatSpec(b, ">10"), "y"]),
+    Literal(-1),
+    Literal(-0.5),
+    Literal(1j),
+    Literal(b"\x00"),
+    Literal(None),
+    to_expression({"a": [1, (2, 3)], "b": {True}}),
+    c(a.assign(b)),
+]
+
+function = FuncDef(
+    "f",
+    [
+        Name("i", Name("int")),
+        Slash(),
+        FuncArg("d", b, Literal(1.5)),
+        StarArg(Name("args")),
+        FuncArg("k", None, Literal(None)),
+        Name("m"),
+        DoubleStarArg(Name("kwargs", Name("str"))),
+    ],
+    Block(
+        [
+            GlobalStmt(a),
+            Assignment([a, SequenceExpr[AssignmentTarget]([b, StarArg(c)])], b),
+            Assignment(
+                AnnotatedTarget(GetAttr[AssignmentTarget](a, "x"), Name("int")), b
+            ),
+            AnnotatedTarget(a, Name("int")),
+            Name("z", Name("str")),
+            AugmentedAssignment(Indexing[AugAssignmentTarget](a, b), "+=", b),
+            DelStmt(a, b[c]),
+            AssertStmt(a, Literal("message")),
+            YieldStmt(a, b),
+            YieldFromStmt(c),
+            ReturnStmt(a + b * c),
+        ]
+    ),
+    rtype=Name("int"),
+)
+
+statements = [
+    function,
+    Decorated(
+        a,
+        Decorated(
+            b(c),
+            ClassDef("A", [b, CallArg("metaclass", c)], Block([PassStmt(), function])),
+        ),
+    ),
+    FuncDef(
+        "g",
+        [],
+        Block(
+            [
+                FuncDef("h", [], NonLocalStmt(a), is_async=True),
+                ForStmt(a, b.await_(), PassStmt(), is_async=True),
+                WithStmt([WithTarget(a, "b"), c], PassStmt(), is_async=True),
+            ]
+        ),
+        is_async=True,
+    ),
+    Code(
+        [
+            IfStmt(a, Block([b, c])),
+            ElifStmt(b, PassStmt()),
+            ElifStmt(c, PassStmt()),
+            ElseStmt(Block([a])),
+            IfStmt(a, b),
+            ElseStmt(Block([IfStmt(b, c)])),
+        ]
+    ),
+    Code([WhileStmt(a, Block([])), ElseStmt(b)]),
+    Code([ForStmt(TupleExpr([a, b]), c, a), ElseStmt(b)]),
+    WithStmt([WithTarget(a, "b"), c], DelStmt(a, b)),
+    Code(
+        [
+            TryStmt(Block([a, b])),
+            ExceptStmt([a, b], c, RaiseStmt(a, b)),
+            ExceptStmt([a], None, RaiseStmt()),
+            ExceptStmt(None, None, PassStmt()),
+            ElseStmt(PassStmt()),
+            FinallyStmt(PassStmt()),
+            TryStmt(PassStmt()),
+            FinallyStmt(PassStmt()),
+        ]
+    ),
+    Code(
+        [
+            ImportStmt([ImportAlias(a, b), c]),
+            FromImportStmt(ImportDots(2), [c]),
+            FromImportStmt(ImportSource(["a", "b"]), [StarArg()]),
+            FromImportStmt(a, [ImportAlias(b, c)]),
+        ]
+    ),
+]
+
+match = MatchStmt(
+    a,
+    [
+        CaseStmt(
+            ClassPattern(c, [x], [KeywordPattern("y", WildcardPattern())]),
+            Block([a, b]),
+            guard=b,
+        ),
+        CaseStmt(
+            SequencePattern([LiteralPattern(1), StarPattern(x)])
+            | MappingPattern(
+                [
+                    KeyValuePattern(LiteralPattern("k"), x.as_(CapturePattern("y"))),
+                    KeyValuePattern(x.getattr("k"), LiteralPattern(None)),
+                    DoubleStarPattern(CapturePattern("rest")),
+                ]
+            ),
+            PassStmt(),
+        ),
+        CaseStmt(SequencePattern([StarPattern(WildcardPattern())]), PassStmt()),
+    ],
+)
+
+# `match` statements can be parsed (and lowered) only since Python 3.10
+if sys.version_info >= (3, 10):
+    statements.append(match)
+
+
+def as_module(node):
+    tree = node.to_ast()
+    if isinstance(tree, ast.Module):
+        return tree
+    return ast.Module(body=[tree], type_ignores=[])
+
+
+class TestClass:
+    def test_expressions(self):
+        for expression in expressions:
+            code = expression.render_str({"fstrings": True})
+            expected = ast.parse(code, mode="eval").body
+            assert ast.dump(expression.to_ast()) == ast.dump(expected)
+
+    def test_statements(self):
+        for statement in statements:
+            expected = ast.parse(statement.render_str())
+            assert ast.dump(as_module(statement)) == ast.dump(expected)
+
+    def test_compile(self):
+        code = Code(
+            [
+                FuncDef(
+                    "f",
+                    [a, FuncArg("b", None, Literal(2))],
+                    Block([ReturnStmt(a * b)]),
+                ),
+                Assignment([Name("result")], Name("f")(Literal(3))),
+            ]
+        )
+        tree = code.to_ast()
+        assert isinstance(tree, ast.Module)
+
+        namespace = {}
+        exec(compile(tree, "<gekkota>", "exec"), namespace)
+
+        assert namespace["result"] == 6
+
+    def test_synthetic_lines(self):
+        tree = Code([function, IfStmt(a, Block([b, c])), ElseStmt(a)]).to_ast()
+        lines = [node.lineno for node in ast.walk(tree) if isinstance(node, ast.stmt)]
+
+        assert sorted(lines) == list(range(1, len(lines) + 1))
+
+        for node in ast.walk(tree):
+            start = getattr(node, "lineno", None)
+            end = getattr(node, "end_lineno", None)
+            for child in ast.iter_child_nodes(node):
+                line = getattr(child, "lineno", None)
+                if line is not None and start is not None:
+                    assert start <= line <= end
+
+    def test_type_stmt(self):
+        statement = TypeStmt(a, [TypeVarParam(b, c)], a)
+
+        if not hasattr(ast, "TypeAlias"):
+            with pytest.raises(ValueError):
+                statement.to_ast()
+            return
+
+        expected = ast.parse(statement.render_str())
+        assert ast.dump(as_module(statement)) == ast.dump(expected)
+
+    def test_fallback(self):
+        class Shout(Expression):
+            __slots__ = ()
+
+            def render(self, config):
+                yield "print"
+                yield "("
+                yield "'!'"
+                yield ")"
+
+        tree = (a + Shout()).to_ast()
+        assert ast.dump(tree) == ast.dump(ast.parse("a + print('!')", mode="eval").body)
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            LambDef([FuncArg("a", None, b, late_bound_default=True)], a).to_ast()
+
+        with pytest.raises(ValueError):
+            Code([ElseStmt(PassStmt())]).to_ast()
+
+        if sys.version_info < (3, 10):
+            with pytest.raises(ValueError):
+                match.to_ast()
+
+        with pytest.raises(ValueError):
+            Code([IfStmt(a, b), ExceptStmt(None, None, PassStmt())]).to_ast()
+
+        with pytest.raises(ValueError):
+            DictExpr([KeyValue(a, b), StarArg(c)]).to_ast()  # type: ignore
@@ -0,0 +1,43 @@
+import json
+
+from benchmarks.__main__ import main
+from benchmarks.cases import cases, configs
+
+
+class TestClass:
+    def test_smoke(self, tmp_path, capsys):
+        output = tmp_path / "results.json"
+        assert main(["-s", "0.01", "-r", "1", "-o", str(output)]) == 0
+
+        report = json.loads(output.read_text())
+        phases = {(result["case"], result["phase"]) for result in report["results"]}
+        for case in cases:
+            assert (case.name, "build") in phases
+            assert (case.name, "render") in phases
+
+        assert (
+            main(
+                [
+                    "-s",
+                    "0.01",
+                    "-r",
+                    "1",
+                    "-k",
+                    "match",
+                    "--compare",
+                    str(output),
+                    "--threshold",
+                    "1000",
+                ]
+            )
+            == 0
+        )
+        assert '"match_cases"' in capsys.readouterr().out
+
+    def test_configs(self):
+        for case in cases:
+            tree = case.build(3)
+            for name in case.configs:
+                assert tree.render_str(configs[name]) == tree.render_str(
+                    {**configs[name], "iterative": True}
+                )
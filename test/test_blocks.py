@@ -1,6 +1,7 @@
-from gekkota import Name
+from gekkota import Config, Name, Statement, StrGen
 from gekkota import (
     Block,
+    FuncDef,
     Code,
     IfStmt,
     ElifStmt,
@@ -91,3 +92,58 @@ class TestClass:
             Block([c, block, c]).render_str({"tab_size": 1, "inline_small_stmts": True})
             == "\n c; \n \n  a; b\n c"
         )
+
+    def test_inline_streaming(self):
+        rendered = []
+
+        class Probe(Statement):
+            def render(self, config):
+                rendered.append(self)
+                yield "probe"
+
+        code = Code([a, FuncDef("f", [], Block([b, c, Probe()]))])
+        expected = "a;\n\n\ndef f(): \n    b;\n    c;\n    probe"
+
+        for config in (
+            {"place_semicolons": True},
+            {"place_semicolons": True, "iterative": True},
+            {"inline_small_stmts": True},
+        ):
+            rendered.clear()
+            tokens = iter(code.render_tokens(config))
+
+            for token in tokens:
+                if token == "def ":
+                    break
+
+            assert not rendered
+            assert code.render_str(config).endswith("".join(["def ", *tokens]))
+
+        assert code.render_str({"place_semicolons": True}) == expected
+        assert "".join(code.render({"place_semicolons": True})) == expected
+
+    def test_spacing_reads(self):
+        reads: "list[int]" = []
+
+        class Spaced(Statement):
+            def __init__(self, spacing: int):
+                self.own = spacing
+
+            @property
+            def spacing(self) -> int:  # type: ignore
+                reads.append(self.own)
+                return self.own
+
+            def render(self, config: Config) -> StrGen:
+                yield "x"
+
+        code = Code([Spaced(0), Spaced(2), Spaced(0), Spaced(0), Spaced(1)])
+        expected = "x\n\n\nx\n\n\nx\n\nx\n\nx"
+
+        for config in ({}, {"iterative": True}, {"workers": 2}):
+            reads.clear()
+            assert code.render_str(config) == expected
+            assert len(reads) == 5
+
+        assert "".join(code.render({})) == expected
+        assert "".join(code.render_tokens({})) == expected
@@ -0,0 +1,117 @@
+import pytest
+
+from gekkota import (
+    Cached,
+    Code,
+    FuncDef,
+    ListExpr,
+    Literal,
+    Name,
+    PassStmt,
+    RenderCache,
+    to_expression,
+)
+from gekkota.cache import config_fingerprint
+
+
+a = Name("a")
+b = Name("b")
+c = Name("c")
+
+helper = FuncDef("helper", [a], PassStmt())
+
+
+class TestClass:
+    def test_transparent(self):
+        assert str(Cached(a)) == "a"
+        assert str(Cached(a + b) * c) == "(a + b) * c"
+        assert Cached(helper).spacing == 1
+        assert str(Code([Cached(helper), a])) == str(Code([helper, a]))
+
+    def test_hits(self):
+        cache = RenderCache()
+        cached = Cached(helper)
+        code = Code([cached, a, cached, cached])
+
+        assert code.render_str({"render_cache": cache}) == str(code)
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        code.render_str({"render_cache": cache})
+        assert (cache.hits, cache.misses) == (5, 1)
+        assert cache.hit_rate == 5 / 6
+
+        assert cache.stats()["entries"] == len(cache) == 1
+
+    def test_config_fingerprint(self):
+        cache = RenderCache()
+        table = Cached(to_expression({1: 2, 3: 4}))
+
+        assert table.render_str({"render_cache": cache}) == "{1: 2, 3: 4}"
+        assert table.render_str({"render_cache": cache, "compact": True}) == "{1:2,3:4}"
+        assert (
+            table.render_str({"render_cache": cache, "tab_size": 2}) == "{1: 2, 3: 4}"
+        )
+
+        assert cache.misses == 3
+        assert config_fingerprint({"a": 1, "b": [1]}) == config_fingerprint(
+            {"b": [1], "a": 1, "render_cache": cache}
+        )
+
+    def test_lru(self):
+        nodes = [Cached(ListExpr([Literal(i)] * 10)) for i in range(10)]
+
+        cache = RenderCache()
+        for node in nodes:
+            node.render_str({"render_cache": cache})
+        entry_size = cache.size // len(cache)
+
+        cache = RenderCache(max_bytes=entry_size * 3)
+        for node in nodes[:3]:
+            node.render_str({"render_cache": cache})
+        nodes[0].render_str({"render_cache": cache})
+        nodes[3].render_str({"render_cache": cache})
+
+        assert len(cache) == 3
+        assert cache.evictions == 1
+        assert cache.size <= cache.max_bytes
+
+        nodes[0].render_str({"render_cache": cache})
+        assert cache.hits == 2
+
+        nodes[1].render_str({"render_cache": cache})
+        assert cache.misses == 5
+
+    def test_lfu(self):
+        nodes = [Cached(ListExpr([Literal(i)] * 10)) for i in range(10)]
+
+        probe = RenderCache()
+        nodes[0].render_str({"render_cache": probe})
+
+        cache = RenderCache(max_bytes=probe.size * 3, policy="lfu")
+        for node in nodes[:3]:
+            node.render_str({"render_cache": cache})
+        for _ in range(3):
+            nodes[0].render_str({"render_cache": cache})
+            nodes[2].render_str({"render_cache": cache})
+        nodes[3].render_str({"render_cache": cache})
+
+        assert cache.evictions == 1
+        misses = cache.misses
+        nodes[0].render_str({"render_cache": cache})
+        nodes[2].render_str({"render_cache": cache})
+        assert cache.misses == misses
+
+        nodes[1].render_str({"render_cache": cache})
+        assert cache.misses == misses + 1
+
+    def test_oversized(self):
+        cache = RenderCache(max_bytes=10)
+        assert Cached(helper).render_str({"render_cache": cache}) == str(helper)
+        assert len(cache) == 0
+
+        cache.clear()
+        assert cache.size == 0
+
+    def test_bad_policy(self):
+        with pytest.raises(ValueError):
+            RenderCache(policy="fifo")
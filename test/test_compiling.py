@@ -0,0 +1,95 @@
+from typing import Any, Dict
+
+import pytest
+
+from gekkota import (
+    Block,
+    Code,
+    CodeCache,
+    Decorated,
+    FuncArg,
+    FuncDef,
+    Literal,
+    Name,
+    RaiseStmt,
+    ReturnStmt,
+    compile_code,
+    make_function,
+)
+
+
+a = Name("a")
+b = Name("b")
+k = Name("k")
+
+
+def scale():
+    return FuncDef(
+        "scale",
+        [a, FuncArg("b", None, Literal(2))],
+        Block([ReturnStmt(a * b + k)]),
+    )
+
+
+class TestClass:
+    def test_make_function(self):
+        cache = CodeCache()
+        namespace: Dict[str, Any] = {"k": 1}
+
+        f = make_function(scale(), namespace, cache=cache)
+        g = make_function(scale(), {"k": 10}, cache=cache)
+
+        assert (f(3), f(3, 3), g(3)) == (7, 10, 16)
+        assert f.__globals__ is namespace and "scale" not in namespace
+        assert f.__code__ is g.__code__
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_decorated(self):
+        function = make_function(
+            Decorated(Name("twice"), scale()),
+            {"k": 0, "twice": lambda f: lambda x: f(f(x))},
+            cache=None,
+        )
+        assert function(3) == 12
+
+        with pytest.raises(TypeError):
+            make_function(Decorated(a, Code([])), cache=None)  # type: ignore
+
+    def test_modes(self):
+        cache = CodeCache()
+
+        assert eval(compile_code(a + b, "eval", cache=cache), {"a": 1, "b": 2}) == 3
+        assert eval(compile_code(a + b, "eval", cache=cache), {"a": 2, "b": 2}) == 4
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        namespace: Dict[str, Any] = {"k": 1}
+        exec(compile_code(scale(), cache=cache), namespace)
+        assert namespace["scale"](1) == 3
+
+        with pytest.raises(ValueError):
+            compile_code(a, "module")
+
+    def test_config(self):
+        cache = CodeCache()
+        failing = Code([a, a, RaiseStmt(Name("ValueError"))])
+
+        for config in ({}, {"compact": True}, {"compact": True}):
+            code = compile_code(failing, config=config, cache=cache)
+            with pytest.raises(ValueError) as error:
+                exec(code, {"a": 1})
+            assert error.traceback[-1].lineno + 1 == 3
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        compile_code(failing, cache=cache)
+        assert cache.misses == 3
+
+    def test_lru(self):
+        cache = CodeCache(max_entries=2)
+        expressions = [a + Literal(i) for i in range(3)]
+
+        for expression in (*expressions, expressions[0]):
+            compile_code(expression, "eval", cache=cache)
+
+        assert len(cache) == 2
+        assert (cache.misses, cache.evictions) == (4, 2)
@@ -0,0 +1,49 @@
+import pytest
+
+from gekkota import Code, IncrementalRenderer, Name, RenderCache, RenderConfig
+from gekkota.cache import config_fingerprint
+from gekkota.plans import plans_for
+
+
+a = Name("a")
+b = Name("b")
+
+
+class TestClass:
+    def test_render(self):
+        config = RenderConfig(compact=True)
+
+        assert (config.compact, config.tab_size, config["tab_char"]) == (True, 4, " ")
+        assert (a + b).render_str(config) == "a+b"
+        assert (a + b).render_str(config.replace(compact=False)) == "a + b"
+        assert IncrementalRenderer(Code([a, b]), config).config is config
+        assert RenderConfig({"tab_size": 2}, tab_char="\t").tab_size == 2
+
+    def test_key(self):
+        config = RenderConfig(compact=True)
+        same = RenderConfig({"compact": True})
+
+        assert config == same and hash(config) == hash(same)
+        assert {config: 1}[same] == 1
+        assert config != config.replace(render_cache=RenderCache())
+        assert config_fingerprint(config) == config_fingerprint(dict(config))
+        assert plans_for(config) is plans_for(dict(config))
+
+    def test_validation(self):
+        with pytest.raises(TypeError, match="tab_size"):
+            RenderConfig(tab_size="4")
+        with pytest.raises(TypeError, match="compact"):
+            RenderConfig(compact=1)
+        with pytest.raises(ValueError, match="workers"):
+            RenderConfig(workers=-1)
+        with pytest.raises(TypeError, match="render_cache"):
+            RenderConfig(render_cache={})
+
+        config = RenderConfig(custom=[1])
+        assert config.custom == [1]
+        with pytest.raises(TypeError):
+            config["compact"] = True
+        with pytest.raises(TypeError):
+            config.compact = True
+        with pytest.raises(AttributeError):
+            config.missing
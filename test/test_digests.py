@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+from gekkota import hashcons as hc
+from gekkota import Block, Code, FuncDef, IfStmt, Literal, Name, PassStmt, ReturnStmt
+
+
+a = Name("a")
+b = Name("b")
+
+
+def build():
+    return Code(
+        [
+            FuncDef("f", [a, Name("b", Name("int"))], Block([ReturnStmt(a + b)])),
+            IfStmt(a.eq(Literal(1.5)), PassStmt()),
+        ]
+    )
+
+
+class TestClass:
+    def test_structural(self):
+        assert build().digest() == build().digest()
+        assert len(build().digest()) == 16
+
+        assert (a + b).digest() != (b + a).digest()
+        assert (a + b).digest() != (a - b).digest()
+        assert Literal(1).digest() != Literal(1.0).digest()
+        assert Literal(1).digest() != Literal(True).digest()
+        assert Literal(0.0).digest() != Literal(-0.0).digest()
+        assert Literal("a").digest() != a.digest()
+        assert a.digest() != Name("a", b).digest()
+
+    def test_changes(self):
+        tree = build()
+        before = tree.digest()
+
+        tree.statements[1].condition = a  # type: ignore
+        assert tree.digest() != before
+
+        statement = PassStmt()
+        plain = statement.digest()
+        statement.spacing = 2
+        assert statement.digest() != plain
+
+    def test_deep(self):
+        expression = a
+        for i in range(sys.getrecursionlimit() * 2):
+            expression = expression + Name(f"x{i}")
+
+        assert expression.digest() != a.digest()
+
+    def test_interned(self):
+        with hc.interning() as table:
+            x = hc.binary(hc.interned_name("a"), "+", hc.interned_name("b"))
+            digest = x.digest()
+
+            assert digest == (a + b).digest()
+            assert table.digests[id(x)] == digest
+
+            table.digests[id(x)] = b"cached"
+            assert x.digest() == b"cached"
+            assert hc.make(ReturnStmt, x).digest() == hc.make(ReturnStmt, x).digest()
+
+        table.clear()
+        assert x.digest() == digest
+
+    def test_stable_across_processes(self):
+        script = "from test.test_digests import build; print(build().digest().hex())"
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            for seed in ("0", "1", "random")
+        }
+
+        assert digests == {build().digest().hex()}
@@ -1,4 +1,19 @@
-from gekkota import Name, Literal, SliceExpr, Parens, StarArg, DoubleStarArg, CallArg
+import ast
+
+import pytest
+
+from gekkota import (
+    Name,
+    Literal,
+    SliceExpr,
+    Parens,
+    StarArg,
+    DoubleStarArg,
+    CallArg,
+    BinaryExpr,
+    OperatorChain,
+    ChainBuilder,
+)
 
 
 a = Name("a")
@@ -53,6 +68,73 @@ class TestClass:
         assert str(a >> (b >> c)) == "a >> (b >> c)"
         assert str(a * b * c) == "a * b * c"
 
+    def test_deferred_parens(self):
+        sum_ = a + b
+        product = sum_ * c
+
+        # operands are stored as is, parentheses are decided when rendering
+        assert product.left is sum_ and sum_(a).callee is sum_
+        assert str(Parens(sum_) * c) == "(a + b) * c"
+
+        product.left = a
+        product.right = sum_
+        assert str(product) == "a * (a + b)"
+
+        expression = (a**b) ** (-sum_).getattr("d")
+        expected = "(a ** b) ** (-(a + b)).d"
+        assert str(expression) == expected
+        typed = [token for token in expression.render_typed() if isinstance(token, str)]
+        assert "".join(typed) == expected
+        assert expression.render_str({"iterative": True}) == expected
+        assert expression.render_str({"compact": True}) == "(a**b)**(-(a+b)).d"
+        assert ast.dump(expression.lower()) == ast.dump(
+            ast.parse(expected, mode="eval").body
+        )
+
+    def test_chains(self):
+        assert str(BinaryExpr.chain("+", [a, b, c])) == str(a + b + c)
+        assert str(BinaryExpr.chain("and", [a.or_(b), c])) == "(a or b) and c"
+        assert str(BinaryExpr.chain("**", [a, b**c, a])) == "a ** (b ** c) ** a"
+        assert str(OperatorChain([a, b, c], ["+", "-"])) == "a + b - c"
+        assert str(a.compare(("<", b), ("is not", c))) == "a < b is not c"
+        assert BinaryExpr.chain("*", [a]) is a
+
+        with pytest.raises(ValueError):
+            OperatorChain([a, b, c], ["+", "*"])
+        with pytest.raises(ValueError):
+            OperatorChain([a, b], [])
+
+        terms = [Name(f"x{i}") for i in range(5000)]
+        expression = BinaryExpr.chain("+", terms)
+        expected = " + ".join(f"x{i}" for i in range(5000))
+        assert expression.render_str() == expected
+        assert expression.render_str({"iterative": True}) == expected
+
+        for chain in (
+            BinaryExpr.chain("-", [a, a * b, (a - b).not_()]),
+            a.compare(("<", b), ("<", c)).and_(c),
+        ):
+            assert ast.dump(chain.lower()) == ast.dump(
+                ast.parse(str(chain), mode="eval").body
+            )
+
+    def test_trailer_chain(self):
+        builder = (
+            ChainBuilder(a + b).getattr("c", "d").call(a, key=b).index(SliceExpr(a, b))
+        )
+        expected = "(a + b).c.d(a, key=b)[a:b]"
+
+        assert str(builder.build()) == expected
+        assert str(builder.getattr("e").build()) == expected + ".e"
+        assert ast.dump(builder.build().lower()) == ast.dump(
+            ast.parse(expected + ".e", mode="eval").body
+        )
+
+        builder = ChainBuilder(a)
+        for i in range(5000):
+            builder.getattr(f"f{i}").call()
+        assert builder.build().render_str().endswith(".f4998().f4999()")
+
     def test_attr(self):
         assert str(a.getattr("b")) == "a.b"
         assert str(Literal(-1).getattr("b")) == "(-1).b"
@@ -111,7 +193,7 @@ class TestClass:
         half_float = Literal(0.5)
 
         assert (one + two).render_str({"compact": True}) == "1+2"
-        assert one.and_(two).render_str({"compact": True}) == "1and 2"
-        assert one.and_(half_float).render_str({"compact": True}) == "1and.5"
+        assert one.and_(two).render_str({"compact": True}) == "1 and 2"
+        assert one.and_(half_float).render_str({"compact": True}) == "1 and.5"
         assert (a + b).render_str({"compact": True}) == "a+b"
         assert a.and_(b).render_str({"compact": True}) == "a and b"
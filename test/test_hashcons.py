@@ -0,0 +1,108 @@
+import gc
+import tracemalloc
+
+from gekkota import hashcons as hc
+from gekkota import Code, Literal, Name, FuncArg
+
+
+def build_repetitive(count: int) -> Code:
+    return Code(
+        [
+            hc.binary(
+                hc.interned_getattr(hc.interned_name("self"), "x"),
+                "+",
+                hc.call(hc.interned_name("f"), hc.literal(0), key=hc.literal("value")),
+            )
+            for _ in range(count)
+        ]
+    )
+
+
+def allocated(count: int, interned: bool) -> int:
+    with hc.interning():
+        build_repetitive(1)  # warm up caches that are not related to the tree
+
+    tracemalloc.start()
+    try:
+        if interned:
+            with hc.interning():
+                tree = build_repetitive(count)
+        else:
+            tree = build_repetitive(count)
+        assert len(tree.statements) == count
+        gc.collect()  # drops free lists filled by temporary keys
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+class TestClass:
+    def test_identity(self):
+        with hc.interning() as table:
+            self_x = hc.interned_getattr(hc.interned_name("self"), "x")
+
+            assert hc.interned_getattr(hc.interned_name("self"), "x") is self_x
+            assert hc.interned_name(
+                "self", hc.interned_name("int")
+            ) is hc.interned_name("self", hc.interned_name("int"))
+            assert hc.interned_name("self") is not hc.interned_name(
+                "self", hc.interned_name("int")
+            )
+            assert hc.call(self_x, hc.literal(1), a=self_x) is hc.call(
+                self_x, hc.literal(1), a=self_x
+            )
+            assert hc.unary("-", self_x) is hc.unary("-", self_x)
+            assert hc.make(FuncArg, "a", default_value=self_x) is hc.make(
+                FuncArg, "a", default_value=self_x
+            )
+
+            assert table.hits > 0
+            assert len(table) == table.misses
+
+    def test_distinct_values(self):
+        with hc.interning():
+            values = [1, 1.0, True, 0.0, -0.0, "1", b"1", None]
+            literals = [hc.literal(value) for value in values]
+
+            assert len(set(map(id, literals))) == len(values)
+            assert [str(x) for x in literals] == [str(Literal(x)) for x in values]
+
+            nan = float("nan")
+            assert hc.literal(nan) is hc.literal(nan)
+
+    def test_sequences(self):
+        with hc.interning():
+            a = hc.interned_name("a")
+            assert hc.make(Code, [a, a]) is hc.make(Code, [a, a])
+            assert hc.make(Code, [a, a]) is not hc.make(Code, (a, a))
+
+            unhashable = {"key": a}
+            assert hc.make(dict, unhashable) is not hc.make(dict, unhashable)
+
+    def test_opt_in(self):
+        assert hc.interned_name("a") is not hc.interned_name("a")
+
+        with hc.interning() as table:
+            hc.interned_name("a")
+
+        with hc.interning(table):
+            hc.interned_name("a")
+
+        assert table.hits == 1
+        table.clear()
+        assert len(table) == 0
+
+    def test_rendering(self):
+        with hc.interning():
+            interned = build_repetitive(3)
+        plain = build_repetitive(3)
+
+        assert str(interned) == str(plain)
+        assert str(interned.statements[0]) == "self.x + f(0, key='value')"
+        assert (
+            str(hc.binary(Name("a"), "*", hc.binary(Name("b"), "+", Name("c"))))
+            == "a * (b + c)"
+        )
+
+    def test_memory(self):
+        assert allocated(2000, interned=True) * 10 < allocated(2000, interned=False)
@@ -0,0 +1,163 @@
+import pickle
+from typing import List
+
+import pytest
+
+from gekkota import (
+    Block,
+    Code,
+    FuncDef,
+    IfStmt,
+    IncrementalRenderer,
+    Literal,
+    Name,
+    PassStmt,
+    ReturnStmt,
+    Statement,
+)
+from gekkota.core import Renderable
+
+from .test_plans import configs, nodes
+
+
+a = Name("a")
+
+
+class Loud(Name):
+    __slots__ = ()
+
+    def render(self, config):
+        yield self.name.upper()
+
+
+def functions(size):
+    return [
+        FuncDef(f"f{i}", [Name("x")], Block([ReturnStmt(Name("x") + Literal(i))]))
+        for i in range(size)
+    ]
+
+
+def module(size):
+    return Code(functions(size))
+
+
+class TestClass:
+    def test_first_render(self):
+        for node in nodes:
+            for config in configs:
+                assert IncrementalRenderer(node, config).render() == node.render_str(
+                    config
+                )
+
+    def test_reuse(self):
+        definitions = functions(100)
+        code = Code(definitions)
+        renderer = IncrementalRenderer(code)
+        assert renderer.render() == str(code)
+
+        renderer.render()
+        assert renderer.rendered == 0
+
+        function = definitions[42]
+        number = Literal(4242)
+        function.name = "g"
+        function.body = Block([ReturnStmt(Name("x") + number)])
+        renderer.invalidate(function)
+
+        text = renderer.render()
+        assert "def g(x): \n    return x + 4242\n" in text
+        assert text == str(code)
+        # the function and its new return statement
+        assert renderer.rendered == 2
+        assert renderer.reused == 99
+
+        number.value = 7
+        renderer.invalidate(number)
+        assert "def g(x): \n    return x + 7\n" in renderer.render()
+        assert renderer.rendered == 2
+
+    def test_untracked_changes(self):
+        statements: List[Statement] = list(functions(3))
+        code = Code(statements)
+        renderer = IncrementalRenderer(code, {"place_semicolons": True})
+        renderer.render()
+
+        statements.append(IfStmt(a, PassStmt()))
+        assert renderer.render() != str(code)
+
+        renderer.invalidate(code)
+        assert renderer.render() == code.render_str({"place_semicolons": True})
+
+    def test_nodes_unchanged(self):
+        code = module(3)
+        renderer = IncrementalRenderer(code)
+        renderer.render()
+
+        assert type(code) is Code
+        assert all(type(function) is FuncDef for function in code.statements)
+        assert str(pickle.loads(pickle.dumps(code))) == str(code)
+
+    def test_replaced_dropped(self):
+        statements: List[Statement] = list(functions(10))
+        code = Code(statements)
+        renderer = IncrementalRenderer(code)
+        renderer.render()
+
+        tracked = len(renderer.parents)
+        fragments = len(renderer.fragments)
+
+        for _ in range(20):
+            statements[3] = functions(4)[3]
+            renderer.invalidate(code)
+            assert renderer.render() == str(code)
+            assert renderer.rendered == 2
+
+        assert len(renderer.parents) == tracked
+        assert len(renderer.fragments) == fragments
+
+        del statements[5:]
+        renderer.invalidate(code)
+        assert renderer.render() == str(code)
+        assert len(renderer.fragments) == fragments // 2
+
+    def test_fallback_rerendered(self):
+        name = Loud("b")
+        code = Code([IfStmt(a, Block([a + name])), PassStmt()])
+        renderer = IncrementalRenderer(code)
+        assert renderer.render() == "if a: \n    a + B\npass"
+
+        object.__setattr__(name, "name", "c")
+        assert renderer.render() == "if a: \n    a + C\npass"
+
+    def test_detect(self):
+        definitions = functions(10)
+        code = Code(definitions)
+        with IncrementalRenderer(code, detect=True) as renderer:
+            assert "__setattr__" in vars(Renderable)
+            renderer.render()
+
+            definitions[3].name = "g"
+            definitions[5].spacing = 3
+            assert renderer.render() == str(code)
+            assert renderer.rendered == 2
+
+            Name("x")
+            renderer.render()
+            assert renderer.rendered == 0
+
+        assert "__setattr__" not in vars(Renderable)
+        definitions[4].name = "h"
+        assert renderer.render() != str(code)
+
+    def test_verify(self):
+        definitions = functions(10)
+        code = Code(definitions)
+        renderer = IncrementalRenderer(code, verify=True)
+        renderer.render()
+
+        definitions[3].name = "g"
+        with pytest.raises(RuntimeError):
+            renderer.render()
+
+        renderer.invalidate(definitions[3])
+        assert renderer.render() == str(code)
@@ -0,0 +1,81 @@
+from gekkota import (
+    BinaryExpr,
+    Block,
+    Code,
+    FuncDef,
+    IfStmt,
+    Literal,
+    Name,
+    RenderProfile,
+    ReturnStmt,
+    profiling,
+)
+from gekkota.plans import render_hooks
+
+from .test_plans import configs, nodes
+
+
+a = Name("a")
+b = Name("b")
+
+
+class Loud(Name):
+    __slots__ = ()
+
+    def render(self, config):
+        yield self.name.upper()
+
+
+class TestClass:
+    def test_output_unchanged(self):
+        with profiling():
+            rendered = [
+                [node.render_str(config) for config in configs] for node in nodes
+            ]
+
+        assert not render_hooks
+        assert rendered == [
+            [node.render_str(config) for config in configs] for node in nodes
+        ]
+
+    def test_stats(self):
+        code = Code([IfStmt(a, Block([ReturnStmt(a + b * Literal(2))])), Loud("c")])
+
+        with profiling() as profile:
+            text = code.render_str()
+            code.render_str()
+
+        assert profile.renders == 2
+        assert profile[BinaryExpr].calls == 4
+        assert profile[Name].calls == 6
+        assert profile[Loud].calls == 2
+        assert profile[Code].tokens == 2  # newlines between statements
+        assert profile[BinaryExpr].bytes == 2 * len(" +  * ")
+
+        total_bytes = sum(stats.bytes for stats in profile.stats.values())
+        total_tokens = sum(stats.tokens for stats in profile.stats.values())
+        assert total_bytes == 2 * len(text)
+        assert total_tokens == 2 * len(list(code.render_tokens()))
+
+        self_time = sum(stats.self_time for stats in profile.stats.values())
+        assert abs(self_time - profile.time) < 1e-6
+        assert profile[Code].time == profile.time
+
+        assert "BinaryExpr" in profile.report()
+        assert profile.as_dict()["gekkota.values.Name"]["calls"] == 6
+
+    def test_slow(self):
+        slow = []
+        function = FuncDef("f", [a], Block([ReturnStmt(a)]))
+
+        with profiling(slow=0.0, on_slow=lambda *args: slow.append(args)):
+            function.render_str()
+        with profiling(slow=60.0, on_slow=lambda *args: slow.append(args)):
+            function.render_str()
+
+        assert len(slow) == 1
+        node, seconds, profile = slow[0]
+        assert node is function
+        assert seconds == profile.time
+        assert isinstance(profile, RenderProfile)
+        assert profile[FuncDef].calls == 1
@@ -0,0 +1,54 @@
+import sys
+
+from gekkota import Block, Cached, Code, IfStmt, Name, PassStmt, RenderCache
+
+from .test_plans import configs, nodes
+
+
+a = Name("a")
+b = Name("b")
+
+
+class Loud(Name):
+    __slots__ = ()
+
+    def render(self, config):
+        yield self.name.upper()
+
+
+class TestClass:
+    def test_matches_render_str(self):
+        for node in nodes:
+            for config in configs:
+                iterative = {**config, "iterative": True}
+                assert node.render_str(iterative) == node.render_str(config)
+
+    def test_long_chain(self):
+        names = [Name(f"x{i}") for i in range(5000)]
+        expression = names[0]
+        for name in names[1:]:
+            expression = expression + name
+
+        expected = " + ".join(f"x{i}" for i in range(5000))
+        assert expression.render_str({"iterative": True}) == expected
+
+    def test_deep_blocks(self):
+        depth = sys.getrecursionlimit() + 100
+        statement = PassStmt()
+        for _ in range(depth):
+            statement = IfStmt(a, Block([b, statement]))
+
+        for config, last_b in (({}, "b"), ({"place_semicolons": True}, "b;")):
+            config = {**config, "iterative": True, "tab_size": 1}
+            lines = statement.render_str(config).split("\n")
+            assert lines[-1] == " " * depth + "pass"
+            assert lines[-2].strip() == last_b
+
+    def test_fallback(self):
+        cache = RenderCache()
+        code = Code([IfStmt(Loud("x"), Block([Cached(a + Loud("y")), b]))])
+        config = {"iterative": True, "render_cache": cache}
+
+        assert code.render_str(config) == "if X: \n    a + Y\n    b"
+        assert code.render_str(config) == str(code)
+        assert cache.hits == 1
@@ -0,0 +1,90 @@
+import inspect
+import pickle
+import subprocess
+import sys
+import tracemalloc
+from typing import Callable
+
+import gekkota
+from gekkota import BinaryExpr, CallArg, CapturePattern, FuncDef, Literal, Name
+from gekkota import PassStmt, Renderable
+
+
+a = Name("a")
+b = Name("b")
+
+
+def allocated_per_node(make: Callable[[], object], count: int = 10_000) -> float:
+    nodes: "list[object]" = [None] * count
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            nodes[i] = make()
+        return (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+
+class TestClass:
+    def test_no_instance_dict(self):
+        for name, value in vars(gekkota).items():
+            if inspect.isclass(value) and issubclass(value, Renderable):
+                assert not value.__dictoffset__, name
+
+    def test_node_size(self):
+        assert sys.getsizeof(Literal(0)) <= 48
+        assert sys.getsizeof(CapturePattern("a")) <= 48
+        assert sys.getsizeof(CallArg("a", b)) <= 56
+        assert sys.getsizeof(Name("a")) <= 72
+        assert sys.getsizeof(BinaryExpr(a, b, "+")) <= 80
+
+    def test_tracemalloc(self):
+        for make in [
+            lambda: Literal(0),
+            lambda: Name("a"),
+            lambda: CallArg("a", b),
+            lambda: BinaryExpr(a, b, "+"),
+            lambda: CapturePattern("a"),
+        ]:
+            # the node itself is the only allocation, no per-instance __dict__
+            assert allocated_per_node(make) <= sys.getsizeof(make()) + 1
+
+    def test_instance_spacing(self):
+        statement = PassStmt()
+        statement.spacing = 2
+
+        assert statement.spacing == 2
+        assert PassStmt().spacing == 0
+        assert type(statement) is PassStmt
+
+        func = FuncDef("f", [], PassStmt())
+        func.spacing = 3
+        assert pickle.loads(pickle.dumps(func)).spacing == 3
+        func.spacing = 0
+
+        assert func.spacing == 0
+        assert type(func) is FuncDef
+        assert FuncDef("f", [], PassStmt()).spacing == 1
+
+        name = Name("a")
+        name.spacing = 2
+        assert (name.spacing, Name("b").spacing) == (2, 0)
+
+    def test_unpickled_spacing(self):
+        func = FuncDef("f", [], PassStmt())
+        func.spacing = 3
+
+        # a fresh process, where no spacing was set before loading
+        loaded = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import pickle, sys; print(pickle.load(sys.stdin.buffer).spacing)",
+            ],
+            input=pickle.dumps(func),
+            capture_output=True,
+            check=True,
+        )
+        assert loaded.stdout.strip() == b"3"
@@ -0,0 +1,77 @@
+from gekkota import (
+    Block,
+    Cached,
+    Code,
+    FuncDef,
+    IfStmt,
+    Name,
+    PassStmt,
+    RenderCache,
+    RenderConfig,
+    ReturnStmt,
+    Statement,
+)
+
+from .test_plans import configs, nodes
+
+
+a = Name("a")
+b = Name("b")
+
+
+def module(size):
+    statements = []
+    for i in range(size):
+        if i % 7 == 0:
+            statements.append(FuncDef(f"f{i}", [a], ReturnStmt(a)))
+        elif i % 5 == 0:
+            statements.append(IfStmt(a, Block([b, PassStmt()])))
+        else:
+            statements.append(Name(f"x{i}"))
+    return Code(statements)
+
+
+class TestClass:
+    def test_matches_serial(self):
+        code = module(1000)
+
+        for config in configs:
+            expected = code.render_str(config)
+            for workers in (2, 3, 8):
+                assert code.render_str({**config, "workers": workers}) == expected
+
+    def test_corpus(self):
+        for node in nodes:
+            for config in configs:
+                parallel = {**config, "workers": 4}
+                assert node.render_str(parallel) == node.render_str(config)
+
+    def test_small(self):
+        for size in (0, 1, 2):
+            code = module(size)
+            assert code.render_str({"workers": 4}) == code.render_str()
+
+    def test_cache(self):
+        cache = RenderCache()
+        shared = Cached(IfStmt(a, Block([b])))
+        code = Code([shared] * 600)
+
+        assert code.render_str({"workers": 4, "render_cache": cache}) == str(code)
+        assert len(cache) == 1
+        assert cache.hits + cache.misses == 600
+
+    def test_render_config(self):
+        seen = set()
+
+        class Probe(Statement):
+            __slots__ = ()
+
+            def render(self, config):
+                seen.add((type(config), config["workers"]))
+                yield "probe"
+
+        code = Code([Probe() for _ in range(8)])
+        config = RenderConfig(workers=2)
+
+        assert code.render_str(config) == "probe\n" * 7 + "probe"
+        assert seen == {(RenderConfig, 0)}
@@ -0,0 +1,251 @@
+import itertools
+from typing import cast
+
+from gekkota import (
+    Assignment,
+    AugmentedAssignment,
+    Block,
+    BreakStmt,
+    CallArg,
+    CapturePattern,
+    CaseStmt,
+    ClassDef,
+    ClassPattern,
+    Code,
+    Decorated,
+    DelStmt,
+    DictExpr,
+    ExceptStmt,
+    FinallyStmt,
+    ForStmt,
+    FromImportStmt,
+    FString,
+    FuncArg,
+    FuncDef,
+    GeneratorExpr,
+    GeneratorFor,
+    GeneratorIf,
+    IfExpr,
+    IfStmt,
+    ImportAlias,
+    ImportDots,
+    ImportSource,
+    ImportStmt,
+    KeyValue,
+    KeywordPattern,
+    LambDef,
+    ListExpr,
+    Literal,
+    LiteralPattern,
+    MappingPattern,
+    KeyValuePattern,
+    MatchStmt,
+    Name,
+    PassStmt,
+    RaiseStmt,
+    ReturnStmt,
+    SequencePattern,
+    SetExpr,
+    StarArg,
+    StarPattern,
+    Statement,
+    TryStmt,
+    TupleExpr,
+    TypeStmt,
+    TypeVarParam,
+    WhileStmt,
+    WithStmt,
+    WithTarget,
+    WildcardPattern,
+    Utils,
+)
+from gekkota.constants import default_config
+from gekkota.values import GetAttr
+from gekkota.plans import PlanRenderer, compile_plan, render_planned
+
+
+a = Name("a")
+b = Name("b")
+c = Name("c")
+i = Name("i", Name("int"))
+x_pattern = CapturePattern("x")
+
+function = FuncDef(
+    "f",
+    [i, FuncArg("d", b, Literal(1.5)), StarArg(a)],
+    Block([Assignment([a], b), ReturnStmt(a + b * c)]),
+    rtype=Name("int"),
+    is_async=True,
+)
+
+nodes = [
+    (a + b) * -c,
+    GetAttr(a, "b", "c")[b : c : Literal(2)],
+    a(b, CallArg("x", Literal("y"))),
+    IfExpr(a, b, c),
+    LambDef([a, b], a.await_()),
+    TupleExpr([a]),
+    ListExpr([a, StarArg(b)]),
+    SetExpr([a, b]),
+    DictExpr([KeyValue(a, b), KeyValue(c, a)]),
+    GeneratorExpr(a, [GeneratorFor(a, b), GeneratorIf(c)]),
+    FString(["x", a, "y"]),
+    function,
+    Decorated(a, ClassDef("A", [b, CallArg("metaclass", c)], function)),
+    Code([a, PassStmt(), function, BreakStmt(), c]),
+    IfStmt(a, Block([b, c])),
+    WhileStmt(a, PassStmt()),
+    ForStmt(a, b, Block([AugmentedAssignment(a, "+=", b)])),
+    WithStmt([WithTarget(a, "b"), c], DelStmt(a, b)),
+    Code(
+        [
+            TryStmt(Block([a, b])),
+            ExceptStmt([a, b], c, RaiseStmt(a, b)),
+            FinallyStmt(PassStmt()),
+        ]
+    ),
+    Code([ImportStmt([ImportAlias(a, b)]), FromImportStmt(ImportDots(2), [c])]),
+    FromImportStmt(ImportSource(["a", "b"]), [StarArg()]),
+    TypeStmt(a, [TypeVarParam(b, c)], a),
+    MatchStmt(
+        a,
+        [
+            CaseStmt(
+                ClassPattern(c, [x_pattern], [KeywordPattern("y", WildcardPattern())]),
+                Block([a, b]),
+                guard=b,
+            ),
+            CaseStmt(
+                SequencePattern([LiteralPattern(1), StarPattern(x_pattern)])
+                | MappingPattern([KeyValuePattern(LiteralPattern("k"), x_pattern)]),
+                PassStmt(),
+            ),
+        ],
+    ),
+]
+
+configs = [
+    {},
+    {"compact": True},
+    {"tab_size": 1, "tab_char": "\t"},
+    {"place_semicolons": True},
+    {"inline_small_stmts": True},
+    {"compact": True, "place_semicolons": True, "tab_size": 1},
+]
+
+
+def reference(node, config):
+    config = {**default_config, **config}
+    tokens = node.render(config)
+    if config["compact"]:
+        tokens = Utils.make_compact(tokens, config)
+    return "".join(tokens)
+
+
+class TestClass:
+    def test_matches_render(self):
+        for node in nodes:
+            for config in configs:
+                assert node.render_str(config) == reference(node, config)
+
+    def test_plan_reuse(self):
+        plan = compile_plan(FuncDef, default_config)
+        assert plan is compile_plan(FuncDef, {**default_config})
+        assert plan is not compile_plan(FuncDef, {**default_config, "compact": True})
+        assert compile_plan(Statement, default_config) is None
+
+    def test_constants_merged(self):
+        function_plan = compile_plan(FuncDef, default_config)
+        expression_plan = compile_plan(IfExpr, default_config)
+        compact_plan = compile_plan(IfExpr, {**default_config, "compact": True})
+
+        assert function_plan and "def " in function_plan
+        assert expression_plan and " if " in expression_plan
+        assert compact_plan and "if" in compact_plan
+
+    def test_indent_prefix(self):
+        statement = PassStmt()
+        for _ in range(50):
+            statement = IfStmt(a, Block([b, statement]))
+
+        for config in ({}, {"iterative": True}, {"place_semicolons": True}):
+            config = {**config, "tab_size": 1}
+            tokens = list(statement.render_tokens(config))
+            last_newline = len(tokens) - 1 - tokens[::-1].index("\n")
+
+            assert tokens[last_newline + 1 :] == [" " * 50, "pass"]
+            assert statement.render_str(config) == reference(statement, config)
+
+            compact = {**config, "compact": True}
+            assert statement.render_str(compact) == reference(statement, compact)
+
+    def test_closed_indent(self):
+        renderer = PlanRenderer(default_config)
+        tokens = renderer.render(IfStmt(a, Block([b, IfStmt(c, Block([a, b]))])))
+
+        assert "    " in list(itertools.islice(tokens, 12))
+        tokens.close()  # type: ignore
+
+        assert renderer.indent == ""
+        assert "".join(renderer.render(Code([a, b]))) == "a\nb"
+
+    def test_render_into(self):
+        for node in nodes:
+            for config in configs:
+                config = {**default_config, **config}
+                out = ["#"]
+                node.render_into(out, config)
+
+                assert out[0] == "#"
+                assert out[1:] == list(render_planned(node, config))
+
+    def test_render_into_fallback(self):
+        class Loud(Name):
+            __slots__ = ()
+
+            def render(self, config):
+                yield self.name.upper()
+
+        class Multiline(Statement):
+            __slots__ = ()
+
+            def render_into(self, out, config):
+                out.extend(("x", "\n", "y"))
+
+        block = IfStmt(Loud("a"), Block([b, Multiline(), IfStmt(a, Multiline())]))
+        config = {**default_config, "place_semicolons": True}
+        out = []
+        block.render_into(out, config)
+
+        assert (
+            "".join(out)
+            == "if A: \n    b;\n    \n    x\n    y\n    \n    if a: x\n    y"
+        )
+
+    def test_override_falls_back(self):
+        class Shouted(IfStmt):
+            __slots__ = ()
+
+            def render_head(self, config):
+                yield "IF"
+                yield " "
+                yield from self.condition.render(config)
+
+        class Loud(Name):
+            __slots__ = ()
+
+            def render(self, config):
+                yield self.name.upper()
+
+        assert compile_plan(Shouted, default_config) is None
+        assert str(Shouted(a, Loud("b"))) == "IF a: B"
+        assert "".join(render_planned(a + Loud("b"), default_config)) == "a + B"
+
+    def test_empty_compact(self):
+        assert a().render_str({"compact": True}) == "a()"
+        # a body that renders no tokens at all
+        empty = cast(Statement, Code([]))
+        assert FinallyStmt(empty).render_str({"compact": True}) == "finally:"
+        assert (
+            FuncDef("f", [], PassStmt()).render_str({"compact": True}) == "def f():pass"
+        )
@@ -0,0 +1,115 @@
+import gzip
+import io
+import lzma
+import tracemalloc
+from typing import List, Sequence, Union, overload
+
+from gekkota import Code, FuncDef, Name, ReturnStmt, Statement, Literal
+from gekkota import render_to_text, render_to_binary, render_to_gzip, render_to_lzma
+from gekkota.sinks import iter_chunks
+
+
+a = Name("a")
+b = Name("b")
+
+
+class LazyStatements(Sequence[Statement]):
+    """Creates statements on access, so the tree itself takes no memory"""
+
+    def __init__(self, length: int):
+        self.length = length
+
+    def make(self, i: int) -> Statement:
+        if i % 10 == 0:
+            return FuncDef(f"f{i}", [a], ReturnStmt(a + Literal("ü" * 10)))
+        return a.getattr(f"attr{i}")(b, Literal(i))
+
+    @overload
+    def __getitem__(self, i: int) -> Statement:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Statement]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Statement, List[Statement]]:
+        if isinstance(i, slice):
+            return [self.make(j) for j in range(*i.indices(self.length))]
+        if i >= self.length:
+            raise IndexError(i)
+        return self.make(i)
+
+    def __len__(self) -> int:
+        return self.length
+
+
+class WriteCounter:
+    def __init__(self):
+        self.writes = 0
+        self.total = 0
+
+    def write(self, s: str):
+        self.writes += 1
+        self.total += len(s)
+
+
+code = Code(LazyStatements(200))
+
+
+class TestClass:
+    def test_chunks(self):
+        assert [*iter_chunks(["ab", "c", "def", "g"], 3)] == ["abc", "def", "g"]
+        assert [*iter_chunks([], 3)] == []
+
+    def test_text(self):
+        sink = io.StringIO()
+        assert code.render_to(sink) == len(str(code))
+        assert sink.getvalue() == str(code)
+
+        sink = io.StringIO()
+        render_to_text(code, sink, {"compact": True}, chunk_size=16)
+        assert sink.getvalue() == code.render_str({"compact": True})
+
+    def test_chunk_size(self):
+        counter = WriteCounter()
+        code.render_to(counter, chunk_size=100)
+
+        assert counter.total == len(str(code))
+        assert counter.writes == len([*iter_chunks(code.render_tokens(), 100)])
+        assert counter.writes > 10
+
+    def test_binary(self):
+        sink = io.BytesIO()
+        assert render_to_binary(code, sink, chunk_size=7) == len(str(code).encode())
+        assert sink.getvalue() == str(code).encode()
+
+        sink = io.BytesIO()
+        render_to_binary(code, sink, encoding="utf-16", chunk_size=7)
+        assert sink.getvalue().decode("utf-16") == str(code)
+
+    def test_compressed(self, tmp_path):
+        fileobj = io.BytesIO()
+        render_to_gzip(code, fileobj)
+        assert gzip.decompress(fileobj.getvalue()).decode() == str(code)
+
+        path = tmp_path / "module.py.xz"
+        render_to_lzma(code, path)
+        assert lzma.decompress(path.read_bytes()).decode() == str(code)
+
+        path = tmp_path / "module.py.gz"
+        render_to_gzip(code, str(path))
+        assert gzip.decompress(path.read_bytes()).decode() == str(code)
+
+    def test_constant_memory(self):
+        def peak(length: int) -> int:
+            tracemalloc.start()
+            try:
+                Code(LazyStatements(length)).render_to(WriteCounter(), chunk_size=1024)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small = peak(500)
+        big = peak(5_000)
+
+        assert big < small * 2
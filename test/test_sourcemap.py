@@ -0,0 +1,143 @@
+import subprocess
+import sys
+import threading
+
+from gekkota import (
+    Block,
+    Code,
+    IfStmt,
+    Literal,
+    Name,
+    ReturnStmt,
+    enable_site_recording,
+    recording_sites,
+)
+
+from .test_plans import configs, nodes
+
+
+a = Name("a")
+b = Name("b")
+
+
+class Loud(Name):
+    __slots__ = ()
+
+    def render(self, config):
+        yield self.name.upper()
+
+
+def make_condition():
+    return a + Name("c")
+
+
+class TestClass:
+    def test_spans(self):
+        for node in nodes:
+            for config in configs:
+                text, source_map = node.render_mapped(config)
+                assert text == node.render_str(config)
+                assert source_map.span(node).start == 0
+                assert source_map.span(node).end == len(text)
+
+                for span in source_map.spans():
+                    fragment = text[span.start : span.end]
+                    lines = text.split("\n")
+                    assert lines[span.line - 1][span.column :].startswith(
+                        fragment.split("\n")[0]
+                    )
+                    if "\n" not in fragment:
+                        assert fragment == span.node.render_str(config)
+
+    def test_iterative(self):
+        for node in nodes:
+            for config in configs:
+                iterative = {**config, "iterative": True}
+                text, source_map = node.render_mapped(iterative)
+                expected_text, expected = node.render_mapped(config)
+                assert text == expected_text
+                # nodes made while rendering differ between renders, so types are compared
+                assert [
+                    (type(span.node), span.start, span.end)
+                    for span in source_map.spans()
+                ] == [
+                    (type(span.node), span.start, span.end) for span in expected.spans()
+                ]
+
+        expression = Name("x0")
+        for i in range(1, 3000):
+            expression = expression + Name(f"x{i}")
+        text, source_map = expression.render_mapped({"iterative": True})
+        assert text == expression.render_str({"iterative": True})
+        last = source_map.node_at(1, len(text) - 1)
+        assert isinstance(last, Name) and last.name == "x2999"
+        span = source_map.span(expression)
+        assert span is not None and span.end == len(text)
+
+    def test_reverse_lookup(self):
+        returned = a + b * Literal(2)
+        condition = Loud("x")
+        code = Code([a, IfStmt(condition, Block([ReturnStmt(returned)]))])
+        text, source_map = code.render_mapped({"place_semicolons": True})
+
+        assert text == "a;\n\nif X: \n    return a + b * 2"
+        assert source_map.node_at(4, 15) is b
+        assert source_map.node_at(4, 13) is returned
+        assert source_map.node_at(3, 3) is condition
+        assert source_map.nodes_at(1)[-1] is code
+        assert source_map.nodes_at(2) == [code]
+        span = source_map.span(returned)
+        assert span is not None and span.line == 4
+        assert source_map.span(Name("a")) is None
+
+    def test_sites_disabled(self):
+        # a fresh process, since enabling can't be undone
+        script = (
+            "from gekkota import Name, recording_sites\n"
+            "from gekkota.core import Renderable\n"
+            "Name('a')\n"
+            "assert '__new__' not in vars(Renderable)\n"
+            "try:\n"
+            "    with recording_sites(): pass\n"
+            "except RuntimeError: pass\n"
+            "else: raise AssertionError\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+    def test_sites(self):
+        enable_site_recording()
+        with recording_sites(every=1) as sites:
+            condition = make_condition()
+            statement = IfStmt(condition, b)
+        unrecorded = make_condition()
+
+        site = sites.get(condition)
+        statement_site = sites.get(statement)
+        assert site is not None and statement_site is not None
+        assert site.function == "make_condition"
+        assert site.filename == __file__
+        assert statement_site.function == "test_sites"
+        assert sites.get(unrecorded) is None
+        assert sites.get(a) is None
+
+        _, source_map = statement.render_mapped()
+        assert sites.find(source_map.nodes_at(5)) is site
+
+        with recording_sites(every=3) as sampled:
+            for _ in range(30):
+                Name("x")
+        assert len(sampled) == 10
+
+    def test_sites_of_context(self):
+        created = []
+        worker = threading.Thread(target=lambda: created.append(Name("x")))
+
+        enable_site_recording()
+        with recording_sites(every=1) as sites:
+            worker.start()
+            worker.join()
+            local = Name("y")
+
+        assert sites.get(local) is not None
+        assert sites.get(created[0]) is None
+        assert len(sites) == 1
@@ -0,0 +1,119 @@
+import ast
+import sys
+
+import pytest
+
+from gekkota import (
+    AssertStmt,
+    Literal,
+    Name,
+    PassStmt,
+    ReturnStmt,
+    template,
+)
+
+
+method = """
+    class $cls($base):
+        def __init__(self, $arg):
+            self.$arg = $arg
+            $body
+
+        async def run(self, *args, **kwargs) -> "$text":
+            async with lock as held:
+                for x, y in items:
+                    yield {x: [y async for y in $source if y]}
+            return f"{self:>10}" if args else (lambda a, /, b=2: a @ b)(*args)
+"""
+
+
+class TestClass:
+    def test_holes(self):
+        filled = template("$a * ($b + 1)").fill(a=Name("x") + Name("y"), b=2)
+
+        assert filled.render_str() == "(x + y) * (2 + 1)"
+        assert template("[$a]").fill(a=[1, 2]).render_str() == "[[1, 2]]"
+
+        stmt = template("def $name(self):\n    return self.$attr")
+        assert stmt.holes == {"name": {"identifier"}, "attr": {"identifier"}}
+        assert (
+            stmt.fill(name="size", attr=Name("_size")).render_str()
+            == "def size(self): \n    return self._size"
+        )
+
+    def test_statement_holes(self):
+        loop = template(
+            """
+            for item in items:
+                $body
+            else:
+                $orelse
+            """
+        )
+        filled = loop.fill(
+            body=[AssertStmt(Name("item")), ReturnStmt(Name("item"))],
+            orelse=PassStmt(),
+        )
+
+        assert filled.render_str() == (
+            "for item in items: \n"
+            "    assert item\n"
+            "    return item\n"
+            "else: \n"
+            "    pass"
+        )
+        assert template("$body").fill(body=[PassStmt(), PassStmt()]).render_str() == (
+            "pass\npass"
+        )
+
+    def test_round_trip(self):
+        source = method.replace("$", "_")
+        tree = template(source).fill()
+
+        rendered = tree.render_str({"fstrings": True})
+        assert ast.dump(ast.parse(rendered)) == ast.dump(
+            ast.parse(source.replace("\n    ", "\n").strip())
+        )
+
+        filled = template(method).fill(
+            cls="Job",
+            base=Name("Base"),
+            arg=Name("value"),
+            body=[],
+            source=Name("queue"),
+        )
+        rendered = filled.render_str({"fstrings": True})
+        assert "class Job(Base):" in rendered
+        assert "self.value = value" in rendered
+        assert "async def run(self, *args, **kwargs) -> '$text':" in rendered
+        ast.parse(rendered)
+
+    def test_sharing(self):
+        shared = template("(f(a, b) + g(c), $x)")
+
+        first = shared.fill(x=1)
+        second = shared.fill(x=2)
+
+        assert template("(f(a, b) + g(c), $x)") is shared
+        assert first is not second
+        assert first.values[0] is second.values[0]
+        assert first.values[1] is not second.values[1]
+        assert isinstance(second.values[1], Literal)
+        assert shared.fill(x=3).render_str() == "(f(a, b) + g(c), 3)"
+
+    def test_errors(self):
+        stmt = template("def $name(): pass")
+
+        with pytest.raises(TypeError, match="no values for name"):
+            stmt.fill()
+        with pytest.raises(TypeError, match="no holes for other"):
+            stmt.fill(name="f", other=1)
+        with pytest.raises(TypeError, match="identifier"):
+            stmt.fill(name=1)
+        with pytest.raises(ValueError, match="part of a name"):
+            template("self._$name")
+
+        # `match` can be parsed only since Python 3.10
+        if sys.version_info >= (3, 10):
+            with pytest.raises(ValueError, match="not supported"):
+                template("match x:\n    case 1:\n        pass")
@@ -1,9 +1,36 @@
-from gekkota import to_expression
-from gekkota import Literal, ListExpr, TupleExpr, DictExpr, SetExpr
+import ast
+import gc
+import sys
+from array import array
+from collections import OrderedDict
+from fractions import Fraction
+
+import pytest
+
+from gekkota import to_expression, register_converter
+from gekkota import (
+    Literal,
+    ListExpr,
+    LiteralSequence,
+    Name,
+    TupleExpr,
+    DictExpr,
+    SetExpr,
+)
+from gekkota.to_expression import dispatch, registered
 from gekkota.sequences import KeyValue
 
 
 class TestClass:
+    # registered converters are global, so tests that register them restore the tables
+    def setup_method(self):
+        self.registered = dict(registered)
+
+    def teardown_method(self):
+        registered.clear()
+        registered.update(self.registered)
+        dispatch.clear()
+
     def test_literals(self):
         assert str(to_expression(6)) == str(Literal(6))
         assert str(to_expression("1")) == str(Literal("1"))
@@ -29,3 +56,93 @@ class TestClass:
     def test_expression(self):
         t = Literal(10)
         assert to_expression(t) is t
+
+    def test_deep(self):
+        data: list = []
+        for _ in range(sys.getrecursionlimit() * 2):
+            data = [data, 1]
+
+        expression = to_expression(data)
+        for _ in range(sys.getrecursionlimit() * 2):
+            assert isinstance(expression, ListExpr)
+            expression = expression.values[0]
+        assert isinstance(expression, ListExpr) and not expression.values
+
+        assert str(to_expression([[1, [2]], {3: (4,)}])) == "[[1, [2]], {3: (4, )}]"
+
+    def test_pause_gc(self):
+        class Probe:
+            pass
+
+        enabled = []
+
+        def convert(probe):
+            enabled.append(gc.isenabled())
+            return Literal(0)
+
+        register_converter(Probe, convert)
+
+        to_expression([Probe()])
+        assert to_expression([[Probe()]], pause_gc=True).render_str() == "[[0]]"
+        assert enabled == [True, False]
+        assert gc.isenabled()
+
+    def test_register(self):
+        class Point:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        class Point3(Point):
+            pass
+
+        class Ordered(OrderedDict):
+            pass
+
+        class Ratio(Fraction):
+            pass
+
+        register_converter(
+            Point, lambda point: Name("Point")(Literal(point.x), Literal(point.y))
+        )
+        register_converter(Ratio, lambda value: (value.numerator, value.denominator))
+
+        assert (
+            str(to_expression([Point(1, 2), Point3(3, 4)]))
+            == "[Point(1, 2), Point(3, 4)]"
+        )
+        assert str(to_expression({Ratio(1, 2): [Ratio(3)]})) == "{(1, 2): [(3, 1)]}"
+        assert str(to_expression(Ordered(a=1))) == "{'a': 1}"
+
+    def test_runs(self):
+        numbers = [i * 0.5 for i in range(-10, 10)]
+        strings = tuple(f"s{i}" for i in range(20))
+
+        for value, kind in ((numbers, ListExpr), (strings, TupleExpr)):
+            assert isinstance(to_expression(value), kind)
+
+            expression = to_expression(value, pack_runs=True)
+            expected = kind([Literal(item) for item in value])
+
+            assert isinstance(expression, LiteralSequence)
+            for config in ({}, {"compact": True}, {"iterative": True}):
+                assert expression.render_str(config) == expected.render_str(config)
+            assert ast.dump(expression.to_ast()) == ast.dump(expected.to_ast())
+
+        assert isinstance(to_expression([1, 2], pack_runs=True), ListExpr)
+        assert isinstance(to_expression([1] * 20 + [None], pack_runs=True), ListExpr)
+
+    def test_bulk_types(self):
+        assert str(to_expression(range(5))) == "range(5)"
+        assert str(to_expression(range(1, 5))) == "range(1, 5)"
+        assert str(to_expression(range(5, 1, -2))) == "range(5, 1, -2)"
+
+        assert str(to_expression(array("i", [1, 2]))) == "[1, 2]"
+        assert isinstance(to_expression(array("d", [0.5] * 100)), LiteralSequence)
+        assert str(to_expression(memoryview(b"ab"))) == "b'ab'"
+        assert str(to_expression(memoryview(array("h", [3, 4])))) == "[3, 4]"
+        assert isinstance(
+            to_expression(memoryview(array("i", [1] * 100))), LiteralSequence
+        )
+        with pytest.raises(ValueError, match="1-dimensional"):
+            to_expression(memoryview(bytes(4)).cast("B", (2, 2)))
@@ -0,0 +1,141 @@
+from wordstreamer.core import Marker
+
+from gekkota import (
+    Block,
+    FuncDef,
+    IfExpr,
+    Literal,
+    Name,
+    ReturnStmt,
+    tokens,
+    typed_tokenstream,
+)
+from gekkota.tokens import (
+    Identifier,
+    Indent,
+    Keyword,
+    Newline,
+    NodeMarker,
+    Number,
+    Punctuation,
+    String,
+    Token,
+    Whitespace,
+    classify,
+    fuse,
+)
+
+from .test_plans import configs, nodes, reference
+
+
+x = Name("x")
+function = FuncDef("f", [x], Block([ReturnStmt(x + Literal(1))]))
+
+
+class Upper(Name):
+    __slots__ = ()
+
+    def render(self, config):
+        yield self.name.upper()
+        yield " "
+        yield "+"
+
+
+class TestClass:
+    def test_kinds(self):
+        typed = [
+            (type(token), str(token))
+            for token in function.render_typed()
+            if not isinstance(token, NodeMarker)
+        ]
+
+        assert typed == [
+            (Keyword, "def"),
+            (Whitespace, " "),
+            (Identifier, "f"),
+            (Punctuation, "("),
+            (Identifier, "x"),
+            (Punctuation, ")"),
+            (Punctuation, ":"),
+            (Whitespace, " "),
+            (Newline, "\n"),
+            (Indent, "    "),
+            (Keyword, "return"),
+            (Whitespace, " "),
+            (Identifier, "x"),
+            (Whitespace, " "),
+            (Punctuation, "+"),
+            (Whitespace, " "),
+            (Number, "1"),
+        ]
+
+    def test_classify(self):
+        assert type(classify("not in")) is Keyword
+        assert type(classify("match")) is Keyword
+        assert type(classify("-0.5")) is Number
+        assert type(classify("b'x'")) is String
+        assert type(classify("**")) is Punctuation
+        assert classify("x").kind == "identifier"
+        assert type(classify("not ")) is Token
+        assert type(classify("a.b")) is Token
+
+    def test_markers(self):
+        stream = list(function.render_typed())
+        markers = [token for token in stream if isinstance(token, NodeMarker)]
+
+        first, last = stream[0], stream[-1]
+        assert isinstance(first, NodeMarker) and isinstance(last, NodeMarker)
+        assert first.node is function and not first.end
+        assert last.node is function and last.end
+
+        depth = 0
+        for marker in markers:
+            depth += -1 if marker.end else 1
+            assert depth >= 0
+        assert depth == 0
+
+    def test_fallback_classified(self):
+        stream = [
+            token
+            for token in (Upper("y") * x).render_typed()
+            if not isinstance(token, NodeMarker)
+        ]
+        assert [type(token) for token in stream] == [
+            Identifier,
+            Whitespace,
+            Punctuation,
+            Whitespace,
+            Punctuation,
+            Whitespace,
+            Identifier,
+        ]
+
+    def test_fuse(self):
+        for node in nodes:
+            for config in configs:
+                text = "".join(fuse(node.render_typed(config), config))
+                assert text == reference(node, config)
+
+        expression = IfExpr(Name("x1"), x, Literal(0.5))
+        assert "".join(fuse(expression.render_typed(), {})) == "x1 if x else 0.5"
+        assert (
+            "".join(fuse(expression.render_typed(), {"compact": True}))
+            == "x1 if x else.5"
+        )
+
+    def test_fuse_spaced_keyword(self):
+        negated = Name("b").and_(x.not_())
+        compact = {"compact": True}
+
+        assert "".join(fuse(negated.render_typed(compact), compact)) == "b and not x"
+        assert negated.render_str(compact) == "b and not x"
+        assert Literal(1).and_(Name("x1")).render_str(compact) == "1 and x1"
+
+    def test_wordstreamer(self):
+        stream = list(typed_tokenstream(x.render_typed()))
+        assert stream == [
+            Marker("node_start", {"node": x, "kind": "Name"}),
+            "x",
+            Marker("node_end", {"node": x, "kind": "Name"}),
+        ]
+        assert isinstance(classify(" "), tokens.Token)
@@ -1,4 +1,15 @@
-from gekkota import Literal, Name, FormatSpec, FString
+import pytest
+
+from gekkota import (
+    Expression,
+    FormatSpec,
+    FString,
+    LambDef,
+    Literal,
+    Name,
+    SetExpr,
+)
+from gekkota.values import CallExpr
 
 
 class TestClass:
@@ -50,3 +61,46 @@ class TestClass:
         )
 
         assert str(nested_formatspec) == "'a{}c{:.{}f}{}{}'.format(b, d, 2, e, f)"
+        assert (
+            nested_formatspec.render_str({"fstrings": True})
+            == "f'a{b}c{d:.{2}f}{e}{f}'"
+        )
+
+    def test_native_fstring(self):
+        a = Name("a")
+        namespace = {"a": {"k": 1, '"': 2}}
+        native = {"fstrings": True}
+
+        quoted = FString(["'\"\n{", a[Literal("k")], "}"])
+        assert quoted.render_str(native) == "f\"'\\\"\\n{{{a['k']}}}\""
+
+        both_quotes = FString([a[Literal("k")], a[Literal('"')]])
+        assert both_quotes.render_str(native) == "f'''{a['k']}{a['\"']}'''"
+
+        wrapped = FString([LambDef([], a), SetExpr([a.getattr("b")]), a.assign(a)])
+        assert wrapped.render_str(native) == "f'{(lambda: a)}{ {a.b}}{(a := a)}'"
+        assert [str(token) for token in wrapped.render_typed(native)] == [
+            "f'{(lambda: a)}{ {a.b}}{(a := a)}'"
+        ]
+
+        # expressions with backslashes can't be in f-strings before Python 3.12
+        escaped = FString([a[Literal("\n")]])
+        assert escaped.render_str(native) == str(escaped)
+
+        for fstring in (quoted, both_quotes):
+            assert eval(str(fstring), namespace) == eval(
+                fstring.render_str(native), namespace
+            )
+
+    def test_lazy_fstring(self):
+        class Unrenderable(Expression):
+            __slots__ = ()
+
+            def render(self, config):
+                raise AssertionError("rendered")
+
+        fstring = FString(["a", Unrenderable()])
+        assert isinstance(fstring.expression, CallExpr)
+
+        with pytest.raises(AssertionError):
+            str(fstring)